@@ -0,0 +1,107 @@
+"""
+Side-car size and write and read time of the arrays of a long tracking file
+and of the JV curves of a run, written as float64 and encoded with
+`array_encoding`, where the voltage axis shared by the scans is stored once.
+The decoded arrays are checked against the originals.
+
+Run from the repository root:
+
+    python benchmarks/bench_array_encoding.py [n_rows] [n_scans]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from synthetic import write_file
+
+from nomad_test_parser.parsers.file_reading import read_jv_buffer, read_mppt_buffer
+from nomad_test_parser.parsers.sidecar import (
+    SIDECAR_MIN_SIZE,
+    read_archive,
+    write_archive,
+)
+
+MPPT_KEYS = ['time_data', 'voltage_data', 'current_density_data', 'power_data']
+# points of one synthetic JV sweep, see `synthetic.get_rows`
+JV_POINTS = 71
+
+
+def read_file(path, read_buffer):
+    with open(path, 'rb') as f:
+        data_dict, _ = read_buffer(f.read())
+    return data_dict
+
+
+def get_arrays(archive):
+    # the curve lists of an archive dict and the decoded arrays of the side-car
+    if isinstance(archive, dict):
+        for value in archive.values():
+            yield from get_arrays(value)
+    elif isinstance(archive, list) and archive and isinstance(archive[0], dict):
+        for value in archive:
+            yield from get_arrays(value)
+    elif isinstance(archive, list):
+        yield np.array(archive, dtype=np.float64)
+    elif hasattr(archive, '__array__'):
+        yield np.asarray(archive)
+
+
+def measure(name, archive, directory, min_size=SIDECAR_MIN_SIZE):
+    print(name)
+    arrays = list(get_arrays(archive))
+    for encode in (False, True):
+        path = os.path.join(directory, f'{name}_{encode}.archive.json')
+        start = time.perf_counter()
+        write_archive(archive, path, min_size=min_size, encode=encode)
+        write_time = time.perf_counter() - start
+        start = time.perf_counter()
+        decoded = list(get_arrays(read_archive(path, lazy=False)))
+        read_time = time.perf_counter() - start
+        assert all(
+            np.array_equal(a, b, equal_nan=True) for a, b in zip(arrays, decoded)
+        )
+        size = os.path.getsize(path) + os.path.getsize(
+            f'{os.path.splitext(path)[0]}.h5'
+        )
+        print(
+            f'  {"encoded" if encode else "float64":8s} {size / 1e6:8.2f} MB  '
+            f'write {write_time * 1e3:8.1f} ms  read {read_time * 1e3:8.1f} ms'
+        )
+
+
+def main(n_rows=1_000_000, n_scans=500):
+    with tempfile.TemporaryDirectory() as directory:
+        mppt_dict = read_file(
+            write_file(directory, 'Tracking', n_rows), read_mppt_buffer
+        )
+        measure(
+            f'tracking ({n_rows} rows)',
+            {'data': {key: mppt_dict[key].tolist() for key in MPPT_KEYS}},
+            directory,
+        )
+
+        jv_curve = []
+        for index in range(n_scans):
+            jv_dict = read_file(
+                write_file(directory, 'JV', JV_POINTS, index), read_jv_buffer
+            )
+            jv_curve.extend(
+                {
+                    'voltage': curve['voltage'].tolist(),
+                    'current_density': curve['current_density'].tolist(),
+                }
+                for curve in jv_dict['jv_curve']
+            )
+        measure(
+            f'JV ({n_scans} scans)',
+            {'data': {'jv_curve': jv_curve}},
+            directory,
+            min_size=JV_POINTS,
+        )
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
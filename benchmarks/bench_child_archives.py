@@ -0,0 +1,84 @@
+"""
+Timing of writing the `<file>.archive.json` child archives of a 5,000-file
+upload, processed and then reprocessed, with `write_child_archive` against
+the former `m_to_dict` + `create_archive(..., overwrite=True)` path.
+
+The context counts the triggered child processings, which in NOMAD cost far
+more than the write itself.
+
+Run from the repository root:
+
+    python benchmarks/bench_child_archives.py [n_files]
+"""
+
+import datetime
+import json
+import sys
+import tempfile
+import time
+
+from nomad.datamodel import EntryArchive, EntryMetadata
+
+from nomad_test_parser.parsers.batch import DirectoryContext
+from nomad_test_parser.parsers.child_archive import write_child_archive
+from nomad_test_parser.parsers.parser import UNITOV_JVmeasurement
+
+
+class CountingContext(DirectoryContext):
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.processed = 0
+
+    def process_updated_raw_file(self, path, allow_modify=False):
+        self.processed += 1
+
+
+def write_child_archive_legacy(entity, archive, file_name):
+    # reference implementation of the former parser path, kept here to
+    # measure against
+    entity.m_to_dict(with_root_def=True)
+    entity_entry = entity.m_to_dict(with_root_def=True)
+    with archive.m_context.raw_file(file_name, 'w') as f:
+        json.dump({'data': entity_entry}, f)
+    archive.m_context.process_updated_raw_file(file_name, allow_modify=True)
+
+
+def process_upload(writer, context, n_files):
+    start = time.perf_counter()
+    for index in range(n_files):
+        basename = f'{index:04d}_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt'
+        archive = EntryArchive(
+            m_context=context, metadata=EntryMetadata(mainfile=basename)
+        )
+        archive.data = UNITOV_JVmeasurement()
+        archive.data.message = 'This is a test JV measurement parsing.'
+        archive.data.datetime = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+        archive.data.data_file = basename
+        writer(archive.data, archive, f'{basename}.archive.json')
+    return time.perf_counter() - start
+
+
+def main(n_files=5000):
+    for name, writer in [
+        ('legacy', write_child_archive_legacy),
+        ('write_child_archive', write_child_archive),
+    ]:
+        with tempfile.TemporaryDirectory() as directory:
+            context = CountingContext(directory)
+            first = process_upload(writer, context, n_files)
+            processed = context.processed
+            again = process_upload(writer, context, n_files)
+            reprocessed = context.processed - processed
+
+        print(
+            f'{name:20s} process:   {first:6.2f} s, '
+            f'{processed:5d} child processings'
+        )
+        print(
+            f'{name:20s} reprocess: {again:6.2f} s, '
+            f'{reprocessed:5d} child processings'
+        )
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,55 @@
+"""
+Cost of deciding the encoding of the UNITOV example files: `sniff_encoding`
+on the prefix of the raw file opened once, against the former normalizer
+path that read the whole file in binary mode for the detection and then
+opened it a second time as text.
+
+Run from the repository root:
+
+    python benchmarks/bench_encoding.py [number]
+"""
+
+import glob
+import sys
+import timeit
+
+from nomad_test_parser.parsers.raw_file import sniff_encoding
+
+DATA_FILES = sorted(glob.glob('tests/data/*.txt'))
+
+
+def detect_encoding_legacy(path):
+    # reference of the former path, kept here to measure against: a full
+    # binary read and decode for the detection, then a second, text read
+    with open(path, 'rb') as f:
+        content = f.read()
+    try:
+        content.decode('utf-8')
+        encoding = 'utf-8'
+    except UnicodeDecodeError:
+        encoding = 'windows-1252'
+    with open(path, encoding=encoding) as f:
+        f.read()
+    return encoding
+
+
+def detect_encoding(path):
+    with open(path, 'rb') as f:
+        return sniff_encoding(f.read())
+
+
+def main(number=2000):
+    for path in DATA_FILES:
+        with open(path, 'rb') as f:
+            content = f.read()
+        legacy = timeit.timeit(lambda: detect_encoding_legacy(path), number=number)
+        current = timeit.timeit(lambda: detect_encoding(path), number=number)
+        sniff = timeit.timeit(lambda: sniff_encoding(content), number=number)
+        print(path.split('/')[-1])
+        print(f'  legacy, detection and second read: {legacy / number * 1e6:9.1f} us')
+        print(f'  single read and sniff_encoding:    {current / number * 1e6:9.1f} us')
+        print(f'  sniff_encoding only:               {sniff / number * 1e6:9.1f} us')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
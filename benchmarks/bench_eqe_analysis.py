@@ -0,0 +1,80 @@
+"""
+Timing of the integrated J_sc and band gap of many IPCE spectra, one
+spectrum at a time as the EQE normalizer resamples them and stacked in one
+`get_eqe_parameters` call.
+
+Run from the repository root:
+
+    python benchmarks/bench_eqe_analysis.py [n_spectra] [n_points]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from nomad_test_parser.parsers.eqe_analysis import (
+    get_am15g,
+    get_eqe_parameters,
+    stack_spectra,
+)
+from nomad_test_parser.parsers.file_reading import hc_eVnm, q
+
+
+def get_eqe_parameters_loop(spectra):
+    # reference, kept here to measure against: every spectrum is resampled and
+    # integrated on its own, as `interpolate_eqe` does for one file
+    energy, flux = get_am15g()
+    results = []
+    for photon_energy, eqe in spectra:
+        grid = np.linspace(min(photon_energy), max(photon_energy), 1000)
+        eqe_on_grid = np.interp(grid, photon_energy, eqe)
+        eqe_at_reference = np.interp(energy, photon_energy, eqe, left=0, right=0)
+        slope = np.diff(eqe) / np.diff(photon_energy)
+        steepest = int(np.argmax(slope))
+        results.append(
+            (
+                eqe_on_grid,
+                q * (eqe_at_reference @ flux) * 0.1,
+                (photon_energy[steepest] + photon_energy[steepest + 1]) / 2,
+            )
+        )
+    return results
+
+
+def generate_spectra(n_spectra, n_points, shift):
+    # sigmoid absorption edges, with the wavelengths shifted by up to `shift`
+    # nm per spectrum
+    rng = np.random.default_rng(0)
+    spectra = []
+    for _ in range(n_spectra):
+        wavelength = np.linspace(900, 300, n_points) + rng.uniform(-shift, shift)
+        photon_energy = hc_eVnm / wavelength
+        edge = 1.55 + rng.normal(scale=0.02)
+        eqe = 0.8 / (1 + np.exp(-(photon_energy - edge) / 0.02))
+        spectra.append((photon_energy, eqe + rng.normal(scale=0.005, size=n_points)))
+    return spectra
+
+
+def main(n_spectra=500, n_points=61):
+    for label, shift in [('same energies', 0), ('shifted energies', 2)]:
+        spectra = generate_spectra(n_spectra, n_points, shift)
+
+        start = time.perf_counter()
+        loop = get_eqe_parameters_loop(spectra)
+        loop_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = get_eqe_parameters(*stack_spectra(spectra))
+        batch_elapsed = time.perf_counter() - start
+
+        print(
+            f'{n_spectra} spectra x {n_points} points, {label:16s} '
+            f'loop {1000 * loop_elapsed:7.1f} ms, batch {1000 * batch_elapsed:7.1f} ms'
+        )
+        assert np.allclose(batch['integrated_jsc'], [jsc for _, jsc, _ in loop])
+        assert np.allclose(batch['bandgap'], [bandgap for _, _, bandgap in loop])
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,84 @@
+"""
+Timing of `read_file_eqe` for a single IPCE file and for a directory of
+thousands of IPCE exports of the same setup, against the former fallback
+chain of `pandas.read_csv` calls.
+
+Run from the repository root:
+
+    python benchmarks/bench_eqe_reader.py [n_files]
+"""
+
+import glob
+import os
+import sys
+import tempfile
+import time
+import timeit
+from io import StringIO
+
+import pandas as pd
+
+from nomad_test_parser.parsers import file_reading
+from nomad_test_parser.parsers.file_reading import (
+    arrange_eqe_columns,
+    interpolate_eqe,
+    read_file_eqe,
+)
+
+DATA_FILE = glob.glob('tests/data/*_IPCE_*.txt')[0]
+HEADER_LINES = 24
+
+
+def read_file_eqe_legacy(filedata, header_lines):
+    # reference implementation, kept here to measure against. Only the first
+    # attempt of the former chain is reproduced, the later ones re-read the
+    # exhausted stream.
+    df = pd.read_csv(StringIO(filedata.read()), header=int(header_lines - 1), sep='\t')
+    df = df.apply(pd.to_numeric, errors='coerce')
+    df = df.dropna()
+    photon_energy_raw, eqe_raw = arrange_eqe_columns(df)
+    return interpolate_eqe(photon_energy_raw, eqe_raw)
+
+
+def time_directory(reader, paths):
+    start = time.perf_counter()
+    for path in paths:
+        with open(path) as f:
+            reader(f, header_lines=HEADER_LINES)
+    return time.perf_counter() - start
+
+
+def main(n_files=2000):
+    with open(DATA_FILE) as f:
+        content = f.read()
+
+    def single(reader):
+        return timeit.timeit(
+            lambda: reader(StringIO(content), header_lines=HEADER_LINES), number=200
+        ) / 200
+
+    file_reading.EQE_LAYOUT_CACHE.clear()
+    print(f'single file, legacy:        {single(read_file_eqe_legacy) * 1e6:9.1f} us')
+    print(f'single file, read_file_eqe: {single(read_file_eqe) * 1e6:9.1f} us')
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for index in range(n_files):
+            path = os.path.join(directory, f'{index:05d}_IPCE_bench.txt')
+            with open(path, 'w') as f:
+                f.write(content.replace('2024-01-25', f'2024-01-{index % 28 + 1:02d}'))
+            paths.append(path)
+
+        file_reading.EQE_LAYOUT_CACHE.clear()
+        legacy = time_directory(read_file_eqe_legacy, paths)
+        current = time_directory(read_file_eqe, paths)
+
+    print(f'{n_files} files, legacy:        {legacy:7.2f} s '
+          f'({n_files / legacy:7.1f} files/s)')
+    print(f'{n_files} files, read_file_eqe: {current:7.2f} s '
+          f'({n_files / current:7.1f} files/s)')
+    print(f'cached layouts:             {len(file_reading.EQE_LAYOUT_CACHE)}')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
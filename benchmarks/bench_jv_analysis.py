@@ -0,0 +1,59 @@
+"""
+Timing of `get_jv_parameters` for the scans of a stability campaign, in one
+vectorized call on the stacked curves against a Python loop over the curves.
+
+Run from the repository root:
+
+    python benchmarks/bench_jv_analysis.py [n_curves]
+"""
+
+import glob
+import sys
+import time
+
+import numpy as np
+
+from nomad_test_parser.parsers.file_reading import read_jv_buffer
+from nomad_test_parser.parsers.jv_analysis import get_jv_parameters, stack_curves
+
+
+def load_curves():
+    curves = []
+    for path in sorted(glob.glob('tests/data/*_JV.txt')):
+        with open(path, 'rb') as f:
+            jv_dict, _ = read_jv_buffer(f.read())
+        curves.extend(
+            (curve['voltage'], curve['current_density'])
+            for curve in jv_dict['jv_curve']
+        )
+    return curves
+
+
+def main(n_curves=20000):
+    curves = load_curves()
+    rng = np.random.default_rng(0)
+    campaign = [
+        (voltage, current_density * rng.uniform(0.7, 1.0))
+        for voltage, current_density in (
+            curves[index % len(curves)] for index in range(n_curves)
+        )
+    ]
+
+    start = time.perf_counter()
+    for voltage, current_density in campaign:
+        get_jv_parameters(voltage, current_density)
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    voltage, current_density = stack_curves(campaign)
+    stacking = time.perf_counter() - start
+    get_jv_parameters(voltage, current_density)
+    vectorized = time.perf_counter() - start
+
+    print(f'{n_curves} curves, loop over curves: {loop:7.3f} s')
+    print(f'{n_curves} curves, one stacked call: {vectorized:7.3f} s '
+          f'(stacking {stacking:.3f} s)')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,77 @@
+"""
+Per-file timing of `read_file_jv_data` against the former implementation that
+ran `pandas.read_csv(..., engine='python')` three times over the file content.
+
+Run from the repository root:
+
+    python benchmarks/bench_jv_reader.py [number]
+"""
+
+import glob
+import io
+import sys
+import timeit
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+
+from nomad_test_parser.parsers.file_reading import read_file_jv_data
+
+DATA_FILES = sorted(glob.glob('tests/data/*_JV.txt'))
+
+
+def read_file_jv_data_legacy(filedata):
+    # reference implementation, kept here to measure the speedup against
+    with filedata as file:
+        content = file.read()
+        df = pd.read_csv(StringIO(content), skiprows=42, nrows=3, sep='\t',
+                         index_col=0, engine='python')
+        df_header = pd.read_csv(StringIO(content), skiprows=2, nrows=39,
+                                header=None, sep='\t', index_col=0,
+                                engine='python').T
+        nlines = content.count('\n')
+        df_curves = pd.read_csv(StringIO(content), skiprows=47,
+                                nrows=nlines - 47 - 2, sep='\t',
+                                engine='python')
+
+    df_curves = df_curves.dropna(how='all', axis=1)
+    df_header.replace([np.inf, -np.inf, np.nan], 0, inplace=True)
+    df.replace([np.inf, -np.inf, np.nan], 0, inplace=True)
+    df = df.drop([np.nan]).astype(float)
+
+    jv_dict = {'active_area': float(df_header['Cell Area (cm2)'].iloc[0])}
+    for key, column in [('J_sc', 'Jsc'), ('V_oc', 'Voc'), ('Fill_factor', 'FF'),
+                        ('Efficiency', 'Eff'), ('P_MPP', 'P_MPP'),
+                        ('J_MPP', 'J_MPP'), ('U_MPP', 'V_MPP'),
+                        ('R_ser', 'Rs'), ('R_par', 'R//')]:
+        jv_dict[key] = list(df[column])[:2]
+    jv_dict['jv_curve'] = [
+        {'name': 'Scan ' + str(n + 1),
+         'voltage': df_curves[df_curves.columns[n]].values,
+         'current_density': df_curves[df_curves.columns[n + 1]].values}
+        for n in range(0, len(df_curves.columns), 2)]
+    return jv_dict
+
+
+def main(number=200):
+    contents = []
+    for path in DATA_FILES:
+        with open(path, 'rb') as f:
+            contents.append(f.read().decode('windows-1252'))
+
+    def run(reader):
+        for content in contents:
+            reader(io.StringIO(content))
+
+    legacy = timeit.timeit(lambda: run(read_file_jv_data_legacy), number=number)
+    current = timeit.timeit(lambda: run(read_file_jv_data), number=number)
+    n_files = number * len(contents)
+    print(f'files read:        {n_files}')
+    print(f'legacy reader:     {legacy / n_files * 1e6:9.1f} us/file')
+    print(f'read_file_jv_data: {current / n_files * 1e6:9.1f} us/file')
+    print(f'speedup:           {legacy / current:9.1f}x')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
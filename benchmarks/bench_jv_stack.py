@@ -0,0 +1,79 @@
+"""
+Size and serialization time of the JV scans of a stability run, stored as
+one entry per JV file and as one run entry with the curves in CSR layout.
+
+Run from the repository root:
+
+    python benchmarks/bench_jv_stack.py [n_scans]
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from nomad_test_parser.parsers.file_reading import read_jv_buffer
+from nomad_test_parser.parsers.jv_stack import stack_jv_dicts
+
+DATA_FILE = os.path.join('tests', 'data', '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt')
+JV_KEYS = ['J_sc', 'V_oc', 'Fill_factor', 'Efficiency', 'P_MPP', 'J_MPP', 'U_MPP']
+
+
+def get_file_entry(jv_dict):
+    # reference, kept here to measure against: the curve lists of one entry
+    # per JV file, as built from the `jv_dict` of every file
+    entry = {key: list(jv_dict[key]) for key in JV_KEYS}
+    entry['jv_curve'] = [
+        {
+            'name': curve['name'],
+            'voltage': curve['voltage'].tolist(),
+            'current_density': curve['current_density'].tolist(),
+        }
+        for curve in jv_dict['jv_curve']
+    ]
+    return entry
+
+
+def get_run_entry(stacked):
+    return {
+        key: value.tolist() if isinstance(value, np.ndarray) else value
+        for key, value in stacked.items()
+    }
+
+
+def main(n_scans=3000):
+    with open(DATA_FILE, 'rb') as f:
+        jv_dict, _ = read_jv_buffer(f.read())
+    rng = np.random.default_rng(0)
+    jv_dicts = []
+    for _ in range(n_scans):
+        scan = dict(jv_dict)
+        scan['jv_curve'] = [
+            dict(
+                curve, current_density=curve['current_density'] * rng.uniform(0.9, 1)
+            )
+            for curve in jv_dict['jv_curve']
+        ]
+        jv_dicts.append(scan)
+
+    start = time.perf_counter()
+    sizes = [len(json.dumps(get_file_entry(scan))) for scan in jv_dicts]
+    elapsed = time.perf_counter() - start
+    print(
+        f'{n_scans} scans, one entry per file: {n_scans} entries, '
+        f'{sum(sizes) / 1e6:6.1f} MB, {elapsed:6.2f} s'
+    )
+
+    start = time.perf_counter()
+    size = len(json.dumps(get_run_entry(stack_jv_dicts(jv_dicts))))
+    elapsed = time.perf_counter() - start
+    print(
+        f'{n_scans} scans, one run entry: 1 entry, '
+        f'{size / 1e6:6.1f} MB, {elapsed:6.2f} s'
+    )
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
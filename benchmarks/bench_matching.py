@@ -0,0 +1,73 @@
+"""
+Cost of matching the files of a large upload: `get_file_kind` on the name
+and the first bytes of every file, against the former separate name regular
+expressions of the entry points. A misnamed file passed the former matching
+and only failed in the reader, which is timed as well.
+
+Run from the repository root:
+
+    python benchmarks/bench_matching.py [n_files]
+"""
+
+import glob
+import os
+import re
+import sys
+import time
+
+from nomad_test_parser.parsers.file_reading import read_mppt_buffer
+from nomad_test_parser.parsers.matching import HEADER_SNIFF_SIZE, get_file_kind
+
+DATA_FILES = sorted(glob.glob('tests/data/*'))
+# the former `mainfile_name_re` of the entry points
+ENTRY_POINT_RES = [
+    r'.*JV\.txt',
+    r'.*_IPCE_.*\.txt',
+    r'.*Tracking\.txt',
+    r'.*_Parameters\.txt',
+]
+
+
+def match_legacy(file_name):
+    return [pattern for pattern in ENTRY_POINT_RES if re.match(pattern, file_name)]
+
+
+def main(n_files=20000):
+    heads = []
+    for path in DATA_FILES:
+        with open(path, 'rb') as f:
+            heads.append((os.path.basename(path), f.read(8192)))
+    files = [
+        (f'upload/run_{index // len(heads)}/{name}', head)
+        for index, (name, head) in enumerate(heads * (n_files // len(heads)))
+    ]
+
+    start = time.perf_counter()
+    for file_name, _ in files:
+        match_legacy(file_name)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for file_name, head in files:
+        get_file_kind(file_name, head[:HEADER_SNIFF_SIZE])
+    current = time.perf_counter() - start
+
+    # a JV file named like a tracking file
+    with open('tests/data/001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt', 'rb') as f:
+        content = f.read()
+    start = time.perf_counter()
+    try:
+        read_mppt_buffer(content)
+    except Exception:  # noqa: BLE001
+        pass
+    misnamed = time.perf_counter() - start
+
+    n_files = len(files)
+    for label, elapsed in [('entry point regexes', legacy), ('get_file_kind', current)]:
+        per_file = elapsed / n_files * 1e6
+        print(f'{n_files} files, {label + ":":20s} {per_file:7.2f} us/file')
+    print(f'misnamed file through the reader:      {misnamed * 1e6:7.0f} us')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
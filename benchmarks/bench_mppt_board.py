@@ -0,0 +1,55 @@
+"""
+Timing of `summarize_board` for the tracks of a 32-pixel board, in this
+process, on a process pool with the tracks in shared memory, and on a process
+pool that pickles the tracks to the workers.
+
+Run from the repository root:
+
+    python benchmarks/bench_mppt_board.py [n_rows] [n_pixels] [max_workers]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from nomad_test_parser.parsers.mppt_board import summarize_board, summarize_pixel
+
+
+def summarize_board_pickled(tracks, max_workers):
+    # reference, kept here to measure against: the arrays are pickled to the
+    # workers
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(
+                summarize_pixel,
+                [time for time, _ in tracks.values()],
+                [power for _, power in tracks.values()],
+            )
+        )
+
+
+def main(n_rows=2000000, n_pixels=32, max_workers=None):
+    max_workers = max_workers or os.cpu_count()
+    rng = np.random.default_rng(0)
+    time_data = np.linspace(0, 100, n_rows)
+    tracks = {
+        f'pixel {index}': (time_data, 15 - 0.01 * time_data + rng.normal(size=n_rows))
+        for index in range(n_pixels)
+    }
+
+    for label, run in [
+        ('serial', lambda: summarize_board(tracks)),
+        ('shared memory', lambda: summarize_board(tracks, max_workers=max_workers)),
+        ('pickled arrays', lambda: summarize_board_pickled(tracks, max_workers)),
+    ]:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(f'{n_pixels} pixels x {n_rows} rows, {label:15s} {elapsed:7.2f} s')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
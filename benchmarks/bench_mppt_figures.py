@@ -0,0 +1,87 @@
+"""
+Timing of the "Averages" figure of `UNITOV_MPPTracking_Measurement.normalize`
+for a synthetic board of 96 pixels with 100k points each: the former
+`pd.concat` loop with `plotly.express` against `get_scatter_figure`.
+The per-pixel `ureg('hr')` multiplication of the former code is left out.
+
+Run from the repository root (the legacy path needs `plotly`):
+
+    python benchmarks/bench_mppt_figures.py [n_pixels] [n_points]
+"""
+
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from nomad_test_parser.parsers.plotting import get_scatter_figure
+
+COLUMN_NAMES = ['Time [hr]', 'Efficiency [%]', 'P']
+
+
+def get_pixels(n_pixels, n_points):
+    rng = np.random.default_rng(0)
+    time_axis = np.linspace(0, 1000, n_points)
+    return [
+        SimpleNamespace(
+            name=f'pixel {index}',
+            time=time_axis,
+            efficiency=20 * np.exp(-time_axis / rng.uniform(500, 5000))
+            + rng.normal(0, 0.1, n_points),
+        )
+        for index in range(n_pixels)
+    ]
+
+
+def get_figure_legacy(pixels):
+    import plotly.express as px
+
+    df = pd.DataFrame(columns=COLUMN_NAMES)
+    for avg in pixels:
+        df1 = pd.DataFrame(columns=COLUMN_NAMES)
+        df1[COLUMN_NAMES[0]] = avg.time
+        df1[COLUMN_NAMES[1]] = avg.efficiency
+        df1[COLUMN_NAMES[2]] = avg.name
+        df = pd.concat([df, df1])
+
+    fig = px.scatter(
+        df,
+        x=COLUMN_NAMES[0],
+        y=COLUMN_NAMES[1],
+        color=COLUMN_NAMES[2],
+        symbol=COLUMN_NAMES[2],
+        title='Averages',
+    )
+    fig.update_traces(marker=dict(size=4))
+    fig.update_layout(
+        showlegend=True,
+        xaxis=dict(fixedrange=False),
+        yaxis=dict(fixedrange=False),
+    )
+    return fig.to_plotly_json()
+
+
+def get_figure(pixels):
+    return get_scatter_figure(
+        'Averages',
+        [(avg.name, avg.time, avg.efficiency) for avg in pixels],
+        COLUMN_NAMES,
+    )
+
+
+def main(n_pixels=96, n_points=100000):
+    pixels = get_pixels(n_pixels, n_points)
+    for label, builder in [
+        ('legacy', get_figure_legacy),
+        ('get_scatter_figure', get_figure),
+    ]:
+        start = time.perf_counter()
+        figure = builder(pixels)
+        elapsed = time.perf_counter() - start
+        print(f'{label:20s} {elapsed:8.2f} s, {len(figure["data"])} traces')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
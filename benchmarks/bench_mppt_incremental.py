@@ -0,0 +1,54 @@
+"""
+Timing of re-reading a growing tracking file after new rows were appended,
+with `read_mppt_incremental` against parsing the whole file again with
+`read_mppt_buffer`.
+
+Run from the repository root:
+
+    python benchmarks/bench_mppt_incremental.py [n_rows] [n_new_rows]
+"""
+
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from nomad_test_parser.parsers.file_reading import read_mppt_buffer
+from nomad_test_parser.parsers.incremental import read_mppt_incremental
+
+DATA_FILE = 'tests/data/000_2023_10_19_18.33.10_1A_3C_C1_1_Tracking.txt'
+
+
+def make_rows(start, n_rows):
+    time_data = (start + np.arange(n_rows)) * 1e-4
+    values = np.column_stack(
+        [time_data, np.full(n_rows, 0.62), np.full(n_rows, 10.3), np.full(n_rows, 6.38)]
+    )
+    return ''.join(f'{t:.6E}\t{v}\t{j}\t{p}\n' for t, v, j, p in values).encode()
+
+
+def main(n_rows=1000000, n_new_rows=1000):
+    with open(DATA_FILE, 'rb') as f:
+        header = b''.join(f.readlines()[:43])
+    content = header + make_rows(0, n_rows)
+    grown = content + make_rows(n_rows, n_new_rows)
+
+    with tempfile.TemporaryDirectory() as directory:
+        read_mppt_incremental(content, directory, 'bench')
+
+        start = time.perf_counter()
+        read_mppt_buffer(grown)
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        mppt_dict, _ = read_mppt_incremental(grown, directory, 'bench')
+        incremental = time.perf_counter() - start
+
+    assert len(mppt_dict['time_data']) == n_rows + n_new_rows
+    print(f'{n_rows} + {n_new_rows} rows, full re-read: {full:7.3f} s')
+    print(f'{n_rows} + {n_new_rows} rows, incremental:  {incremental:7.3f} s')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,74 @@
+"""
+Timing of reading and parsing the JV files of an upload one after the other
+on a file system with a given latency per open, with and without the
+read-ahead of `open_raw_file`.
+
+Run from the repository root:
+
+    python benchmarks/bench_prefetch.py [n_files] [latency_ms] [depth]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from nomad_test_parser.parsers import prefetch
+from nomad_test_parser.parsers.file_reading import read_jv_buffer
+from nomad_test_parser.parsers.raw_file import open_raw_file
+
+DATA_FILE = 'tests/data/001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt'
+
+
+class SlowContext:
+    def __init__(self, directory, latency):
+        self.directory = directory
+        self.latency = latency
+
+    def raw_file(self, path, mode):
+        time.sleep(self.latency)
+        return open(os.path.join(self.directory, path), mode)
+
+
+class Metadata:
+    upload_id = None
+
+
+class Archive:
+    def __init__(self, context):
+        self.m_context = context
+        self.metadata = Metadata()
+
+
+def process_upload(directory, latency, options):
+    archive = Archive(SlowContext(directory, latency))
+    start = time.perf_counter()
+    for path in sorted(os.listdir(directory)):
+        with open_raw_file(archive, path, prefetch=options) as buffer:
+            read_jv_buffer(buffer)
+    elapsed = time.perf_counter() - start
+    prefetch.close_prefetchers()
+    return elapsed
+
+
+def main(n_files=200, latency_ms=20, depth=8):
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(n_files):
+            shutil.copy(
+                DATA_FILE, os.path.join(directory, f'{index:03d}_bench_1A_C1_JV.txt')
+            )
+
+        latency = latency_ms / 1000
+        serial = process_upload(directory, latency, None)
+        ahead = process_upload(
+            directory, latency, dict(depth=depth, max_bytes=256 * 1024**2)
+        )
+
+    print(f'{n_files} files, {latency_ms} ms latency, serial:     {serial:6.2f} s')
+    print(f'{n_files} files, {latency_ms} ms latency, read-ahead: {ahead:6.2f} s '
+          f'(depth {depth})')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
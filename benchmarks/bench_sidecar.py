@@ -0,0 +1,78 @@
+"""
+Archive size and load time of the example upload written as plain JSON and
+as JSON with an HDF5 side-car for the arrays.
+
+Run from the repository root:
+
+    python benchmarks/bench_sidecar.py [min_size] [n_loads]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+
+from nomad_test_parser.parsers.batch import parse_run_file
+from nomad_test_parser.parsers.sidecar import read_archive, write_archive
+
+DATA_DIR = 'tests/data'
+
+
+def materialize(value):
+    if isinstance(value, dict):
+        return {key: materialize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [materialize(item) for item in value]
+    if hasattr(value, '__array__'):
+        return np.asarray(value)
+    return value
+
+
+def main(min_size=32, n_loads=50):
+    archives = {}
+    for file_name in sorted(os.listdir(DATA_DIR)):
+        archive = parse_run_file(DATA_DIR, file_name)
+        if archive is not None:
+            archives[file_name] = archive
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f'{"file":55s} {"json":>10s} {"side-car":>10s} '
+              f'{"load json":>10s} {"lazy":>10s} {"full":>10s}')
+        for file_name, archive in archives.items():
+            json_path = os.path.join(directory, f'{file_name}.archive.json')
+            with open(json_path, 'w') as f:
+                json.dump(archive, f)
+            json_size = os.path.getsize(json_path)
+
+            sidecar_path = os.path.join(
+                directory, 'sidecar', f'{file_name}.archive.json'
+            )
+            os.makedirs(os.path.dirname(sidecar_path), exist_ok=True)
+            write_archive(archive, sidecar_path, min_size=min_size)
+            h5_path = f'{os.path.splitext(sidecar_path)[0]}.h5'
+            sidecar_size = os.path.getsize(sidecar_path) + (
+                os.path.getsize(h5_path) if os.path.exists(h5_path) else 0
+            )
+
+            def load_json():
+                with open(json_path) as f:
+                    json.load(f)
+
+            load = timeit.timeit(load_json, number=n_loads) / n_loads
+            lazy = (
+                timeit.timeit(lambda: read_archive(sidecar_path), number=n_loads)
+                / n_loads
+            )
+            full = timeit.timeit(
+                lambda: materialize(read_archive(sidecar_path)), number=n_loads
+            ) / n_loads
+
+            print(f'{file_name:55s} {json_size:10d} {sidecar_size:10d} '
+                  f'{load * 1e3:8.2f}ms {lazy * 1e3:8.2f}ms {full * 1e3:8.2f}ms')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,97 @@
+"""
+Fixtures of the pytest-benchmark suite. Run from the repository root:
+
+    python -m pytest benchmarks --benchmark-max-rows 1000000
+
+To keep a baseline (in `.benchmarks`, per machine) and fail on regressions of
+the mean time against it:
+
+    python -m pytest benchmarks --benchmark-save baseline
+    python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail mean:20%
+
+The synthetic files are generated once per session. Besides the timings,
+`extra_info` of every benchmark holds the throughput (files/s, MB/s), the
+peak memory allocated by one call and the peak RSS of the process.
+"""
+
+import os
+import resource
+import sys
+import tracemalloc
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from synthetic import write_file  # noqa: E402
+
+ROWS = [100, 10000, 1000000, 10000000]
+# larger files are timed in fewer rounds
+ROUNDS_ROWS = 1000000
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--benchmark-max-rows',
+        type=int,
+        default=1000000,
+        help='largest synthetic file (in data rows) to benchmark',
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if 'n_rows' in metafunc.fixturenames:
+        max_rows = metafunc.config.getoption('--benchmark-max-rows')
+        metafunc.parametrize('n_rows', [rows for rows in ROWS if rows <= max_rows])
+
+
+@pytest.fixture(scope='session')
+def synthetic_file(tmp_path_factory):
+    paths = {}
+
+    def get_file(kind, n_rows):
+        if (kind, n_rows) not in paths:
+            directory = tmp_path_factory.mktemp(f'{kind}_{n_rows}')
+            paths[kind, n_rows] = write_file(str(directory), kind, n_rows)
+        return paths[kind, n_rows]
+
+    return get_file
+
+
+def get_peak_rss():
+    # kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+@pytest.fixture
+def run_benchmark(benchmark):
+    """
+    Times `function()` on the file at `path` and records its throughput and
+    memory use in `benchmark.extra_info`.
+    """
+
+    def run(function, path, n_rows):
+        tracemalloc.start()
+        function()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        if n_rows >= ROUNDS_ROWS:
+            result = benchmark.pedantic(function, rounds=3, iterations=1)
+        else:
+            result = benchmark(function)
+
+        mean = benchmark.stats.stats.mean
+        size = os.path.getsize(path) / 2**20
+        benchmark.extra_info.update(
+            rows=n_rows,
+            file_mb=round(size, 3),
+            files_per_s=round(1 / mean, 2),
+            mb_per_s=round(size / mean, 2),
+            peak_memory_mb=round(peak_memory / 2**20, 2),
+            peak_rss_mb=round(get_peak_rss(), 1),
+        )
+        return result
+
+    return run
@@ -0,0 +1,83 @@
+"""
+Synthetic UNITOV files of arbitrary length for the benchmarks.
+
+The header of every file is the one of the matching example in `tests/data`,
+byte for byte, so the readers see the real layout (and the windows-1252
+units of the JV files); only the data rows are generated.
+"""
+
+import os
+
+import numpy as np
+
+DATA_DIR = os.path.join('tests', 'data')
+TEMPLATES = {
+    'JV': '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt',
+    'IPCE': '2024-01-25_18.05.03_IPCE_Hafez-H7-PTAA_T_23C.txt',
+    'Tracking': '000_2023_10_19_18.33.10_1A_3C_C1_1_Tracking.txt',
+}
+# the line naming the columns of the generated rows
+COLUMNS_LINES = {
+    'JV': b'V (V)\t',
+    'IPCE': b'Wavelength (nm)\t',
+    'Tracking': b'Time (hours)\t',
+}
+FILE_NAMES = {
+    'JV': '{index:03d}_2023_10_19_18.33.25_1A_BENCH_JV.txt',
+    'IPCE': '2024-01-25_18.05.03_IPCE_BENCH-{index:03d}.txt',
+    'Tracking': '{index:03d}_2023_10_19_18.33.10_1A_BENCH_Tracking.txt',
+}
+
+
+def read_template_header(kind):
+    """
+    Returns the bytes of the example file of `kind` up to and including the
+    line naming the data columns.
+    """
+    with open(os.path.join(DATA_DIR, TEMPLATES[kind]), 'rb') as f:
+        content = f.read()
+    start = content.index(b'\n' + COLUMNS_LINES[kind]) + 1
+    return content[: content.index(b'\n', start) + 1]
+
+
+def get_rows(kind, n_rows, seed=0):
+    """
+    Returns the `(format, values)` of `n_rows` plausible data rows of `kind`.
+    """
+    rng = np.random.default_rng(seed)
+    index = np.arange(n_rows)
+    noise = rng.normal(scale=0.01, size=n_rows)
+    if kind == 'JV':
+        # FW and RV sweeps between -0.1 and 1.3 V in steps of 20 mV
+        voltage = -0.1 + 0.02 * (index % 71)
+        current = 18 * (1 - np.exp((voltage - 0.8) / 0.05)) + noise
+        return '%.6E\t%.6E\t%.6E\t%.6E', np.column_stack(
+            [voltage, current, voltage[::-1], current[::-1]]
+        )
+    if kind == 'IPCE':
+        wavelength = 300 + 600 * index / max(n_rows - 1, 1)
+        eqe = 80 / (1 + np.exp((wavelength - 780) / 15)) + noise
+        return '%.2f\t%.5E\t%.5E\t%.5E\t%.5E', np.column_stack(
+            [wavelength, eqe, eqe * 1e-6, np.cumsum(eqe) * 1e-3, np.full(n_rows, 1e-3)]
+        )
+    if kind == 'Tracking':
+        time = 0.007 + index * 7e-4
+        voltage = 0.6 + noise
+        current = 12.5 - 0.0001 * index / max(n_rows, 1) + noise
+        return '%.6f\t%.6f\t%.6f\t%.6f', np.column_stack(
+            [time, voltage, current, voltage * current]
+        )
+    raise ValueError(f'unknown file kind {kind}')
+
+
+def write_file(directory, kind, n_rows, index=0):
+    """
+    Writes a `kind` ('JV', 'IPCE' or 'Tracking') file with `n_rows` data rows
+    named like the instrument files to `directory` and returns its path.
+    """
+    path = os.path.join(directory, FILE_NAMES[kind].format(index=index))
+    fmt, values = get_rows(kind, n_rows, seed=index)
+    with open(path, 'wb') as f:
+        f.write(read_template_header(kind))
+        np.savetxt(f, values, fmt=fmt, delimiter='\t')
+    return path
@@ -0,0 +1,25 @@
+"""
+Benchmarks of the `UNITOV_*` normalize methods, from the raw file in a
+directory to the serialized archive, as run by the batch mode.
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip('nomad')
+
+from nomad_test_parser.parsers.batch import parse_run_file  # noqa: E402
+
+
+@pytest.mark.benchmark(group='normalize')
+@pytest.mark.parametrize('kind', ['JV', 'IPCE', 'Tracking'])
+def test_normalize(run_benchmark, synthetic_file, kind, n_rows):
+    path = synthetic_file(kind, n_rows)
+    directory, file_name = os.path.split(path)
+
+    archive = run_benchmark(lambda: parse_run_file(directory, file_name), path, n_rows)
+    assert archive['data']['data_file'] == file_name
+    if kind == 'Tracking':
+        # the tracking file was read, not skipped
+        assert archive['data']['load_data_from_file'] is False
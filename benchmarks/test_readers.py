@@ -0,0 +1,92 @@
+"""
+Benchmarks of the raw file readers, on text streams as in the former
+normalizers and on the raw bytes as given by `open_raw_file`.
+"""
+
+import pytest
+
+from nomad_test_parser.parsers import file_reading
+from nomad_test_parser.parsers.file_reading import (
+    read_eqe_buffer,
+    read_file_eqe,
+    read_file_jv_data,
+    read_jv_buffer,
+    read_mppt_buffer,
+    read_mppt_file,
+)
+
+# the encoding of the instrument files
+ENCODING = 'windows-1252'
+# as passed by `UNITOV_EQEmeasurement.normalize`
+EQE_HEADER_LINES = 24
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.benchmark(group='read JV')
+def test_read_file_jv_data(run_benchmark, synthetic_file, n_rows):
+    path = synthetic_file('JV', n_rows)
+
+    def read():
+        return read_file_jv_data(open(path, encoding=ENCODING))
+
+    jv_dict, _ = run_benchmark(read, path, n_rows)
+    assert len(jv_dict['jv_curve'][0]['voltage']) == n_rows
+
+
+@pytest.mark.benchmark(group='read JV')
+def test_read_jv_buffer(run_benchmark, synthetic_file, n_rows):
+    path = synthetic_file('JV', n_rows)
+
+    jv_dict, _ = run_benchmark(lambda: read_jv_buffer(read_bytes(path)), path, n_rows)
+    assert len(jv_dict['jv_curve'][0]['voltage']) == n_rows
+
+
+@pytest.mark.benchmark(group='read EQE')
+def test_read_file_eqe(run_benchmark, synthetic_file, n_rows):
+    path = synthetic_file('IPCE', n_rows)
+    file_reading.EQE_LAYOUT_CACHE.clear()
+
+    def read():
+        with open(path, encoding=ENCODING) as f:
+            return read_file_eqe(f, header_lines=EQE_HEADER_LINES)
+
+    eqe_dict, _ = run_benchmark(read, path, n_rows)
+    assert len(eqe_dict['eqe_raw']) == n_rows
+
+
+@pytest.mark.benchmark(group='read EQE')
+def test_read_eqe_buffer(run_benchmark, synthetic_file, n_rows):
+    path = synthetic_file('IPCE', n_rows)
+    file_reading.EQE_LAYOUT_CACHE.clear()
+
+    def read():
+        return read_eqe_buffer(read_bytes(path), header_lines=EQE_HEADER_LINES)
+
+    eqe_dict, _ = run_benchmark(read, path, n_rows)
+    assert len(eqe_dict['eqe_raw']) == n_rows
+
+
+@pytest.mark.benchmark(group='read MPPT')
+def test_read_mppt_file(run_benchmark, synthetic_file, n_rows):
+    path = synthetic_file('Tracking', n_rows)
+
+    def read():
+        with open(path, encoding=ENCODING) as f:
+            return read_mppt_file(f.read())
+
+    mppt_dict, _ = run_benchmark(read, path, n_rows)
+    assert len(mppt_dict['time_data']) == n_rows
+
+
+@pytest.mark.benchmark(group='read MPPT')
+def test_read_mppt_buffer(run_benchmark, synthetic_file, n_rows):
+    path = synthetic_file('Tracking', n_rows)
+
+    mppt_dict, _ = run_benchmark(
+        lambda: read_mppt_buffer(read_bytes(path)), path, n_rows
+    )
+    assert len(mppt_dict['time_data']) == n_rows
@@ -1,11 +1,65 @@
 from nomad.config.models.plugins import ParserEntryPoint
 from pydantic import Field
 
-class MPPTParserEntryPoint(ParserEntryPoint):
+
+class UNITOVParserEntryPoint(ParserEntryPoint):
+    """
+    Options shared by the UNITOV parsers. Each parser and the normalization of
+    its entries read them from their own entry point.
+    """
+
     parameter: int = Field(0, description='Custom configuration parameter')
+    parse_cache_directory: str | None = Field(
+        None,
+        description='Directory of the on-disk cache of the raw files parsed by '
+        'this parser. The cache is disabled if not set.',
+    )
+    parse_cache_max_size: int = Field(
+        1024**3,
+        description='Size cap in bytes of the parse cache, least recently used '
+        'entries are removed first.',
+    )
+    prefetch_depth: int = Field(
+        0,
+        description='Number of raw files of this parser in a directory of an upload '
+        'read ahead on a thread pool while the current one is normalized. '
+        'Disabled if 0.',
+    )
+    prefetch_max_bytes: int = Field(
+        256 * 1024**2,
+        description='No further files are read ahead while the files read ahead '
+        'hold this many bytes.',
+    )
+    timing: bool = Field(
+        False,
+        description='Log the time spent in each stage of parsing and normalizing '
+        '(open, encoding, header, data, archive, figures, serialize) per entry '
+        'of this parser.',
+    )
+
+
+class MPPTParserEntryPoint(UNITOVParserEntryPoint):
+    plot_max_points: int = Field(
+        5000,
+        description='Maximum number of points per trace in the MPPT figures. '
+        'Longer traces are decimated (min/max preserving), the full data stays '
+        'in the section quantities.',
+    )
+    incremental_directory: str | None = Field(
+        None,
+        description='Directory for the state of the incremental ingestion of '
+        'tracking files. If set, only the rows appended to a tracking file since '
+        'it was last processed are parsed. Disabled if not set.',
+    )
+    incremental_max_size: int = Field(
+        10 * 1024**3,
+        description='Maximum size in bytes of the incremental ingestion states. '
+        'If exceeded, the states of the least recently updated tracking files are '
+        'removed first.',
+    )
 
     def load(self):
-        from nomad_test_parser.parsers.parser import MPPTParser
+        from nomad_test_parser.parsers.unitov import MPPTParser
 
         return MPPTParser(**self.model_dump())
 
@@ -17,11 +71,9 @@ parser_mppt_entry_point = MPPTParserEntryPoint(
     # mainfile_name_re=r'.*\.newmainfilename',
 )
 
-class EQEParserEntryPoint(ParserEntryPoint):
-    parameter: int = Field(0, description='Custom configuration parameter')
-
+class EQEParserEntryPoint(UNITOVParserEntryPoint):
     def load(self):
-        from nomad_test_parser.parsers.parser import EQEParser
+        from nomad_test_parser.parsers.unitov import EQEParser
 
         return EQEParser(**self.model_dump())
 
@@ -31,11 +83,62 @@ parser_eqe_entry_point = EQEParserEntryPoint(
     mainfile_name_re=r'.*_IPCE_.*\.txt',
 )
 
-class NewParserEntryPoint(ParserEntryPoint):
-    parameter: int = Field(0, description='Custom configuration parameter')
+class ParametersParserEntryPoint(UNITOVParserEntryPoint):
+    plot_max_points: int = Field(
+        5000,
+        description='Maximum number of points per trace in the efficiency figures '
+        'of a run. Longer traces are decimated (min/max preserving), the full data '
+        'stays in the section quantities.',
+    )
+    incremental_directory: str | None = Field(
+        None,
+        description='Directory for the run summaries of parameters files. If set, '
+        'only the scans appended to a parameters file since it was last processed '
+        'are added to its run summary. Disabled if not set.',
+    )
+    incremental_max_size: int = Field(
+        10 * 1024**3,
+        description='Maximum size in bytes of the stored run summaries. If '
+        'exceeded, the summaries of the least recently updated parameters files '
+        'are removed first.',
+    )
+
+    def load(self):
+        from nomad_test_parser.parsers.unitov import ParametersParser
+
+        return ParametersParser(**self.model_dump())
+
+
+parser_parameters_entry_point = ParametersParserEntryPoint(
+    name='ParametersParser',
+    description='Parser entry point for the figures of merit of a stability run.',
+    mainfile_name_re=r'.*_Parameters\.txt',
+)
+
+class NewParserEntryPoint(UNITOVParserEntryPoint):
+    aggregate_jv_scans: bool = Field(
+        False,
+        description='Store all JV scans of a stability run in one run entry, '
+        'written next to the entry of its parameters file, instead of one entry '
+        'per JV file. The run entry reads the JV files with the options of this '
+        'entry point. The JV files of runs without parameters file stay entries of '
+        'their own.',
+    )
+    incremental_directory: str | None = Field(
+        None,
+        description='Directory for the stacked scans of the run entries of '
+        '`aggregate_jv_scans`. If set, only the JV files added to a run since it '
+        'was last normalized are read. Otherwise all JV files of the run are read '
+        'again for every new scan. Disabled if not set.',
+    )
+    incremental_max_size: int = Field(
+        10 * 1024**3,
+        description='Maximum size in bytes of the stacked scans of the runs. If '
+        'exceeded, the scans of the least recently updated runs are removed first.',
+    )
 
     def load(self):
-        from nomad_test_parser.parsers.parser import JVParser
+        from nomad_test_parser.parsers.unitov import JVParser
 
         return JVParser(**self.model_dump())
 
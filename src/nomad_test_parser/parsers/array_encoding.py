@@ -0,0 +1,121 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Compact encodings of the float arrays of the readers for storage.
+
+The instruments write their values with a fixed number of decimals, e.g. the
+tracking files with six. Such an array is stored exactly as int32 with a
+decimal scale: `encode_array` finds the fewest decimals `k` for which
+`round(values * 10**k) / 10**k` gives back every value bit for bit, the
+division being correctly rounded like the parsing of the text. If the scaled
+integers are equally spaced, the array is only described by `start`, `step`
+and `count`. Arrays without a fitting scale are stored as float32 if this is
+exact, else as float64.
+
+With `decimals`, the values are instead rounded to that many decimals, e.g.
+the resolution of the instrument, and may change by up to half a unit of the
+last decimal.
+"""
+
+import numpy as np
+
+# up to 1 nV or 1 nA/cm^2; larger scales rarely fit into int32
+MAX_DECIMALS = 9
+INT32_MAX = np.iinfo(np.int32).max
+# a range is stored as three numbers, so it only pays off for more values
+MIN_RANGE_VALUES = 3
+
+
+def get_decimals(values, max_decimals=MAX_DECIMALS):
+    """
+    Returns the fewest decimals with which all `values` are written exactly
+    and the scaled values fit into int32, or None if there are none up to
+    `max_decimals`.
+    """
+    if values.size == 0:
+        return 0
+    if not np.isfinite(values).all():
+        return None
+    for decimals in range(max_decimals + 1):
+        scale = 10.0**decimals
+        scaled = np.round(values * scale)
+        if np.abs(scaled).max() > INT32_MAX:
+            return None
+        if np.array_equal(scaled / scale, values):
+            return decimals
+    return None
+
+
+def encode_array(values, decimals=None):
+    """
+    Encodes the float array `values`, exactly or, with `decimals`, rounded to
+    that many decimals.
+
+    Returns:
+        dict with the `encoding` and its parameters: `range` with `start`,
+        `step`, `count` and `decimals`; `scaled` with int32 `values` and
+        `decimals`; `float32` or `float64` with `values`
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if decimals is None:
+        decimals = get_decimals(values)
+    elif not np.isfinite(values).all() or (
+        values.size and np.abs(values).max() * 10.0**decimals > INT32_MAX
+    ):
+        decimals = None
+
+    if decimals is None:
+        float32 = values.astype(np.float32)
+        if np.array_equal(float32.astype(np.float64), values, equal_nan=True):
+            return {'encoding': 'float32', 'values': float32}
+        return {'encoding': 'float64', 'values': values}
+
+    scaled = np.round(values * 10.0**decimals).astype(np.int64)
+    if values.ndim == 1 and len(values) >= MIN_RANGE_VALUES:
+        steps = np.diff(scaled)
+        if (steps == steps[0]).all():
+            return {
+                'encoding': 'range',
+                'start': int(scaled[0]),
+                'step': int(steps[0]),
+                'count': len(values),
+                'decimals': decimals,
+            }
+    return {
+        'encoding': 'scaled',
+        'values': scaled.astype(np.int32),
+        'decimals': decimals,
+    }
+
+
+def decode_array(encoded):
+    """
+    Returns the float64 array of an `encode_array` result.
+    """
+    encoding = encoded['encoding']
+    if encoding == 'range':
+        scaled = int(encoded['start']) + int(encoded['step']) * np.arange(
+            int(encoded['count']), dtype=np.int64
+        )
+        return scaled / 10.0 ** int(encoded['decimals'])
+    if encoding == 'scaled':
+        return np.asarray(encoded['values'], dtype=np.int64) / 10.0 ** int(
+            encoded['decimals']
+        )
+    return np.asarray(encoded['values'], dtype=np.float64)
@@ -0,0 +1,217 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Batch mode for a whole stability run directory (or the raw directory of an
+upload). The files are grouped by the device/channel encoded in their names
+and parsed on a process pool, so the plugin and NOMAD imports are paid once
+per worker instead of once per file:
+
+    python -m nomad_test_parser.parsers.batch <directory> --workers 32 --output <dir>
+"""
+
+import datetime
+import json
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from nomad.datamodel.context import Context
+
+from nomad_test_parser.parsers.sidecar import write_archive
+
+# NNN_<yyyy_mm_dd_HH.MM.SS>_<channel>_<device>_<kind>.txt
+RUN_FILE_RE = re.compile(
+    r'^(?P<index>\d+)_(?P<timestamp>\d{4}_\d{2}_\d{2}_\d{2}\.\d{2}\.\d{2})_'
+    r'(?P<channel>[^_]+)_(?P<device>.+)_(?P<kind>JV|Tracking|Parameters)\.txt$'
+)
+# <yyyy-mm-dd_HH.MM.SS>_IPCE_<device>.txt
+IPCE_FILE_RE = re.compile(
+    r'^(?P<timestamp>\d{4}-\d{2}-\d{2}_\d{2}\.\d{2}\.\d{2})_(?P<kind>IPCE)_'
+    r'(?P<device>.+)\.txt$'
+)
+
+# section (in `nomad_test_parser.parsers.parser`) built for each file kind
+SECTIONS = {
+    'JV': 'UNITOV_JVmeasurement',
+    'Tracking': 'UNITOV_MPPTracking_Measurement',
+    'IPCE': 'UNITOV_EQEmeasurement',
+    'Parameters': 'UNITOV_StabilityParameters',
+}
+
+
+def parse_file_name(file_name):
+    """
+    Returns the `index`, `timestamp`, `channel`, `device` and `kind` encoded in
+    the name of a UNITOV file, or None if the name does not follow the
+    instrument naming. IPCE files carry neither index nor channel.
+    """
+    match = RUN_FILE_RE.match(file_name) or IPCE_FILE_RE.match(file_name)
+    if match is None:
+        return None
+    info = dict(index=None, channel=None)
+    info.update(match.groupdict())
+    if info['index'] is not None:
+        info['index'] = int(info['index'])
+    return info
+
+
+def group_run_files(file_names):
+    """
+    Groups UNITOV file names by `(device, channel)`. Within a group the files
+    are sorted by their running index and timestamp, names that do not follow
+    the instrument naming are left out.
+    """
+    groups = defaultdict(list)
+    for file_name in file_names:
+        info = parse_file_name(os.path.basename(file_name))
+        if info is not None:
+            groups[(info['device'], info['channel'])].append((info, file_name))
+
+    return {
+        key: [
+            file_name
+            for _, file_name in sorted(
+                files, key=lambda file: (file[0]['index'] or 0, file[0]['timestamp'])
+            )
+        ]
+        for key, files in groups.items()
+    }
+
+
+class DirectoryContext(Context):
+    """
+    Context that serves the raw files of the entries from a local directory.
+    """
+
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+
+    def raw_file(self, path, *args, **kwargs):
+        return open(os.path.join(self.directory, path), *args, **kwargs)
+
+    def raw_path_exists(self, path):
+        return os.path.exists(os.path.join(self.directory, path))
+
+
+def parse_run_file(directory, file_name):
+    """
+    Builds and normalizes the UNITOV section of one raw file and returns the
+    serialized archive. Runs in the worker processes.
+    """
+    from nomad import utils
+    from nomad.datamodel import EntryArchive, EntryMetadata
+
+    from nomad_test_parser.parsers import parser
+
+    info = parse_file_name(file_name)
+    if info is None or info['kind'] not in SECTIONS:
+        return None
+
+    logger = utils.get_logger(__name__, mainfile=file_name)
+    archive = EntryArchive(
+        m_context=DirectoryContext(directory),
+        metadata=EntryMetadata(mainfile=file_name, entry_name=file_name),
+    )
+    archive.data = getattr(parser, SECTIONS[info['kind']])()
+    archive.data.datetime = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+    archive.data.data_file = file_name
+    archive.data.normalize(archive, logger)
+
+    return archive.m_to_dict(with_root_def=True)
+
+
+def parse_run_directory(
+    directory, max_workers=None, output=None, sidecar=False, encode=False
+):
+    """
+    Parses all UNITOV files in `directory` on a `ProcessPoolExecutor` with
+    `max_workers` processes (default: number of cores).
+
+    Files are submitted one by one in chunks, so the load stays balanced
+    across workers even for runs with few devices. If `output` is given, each
+    archive is written there as `<file>.archive.json`, with `sidecar` its
+    large arrays in a `<file>.archive.h5` side-car (see `sidecar.write_archive`),
+    with `encode` compactly encoded.
+
+    Returns:
+        dict mapping `(device, channel)` to the list of `(file name, archive
+        dict)` of the group, in run order
+    """
+    groups = group_run_files(sorted(os.listdir(directory)))
+    file_names = [file_name for files in groups.values() for file_name in files]
+    if output is not None:
+        os.makedirs(output, exist_ok=True)
+
+    archives = {}
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(file_names) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            parse_run_file,
+            [directory] * len(file_names),
+            file_names,
+            chunksize=chunksize,
+        )
+        for file_name, archive in zip(file_names, results):
+            archives[file_name] = archive
+            if output is not None and archive is not None:
+                path = os.path.join(output, f'{file_name}.archive.json')
+                if sidecar:
+                    write_archive(archive, path, encode=encode)
+                else:
+                    with open(path, 'w') as f:
+                        json.dump(archive, f)
+
+    return {
+        key: [(file_name, archives[file_name]) for file_name in files]
+        for key, files in groups.items()
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(
+        description='Parse all UNITOV files of a stability run directory.'
+    )
+    arg_parser.add_argument('directory')
+    arg_parser.add_argument('--workers', type=int, default=None)
+    arg_parser.add_argument('--output', default=None)
+    arg_parser.add_argument(
+        '--sidecar',
+        action='store_true',
+        help='write the large arrays of the archives into HDF5 side-cars',
+    )
+    arg_parser.add_argument(
+        '--encode',
+        action='store_true',
+        help='store the side-car arrays compactly and shared arrays once',
+    )
+    args = arg_parser.parse_args()
+
+    for (device, channel), files in parse_run_directory(
+        args.directory,
+        max_workers=args.workers,
+        output=args.output,
+        sidecar=args.sidecar,
+        encode=args.encode,
+    ).items():
+        print(f'{device} {channel or "-"}: {len(files)} files')
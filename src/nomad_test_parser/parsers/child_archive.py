@@ -0,0 +1,101 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Writing of the `<file>.archive.json` child archives of the parsers.
+
+Unlike `baseclasses.helper.utilities.create_archive`, the section is
+serialized exactly once and the child is only written (and its processing
+triggered) if its content changed. On reprocessing an upload, where the raw
+files are the same, this saves one write and one child entry processing per
+file.
+"""
+
+import hashlib
+import json
+
+from nomad_test_parser.parsers.timing import timed
+
+# quantities that are set anew on every parse and do not make a content change
+VOLATILE_KEYS = ('datetime',)
+
+
+def encode_content(entry):
+    """
+    Returns the JSON of the `data` of a child archive without the
+    `VOLATILE_KEYS`, with sorted keys.
+    """
+    content = {key: value for key, value in entry.items() if key not in VOLATILE_KEYS}
+    return json.dumps(content, sort_keys=True, separators=(',', ':'))
+
+
+def get_content_hash(encoded):
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def join_objects(*encoded):
+    """
+    Joins JSON objects with distinct keys into one, without decoding them.
+    """
+    members = [value[1:-1] for value in encoded if value != '{}']
+    return '{' + ','.join(members) + '}'
+
+
+def read_content_hash(archive, file_name):
+    """
+    Returns the content hash of the existing child archive `file_name`, or
+    None if there is none or it cannot be read.
+    """
+    if not archive.m_context.raw_path_exists(file_name):
+        return None
+    try:
+        with archive.m_context.raw_file(file_name, 'r') as f:
+            return get_content_hash(encode_content(json.load(f)['data']))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def write_child_archive(entity, archive, file_name):
+    """
+    Writes `entity` as the child archive `file_name` of `archive`, unless a
+    child with the same content exists already.
+
+    Returns:
+        True if the child archive was written, False if it was unchanged or
+        the archive is processed on the client side.
+    """
+    from nomad.datamodel.context import ClientContext
+
+    if isinstance(archive.m_context, ClientContext):
+        return False
+
+    with timed('serialize'):
+        entry = entity.m_to_dict(with_root_def=True)
+        # the content is encoded once, for its hash and the file
+        content = encode_content(entry)
+        if read_content_hash(archive, file_name) == get_content_hash(content):
+            return False
+
+        volatile = json.dumps(
+            {key: entry[key] for key in VOLATILE_KEYS if key in entry},
+            separators=(',', ':'),
+        )
+        with archive.m_context.raw_file(file_name, 'w') as f:
+            f.write(f'{{"data":{join_objects(volatile, content)}}}')
+    archive.m_context.process_updated_raw_file(file_name, allow_modify=True)
+    return True
@@ -0,0 +1,276 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Analytics of many EQE (IPCE) spectra at once.
+
+Like `jv_analysis`, all functions work on stacks of spectra: 2D arrays of
+shape `(n_spectra, n_points)` with one spectrum per row, shorter spectra
+padded with NaN (see `stack_spectra`). The spectra are interpolated onto a
+shared photon energy grid in one call, and the integrated short-circuit
+current density under the AM1.5G reference spectrum and the band gap are
+computed for all of them without a Python loop over the spectra.
+
+Photon energies are in eV, the EQE between 0 and 1 as returned by
+`arrange_eqe_columns`, current densities in mA/cm^2.
+"""
+
+import os
+
+import numpy as np
+
+from nomad_test_parser.parsers.file_reading import c, h_Js, hc_eVnm, q
+from nomad_test_parser.parsers.jv_analysis import stack_curves
+
+# ASTM G173-03 global tilt reference spectrum, wavelength (nm) and spectral
+# irradiance (W m^-2 nm^-1)
+AM15G_FILE = os.path.join(os.path.dirname(__file__), 'data', 'AM15G.csv')
+AM15G = {}
+# points of the shared photon energy grid, as in `interpolate_eqe`
+GRID_POINTS = 1000
+# a shared grid needs at least two energies to interpolate between
+MIN_SHARED_ENERGIES = 2
+
+
+def get_am15g():
+    """
+    Returns the photon energies (eV, increasing) of the AM1.5G reference
+    spectrum and its photon flux density (1/(m^2 s)) per point, weighted
+    with the trapezoid rule over the wavelengths, so the integral of a
+    quantity given at these energies is its dot product with the flux.
+    """
+    if not AM15G:
+        wavelength, irradiance = np.loadtxt(
+            AM15G_FILE, delimiter=',', comments='#', skiprows=2, unpack=True
+        )
+        # photons per m^2, s and nm
+        flux = irradiance * wavelength * 1e-9 / (h_Js * c)
+        # trapezoid weights over the wavelengths
+        weights = np.zeros_like(wavelength)
+        steps = np.diff(wavelength) / 2
+        weights[:-1] += steps
+        weights[1:] += steps
+        AM15G['energy'] = hc_eVnm / wavelength[::-1]
+        AM15G['flux'] = (flux * weights)[::-1]
+    return AM15G['energy'], AM15G['flux']
+
+
+def stack_spectra(spectra):
+    """
+    Stacks `(photon_energy, eqe)` pairs of arbitrary length into two 2D
+    arrays, padded with NaN.
+    """
+    return stack_curves(spectra)
+
+
+def sort_by_energy(photon_energy, eqe):
+    """
+    Sorts every spectrum by increasing photon energy. Points with a missing
+    value are moved to the end.
+    """
+    photon_energy = np.where(np.isnan(eqe), np.nan, photon_energy)
+    order = np.argsort(photon_energy, axis=1, kind='stable')
+    return (
+        np.take_along_axis(photon_energy, order, axis=1),
+        np.take_along_axis(eqe, order, axis=1),
+    )
+
+
+def prepare_spectra(photon_energy, eqe):
+    """
+    Returns the spectra as sorted 2D float arrays and the mask of their
+    measured points.
+    """
+    photon_energy, eqe = sort_by_energy(
+        np.atleast_2d(np.asarray(photon_energy, dtype=np.float64)),
+        np.atleast_2d(np.asarray(eqe, dtype=np.float64)),
+    )
+    return photon_energy, eqe, np.isfinite(photon_energy) & np.isfinite(eqe)
+
+
+def get_shared_energies(photon_energy, valid):
+    """
+    Returns the photon energies of the sorted spectra if all of them were
+    measured at the same, distinct energies (the same scan settings), or None.
+    """
+    energies = photon_energy[0, valid[0]]
+    if len(energies) < MIN_SHARED_ENERGIES or (np.diff(energies) <= 0).any():
+        return None
+    if not (valid == valid[0]).all():
+        return None
+    if not (photon_energy[:, valid[0]] == energies).all():
+        return None
+    return energies
+
+
+def get_interpolation_matrix(energies, points):
+    """
+    Returns the matrix of the linear interpolation from the increasing
+    `energies` to `points`, so that `eqe @ matrix` interpolates a stack of
+    spectra measured at `energies`, and the mask of the `points` within their
+    range. The columns of the points outside are zero.
+    """
+    inside = (points >= energies[0]) & (points <= energies[-1])
+    columns = np.nonzero(inside)[0]
+    index = np.searchsorted(energies, points[inside], side='right') - 1
+    index = np.clip(index, 0, len(energies) - 2)
+    weight = (points[inside] - energies[index]) / (
+        energies[index + 1] - energies[index]
+    )
+    matrix = np.zeros((len(energies), len(points)))
+    matrix[index, columns] = 1 - weight
+    matrix[index + 1, columns] = weight
+    return matrix, inside
+
+
+def interpolate_spectra(photon_energy, eqe, grid, fill_value=np.nan):
+    """
+    Linearly interpolates every spectrum at the photon energies `grid`. Grid
+    points outside the range of a spectrum are `fill_value`.
+
+    Spectra measured at the same energies are interpolated with one matrix
+    product. Otherwise the spectra, sorted, are laid out one after the other
+    on a single increasing axis by shifting each by a multiple of the total
+    energy span, and interpolated in one `np.interp` call.
+
+    Returns:
+        array of shape `(n_spectra, len(grid))`
+    """
+    photon_energy, eqe, valid = prepare_spectra(photon_energy, eqe)
+    grid = np.asarray(grid, dtype=np.float64)
+    n_spectra = len(photon_energy)
+    result = np.full((n_spectra, len(grid)), fill_value, dtype=np.float64)
+    if not valid.any() or len(grid) == 0:
+        return result
+
+    energies = get_shared_energies(photon_energy, valid)
+    if energies is not None:
+        matrix, inside = get_interpolation_matrix(energies, grid)
+        result[:, inside] = eqe[:, valid[0]] @ matrix[:, inside]
+        return result
+
+    rows = np.nonzero(valid)[0]
+    x, y = photon_energy[valid], eqe[valid]
+    low = min(x.min(), grid.min())
+    span = max(x.max(), grid.max()) - low + 1
+    shifts = np.arange(n_spectra) * span
+    values = np.interp(
+        ((grid - low)[None, :] + shifts[:, None]).ravel(),
+        x - low + shifts[rows],
+        y,
+    ).reshape(n_spectra, len(grid))
+
+    first = np.min(np.where(valid, photon_energy, np.inf), axis=1)
+    last = np.max(np.where(valid, photon_energy, -np.inf), axis=1)
+    inside = (grid[None, :] >= first[:, None]) & (grid[None, :] <= last[:, None])
+    result[inside] = values[inside]
+    return result
+
+
+def get_common_grid(photon_energy, n_points=GRID_POINTS):
+    """
+    Returns `n_points` equally spaced photon energies covering all spectra.
+    """
+    return np.linspace(np.nanmin(photon_energy), np.nanmax(photon_energy), n_points)
+
+
+def get_integrated_jsc(photon_energy, eqe):
+    """
+    Short-circuit current density (mA/cm^2) of every spectrum integrated
+    under the AM1.5G reference spectrum. The EQE is taken as zero outside the
+    measured range.
+
+    For spectra measured at the same energies, the interpolation and the
+    integration reduce to one weight per energy, computed once.
+    """
+    energy, flux = get_am15g()
+    photon_energy, eqe, valid = prepare_spectra(photon_energy, eqe)
+    energies = get_shared_energies(photon_energy, valid) if valid.any() else None
+    if energies is not None:
+        matrix, _ = get_interpolation_matrix(energies, energy)
+        photon_flux = eqe[:, valid[0]] @ (matrix @ flux)
+    else:
+        eqe_at_reference = interpolate_spectra(
+            photon_energy, eqe, energy, fill_value=0
+        )
+        photon_flux = eqe_at_reference @ flux
+    # A/m^2 to mA/cm^2
+    return q * photon_flux * 0.1
+
+
+def get_bandgap(photon_energy, eqe):
+    """
+    Band gap (eV) of every spectrum from the inflection point of its
+    absorption edge: the middle of the steepest rise of the EQE between two
+    measured points. NaN for spectra without a rise.
+    """
+    photon_energy, eqe = sort_by_energy(photon_energy, eqe)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = np.diff(eqe, axis=1) / np.diff(photon_energy, axis=1)
+    if slope.shape[1] == 0:
+        return np.full(len(slope), np.nan)
+    slope = np.where(np.isfinite(slope), slope, -np.inf)
+    rows = np.arange(len(slope))
+    steepest = np.argmax(slope, axis=1)
+    middle = (photon_energy[rows, steepest] + photon_energy[rows, steepest + 1]) / 2
+    return np.where(slope[rows, steepest] > 0, middle, np.nan)
+
+
+def get_eqe_parameters(photon_energy, eqe, n_points=GRID_POINTS):
+    """
+    Interpolates a stack of spectra onto a shared grid and computes their
+    integrated J_sc and band gap.
+
+    Arguments:
+        photon_energy, eqe: arrays of shape `(n_spectra, n_points)` or
+            `(n_points,)` for a single spectrum
+
+    Returns:
+        dict with the shared `photon_energy` grid, the interpolated `eqe` of
+        shape `(n_spectra, n_points)`, and `integrated_jsc` (mA/cm^2) and
+        `bandgap` (eV) with one value per spectrum (floats for a single
+        spectrum)
+    """
+    single = np.ndim(photon_energy) == 1
+    photon_energy = np.atleast_2d(np.asarray(photon_energy, dtype=np.float64))
+    eqe = np.atleast_2d(np.asarray(eqe, dtype=np.float64))
+
+    grid = get_common_grid(photon_energy, n_points)
+    eqe_on_grid = interpolate_spectra(photon_energy, eqe, grid)
+    parameters = {
+        'photon_energy': grid,
+        'eqe': eqe_on_grid,
+        'integrated_jsc': get_integrated_jsc(photon_energy, eqe),
+        'bandgap': get_bandgap(photon_energy, eqe),
+    }
+    if single:
+        parameters['eqe'] = eqe_on_grid[0]
+        parameters['integrated_jsc'] = float(parameters['integrated_jsc'][0])
+        parameters['bandgap'] = float(parameters['bandgap'][0])
+    return parameters
+
+
+def get_eqe_dicts_parameters(eqe_dicts, n_points=GRID_POINTS):
+    """
+    Computes `get_eqe_parameters` for the raw spectra of the `eqe_dict`s
+    returned by `read_file_eqe`, e.g. of all IPCE files of a batch of cells.
+    """
+    photon_energy, eqe = stack_spectra(
+        (eqe_dict['photon_energy_raw'], eqe_dict['eqe_raw']) for eqe_dict in eqe_dicts
+    )
+    return get_eqe_parameters(photon_energy, eqe, n_points)
@@ -19,12 +19,51 @@
 import pandas as pd
 import numpy as np
 import ast
+import codecs
+import re
 from io import StringIO
 import io;
 
+from nomad_test_parser.parsers.raw_file import buffer_stream, sniff_encoding
+from nomad_test_parser.parsers.timing import timed
+
 
 UPDLOADED_FLAG = 'UNITOV';
 
+DATA_MARKER = '## Data ##'
+CURVE_MARKER = b'\nV (V)'
+
+# Tracking data columns and the number of rows read per chunk
+MPPT_COLUMNS = ['Time (hours)', 'V (V)', 'J (mAcm-2)', 'P (mWcm-2)']
+MPPT_CHUNK_SIZE = 100000
+# column of the `_Parameters.txt` files (without the ` FW`/` RV` suffix) for
+# each quantity of a scan direction
+PARAMETERS_TIME_COLUMN = 'Time (Hours)'
+PARAMETERS_COLUMNS = {
+    'open_circuit_voltage': 'Voc (V)',
+    'short_circuit_current_density': 'Jsc (mA/cm2)',
+    'potential_at_maximum_power_point': 'V_MPP (V)',
+    'current_density_at_maximum_power_point': 'J_MPP (mA/cm2)',
+    'power_at_maximum_power_point': 'P_MPP (mW/cm2)',
+    'series_resistance': 'Rs (Ohm)',
+    'shunt_resistance': 'R// (Ohm)',
+    'fill_factor': 'Fill Factor (%)',
+    'efficiency': 'Efficiency (%)',
+}
+PARAMETERS_DIRECTIONS = ['FW', 'RV']
+
+# Lines inspected to detect the layout of EQE files and the detected layouts
+# (separator, column names line) per header signature
+EQE_DETECT_LINES = 30
+EQE_LAYOUT_CACHE_SIZE = 64
+EQE_LAYOUT_CACHE = {}
+EQE_KEY_RE = re.compile('[^\t,]*[\t,]?')
+# wavelength or energy and EQE
+EQE_MIN_COLUMNS = 2
+# photon energies (eV) and EQE fractions stay below this, wavelengths (nm)
+# and EQE in % exceed it
+EQE_UNIT_THRESHOLD = 10
+
 # Constants
 temperature = 300  # in [°K]
 q = 1.602176462e-19  # % [As], elementary charge
@@ -43,46 +82,185 @@ def get_value(val):
         return None
 
 
+def read_mppt_header(file):
+    """
+    Reads the `## Header ##` block of a tracking file line by line up to and
+    including the `## Data ##` marker and the column header line, leaving
+    `file` positioned at the first data row.
+
+    Returns:
+        header: dict mapping the header keys to their (string) values
+        columns: list of the data column names
+    """
+    header = {}
+    for raw_line in file:
+        line = raw_line.rstrip('\r\n')
+        if line.startswith(DATA_MARKER):
+            break
+        cells = line.split('\t')
+        if cells[0] and not cells[0].startswith('#') and len(cells) > 1:
+            header.setdefault(cells[0], cells[1])
+    columns = file.readline().rstrip('\r\n').split('\t')
+    return header, columns
+
+
+def read_mppt_rows(file, columns, chunk_size=MPPT_CHUNK_SIZE):
+    """
+    Pulls the `Time/V/J/P` columns of the tracking rows from `file` in chunks
+    of `chunk_size` rows and appends them to float64 buffers that grow in
+    place. Rows with a missing value are dropped.
+
+    Returns:
+        list of the time, voltage, current density and power arrays
+    """
+    usecols = [columns.index(name) if name in columns else index
+               for index, name in enumerate(MPPT_COLUMNS)]
+
+    buffers = [np.empty(chunk_size, dtype=np.float64) for _ in MPPT_COLUMNS]
+    n_rows = 0
+    try:
+        reader = pd.read_csv(
+            file,
+            sep='\t',
+            header=None,
+            usecols=usecols,
+            dtype=np.float64,
+            engine='c',
+            chunksize=chunk_size,
+        )
+    except pd.errors.EmptyDataError:
+        reader = []
+    for chunk in reader:
+        values = chunk[usecols].to_numpy()
+        values = values[~np.isnan(values).any(axis=1)]
+        if n_rows + len(values) > len(buffers[0]):
+            capacity = max(2 * len(buffers[0]), n_rows + len(values))
+            for buffer in buffers:
+                buffer.resize(capacity, refcheck=False)
+        for index, buffer in enumerate(buffers):
+            buffer[n_rows:n_rows + len(values)] = values[:, index]
+        n_rows += len(values)
+
+    for buffer in buffers:
+        buffer.resize(n_rows, refcheck=False)
+
+    return buffers
+
+
+def get_mppt_dict(header, arrays):
+    """
+    Builds the `mppt_dict` consumed by `get_mpp_hysprint_samples` from the
+    header of a tracking file and its time, voltage, current density and
+    power arrays.
+    """
+    if 'Test duration (hours)' in header:
+        total_time = get_value(header['Test duration (hours)'])
+    else:
+        total_time = get_value(header.get('Test duration (min)'))
+        total_time = total_time / 60 if total_time is not None else None
+    step_size = get_value(header.get('JV interval (min)'))
+
+    mppt_dict = {}
+    mppt_dict['total_time'] = total_time * 60 * 60 if total_time is not None else None
+    mppt_dict['step_size'] = step_size * 60 if step_size is not None else None
+    mppt_dict['time_per_track'] = get_value(header.get('track delay (s)'))
+    mppt_dict['active_area'] = get_value(header.get('Cell Area (cm2)'))
+
+    mppt_dict['time_data'] = arrays[0]
+    mppt_dict['voltage_data'] = arrays[1]
+    mppt_dict['current_density_data'] = arrays[2]
+    mppt_dict['power_data'] = arrays[3]
+
+    return mppt_dict
+
+
+def read_mppt_file_chunked(file, chunk_size=MPPT_CHUNK_SIZE):
+    """
+    Streaming reader for UNITOV `*_Tracking.txt` files.
+
+    The header is read once, then the rows are read with `read_mppt_rows`.
+    Besides the output arrays only one chunk is held in memory, so the peak
+    memory does not depend on the length of the tracking run.
+
+    Returns the same `mppt_dict` as `read_mppt_file`.
+    """
+    with timed('header'):
+        header, columns = read_mppt_header(file)
+    with timed('data'):
+        arrays = read_mppt_rows(file, columns, chunk_size=chunk_size)
+    return get_mppt_dict(header, arrays), UPDLOADED_FLAG
+
+
 def read_mppt_file(filedata):
     filedata = filedata.replace("²", "^2")
+    return read_mppt_file_chunked(StringIO(filedata))
 
-    df = pd.read_csv(
-        StringIO(filedata),
-        skiprows=0,
-        nrows=41,
-        header=None,
-        sep='\t',
-        index_col=0,
-        engine='python',
-        encoding='unicode_escape').T
 
-    df_curve = pd.read_csv(
-        StringIO(filedata),
-        skiprows=42,
-        sep='\t',
-        encoding='unicode_escape',
-        engine='python')
-    df_curve = df_curve.dropna(how='any', axis=0)
+def read_mppt_buffer(buffer, chunk_size=MPPT_CHUNK_SIZE):
+    """
+    Same as `read_mppt_file_chunked`, but for the raw bytes of a tracking file
+    as given by `open_raw_file` (a `mmap` or `bytes`). The (ASCII) rows are
+    decoded while streaming.
+    """
+    stream = codecs.getreader('ascii')(buffer_stream(buffer), errors='replace')
+    return read_mppt_file_chunked(stream, chunk_size=chunk_size)
 
-    print(df.T,df_curve)
 
-    mppt_dict = {}
-    mppt_dict['total_time'] = get_value(df['Test duration (hours)'].iloc[0]*60*60)
-    mppt_dict['step_size'] = get_value(df['JV interval (min)'].iloc[0]*60)
-    mppt_dict['time_per_track'] = get_value(df['track delay (s)'].iloc[0])
-    mppt_dict['active_area'] = get_value(df['Cell Area (cm2)'].iloc[0])
-    #mppt_dict['voltage'] = get_value(df.iloc[4, 0])
+def read_parameters_file(file):
+    """
+    Reader for UNITOV `*_Parameters.txt` files, the figures of merit of every
+    JV scan of a stability run.
 
-    mppt_dict['time_data'] = np.array(df_curve["Time (hours)"], dtype=np.float64)
-    mppt_dict['voltage_data'] = np.array(df_curve["V (V)"], dtype=np.float64)
-    mppt_dict['current_density_data'] = np.array(df_curve["J (mAcm-2)"], dtype=np.float64)
-    mppt_dict['power_data'] = np.array(df_curve["P (mWcm-2)"], dtype=np.float64)
+    All columns are parsed in one pass into a single float64 block, stored
+    column by column, so the time and each figure of merit is a contiguous
+    view of it. Rows with a missing value are dropped.
 
-    return mppt_dict,UPDLOADED_FLAG
+    Returns:
+        parameters_dict: `active_area`, `time` and, in `scans`, for each scan
+            direction (`FW`, `RV`) the arrays of the `PARAMETERS_COLUMNS`
+            quantities. The fill factor is given as a fraction.
+    """
+    with timed('header'):
+        header, columns = read_mppt_header(file)
+    with timed('data'):
+        values = pd.read_csv(
+            file,
+            sep='\t',
+            header=None,
+            usecols=range(len(columns)),
+            dtype=np.float64,
+            engine='c',
+        ).to_numpy()
+        values = values[~np.isnan(values).any(axis=1)]
+        values = np.ascontiguousarray(values.T)
+
+    parameters_dict = {}
+    parameters_dict['active_area'] = get_value(header.get('Cell Area (cm2)'))
+    parameters_dict['time'] = values[columns.index(PARAMETERS_TIME_COLUMN)]
+    parameters_dict['scans'] = {}
+    for direction in PARAMETERS_DIRECTIONS:
+        scan = {}
+        for quantity, column in PARAMETERS_COLUMNS.items():
+            scan[quantity] = values[columns.index(f'{column} {direction}')]
+        scan['fill_factor'] = scan['fill_factor'] / 100
+        parameters_dict['scans'][direction] = scan
+
+    return parameters_dict, UPDLOADED_FLAG
+
+
+def read_parameters_buffer(buffer):
+    """
+    Same as `read_parameters_file`, but for the raw bytes of a parameters file
+    as given by `open_raw_file` (a `mmap` or `bytes`).
+    """
+    stream = codecs.getreader('ascii')(buffer_stream(buffer), errors='replace')
+    return read_parameters_file(stream)
 
 
 def interpolate_eqe(photon_energy_raw, eqe_raw):
-    photon_energy_interpolated = np.linspace(min(photon_energy_raw), max(photon_energy_raw), 1000, endpoint=True)
+    photon_energy_interpolated = np.linspace(
+        np.min(photon_energy_raw), np.max(photon_energy_raw), 1000, endpoint=True
+    )
     eqe_interpolated = np.interp(photon_energy_interpolated, photon_energy_raw, eqe_raw)
 
     return photon_energy_interpolated, eqe_interpolated
@@ -104,12 +282,14 @@ def arrange_eqe_columns(df):
     y = np.array(df['IPCE (%)'])
 
 
-    if any(x > 10):  # check if energy (eV) or wavelength (nm)
+    if (x > EQE_UNIT_THRESHOLD).any():  # check if energy (eV) or wavelength (nm)
         x = hc_eVnm / x
-    if any(y > 10):  # check if EQE is given in (%), if so it's translated to abs. numbers
+    # check if EQE is given in (%), if so it's translated to abs. numbers
+    if (y > EQE_UNIT_THRESHOLD).any():
         y = y / 100
 
-    # bring both arrays into correct order (i.e. w.r.t eV increasing) if one started with e.g. wavelength in increasing order e.g. 300nm, 305nm,...
+    # bring both arrays into correct order (i.e. w.r.t eV increasing) if one
+    # started with e.g. wavelength in increasing order e.g. 300nm, 305nm,...
     if x[1] - x[2] > 0:
         x = np.flip(x)
         y = np.flip(y)
@@ -119,53 +299,103 @@ def arrange_eqe_columns(df):
     return photon_energy_raw, eqe_raw
 
 
+def is_data_row(line, sep):
+    cells = line.split(sep)
+    return len(cells) >= EQE_MIN_COLUMNS and get_value(cells[0]) is not None
+
+
+def detect_eqe_layout(lines, header_lines=0):
+    """
+    Decides the separator and the line holding the column names of an EQE
+    file from its first lines, in the order the files have been tried so far:
+    the last header line (`header_lines - 1`) with tab and comma separator,
+    then the line after it. If none of them is followed by a numeric row, the
+    first lines are scanned for a column header line.
+
+    Returns:
+        sep: the column separator
+        row: index of the column names line, or None if the file has no header
+    """
+    if header_lines == 0:
+        sep = '\t' if lines and len(lines[0].split('\t')) >= EQE_MIN_COLUMNS else ','
+        return sep, None
+
+    candidates = [(row, sep) for row in (header_lines - 1, header_lines)
+                  for sep in ('\t', ',')]
+    candidates += [(row, sep) for row in range(len(lines) - 1) for sep in ('\t', ',')]
+    for row, sep in candidates:
+        if row + 1 >= len(lines) or len(lines[row].split(sep)) < EQE_MIN_COLUMNS:
+            continue
+        if not is_data_row(lines[row], sep) and is_data_row(lines[row + 1], sep):
+            return sep, row
+
+    raise IndexError('No column header line found in the EQE file')
+
+
+def get_eqe_signature(lines, header_lines):
+    # the header keys with their separator (not the values) identify the
+    # instrument and its export settings
+    return header_lines, tuple(EQE_KEY_RE.match(line).group()
+                               for line in lines[:max(header_lines, 1)])
+
+
 def read_file_eqe(filedata, header_lines=None):
     """
-    Reads the file and returns the columns in a pandas DataFrame `df`.
-    :return: df
-    :rtype: pandas.DataFrame
+    Reads an EQE (IPCE) file and returns the raw and interpolated photon
+    energy and EQE arrays.
+
+    The file is read once. The separator and the column names line are
+    detected from the first `EQE_DETECT_LINES` lines and cached per header
+    signature, so later files from the same setup skip the detection. The
+    data is then parsed with a single `pandas.read_csv` call.
     """
 
     if header_lines is None:
         header_lines = 0
-    if header_lines == 0:  # in case you have a header
-        try:
-            df = pd.read_csv(StringIO(filedata.read()), header=None, sep='\t',)
-            if len(df.columns) < 2:
-                raise IndexError
-        except IndexError:
-            df = pd.read_csv(StringIO(filedata.read()), header=None)
-    else:
-        try:
-            # header_lines - 1 assumes last header line is column names
-            df = pd.read_csv(StringIO(filedata.read()), header=int(header_lines - 1), sep='\t')
-            if len(df.columns) < 2:
-                raise IndexError
-        except IndexError:
-            try:  # wrong separator?
-                df = pd.read_csv(StringIO(filedata.read()), header=int(header_lines - 1))
-                if len(df.columns) < 2:
-                    raise IndexError
-            except IndexError:
-                try:  # separator was right, but last header_line is not actually column names?
-                    df = pd.read_csv(StringIO(filedata.read()), header=int(header_lines), sep='\t')
-                    if len(df.columns) < 2:
-                        raise IndexError
-                except IndexError:
-                    # Last guess: separator was wrong AND last header_line is not actually column names?
-                    df = pd.read_csv(StringIO(filedata.read()), header=int(header_lines))
-                    if len(df.columns) < 2:
-                        raise IndexError
-    #print(df)
-
-    df = df.apply(pd.to_numeric, errors='coerce')
-    df = df.dropna()
-    #print(df)
-    photon_energy_raw, eqe_raw = arrange_eqe_columns(df)
-    photon_energy, intensity = interpolate_eqe(photon_energy_raw, eqe_raw)
+
+    content = filedata.read()
+    with timed('header'):
+        n_lines = max(EQE_DETECT_LINES, header_lines + 2)
+        lines = [line.rstrip('\r') for line in content.split('\n', n_lines)[:n_lines]]
+
+        signature = get_eqe_signature(lines, header_lines)
+        layout = EQE_LAYOUT_CACHE.get(signature)
+        if layout is None:
+            layout = detect_eqe_layout(lines, header_lines)
+            if len(EQE_LAYOUT_CACHE) >= EQE_LAYOUT_CACHE_SIZE:
+                EQE_LAYOUT_CACHE.pop(next(iter(EQE_LAYOUT_CACHE)))
+            EQE_LAYOUT_CACHE[signature] = layout
+        sep, row = layout
+
+    with timed('data'):
+        if row is None:
+            df = pd.read_csv(StringIO(content), header=None, sep=sep)
+        else:
+            df = pd.read_csv(StringIO(content), skiprows=row, header=0, sep=sep)
+
+        # the C parser already yields float columns for clean files, only
+        # columns with stray text need the element-wise conversion
+        if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes):
+            df = df.apply(pd.to_numeric, errors='coerce')
+        df = df[~np.isnan(df.to_numpy(dtype=np.float64)).any(axis=1)]
+        photon_energy_raw, eqe_raw = arrange_eqe_columns(df)
+        photon_energy, intensity = interpolate_eqe(photon_energy_raw, eqe_raw)
     return {'photon_energy_raw':photon_energy_raw, 'eqe_raw':eqe_raw, 'photon_energy':photon_energy, 'intensity':intensity},UPDLOADED_FLAG
 
 
+def read_eqe_buffer(buffer, header_lines=None, encoding=None):
+    """
+    Same as `read_file_eqe`, but for the raw bytes of an EQE file as given by
+    `open_raw_file` (a `mmap` or `bytes`), decoded with `encoding` or the
+    encoding sniffed from the file prefix.
+    """
+    if encoding is None:
+        with timed('encoding'):
+            encoding = sniff_encoding(buffer)
+    stream = codecs.getreader(encoding)(buffer_stream(buffer), errors='replace')
+    return read_file_eqe(stream, header_lines=header_lines)
+
+
 def read_file_jv_data_stab(filedata):
     # Block to clean up some bad characters found in the file which gives
     # trouble reading.
@@ -207,8 +437,6 @@ def read_file_jv_data_stab(filedata):
 
     number_of_curves = len(df_curves.columns)-1
 
-    print(df_header)
-
     jv_dict = {}
     jv_dict['active_area'] = df_header.iloc[1, 17]
     jv_dict['intensity'] = df_header.iloc[1, 1]
@@ -239,90 +467,160 @@ def read_file_jv_data_stab(filedata):
     return jv_dict,UPDLOADED_FLAG
 
 
-def read_file_jv_data(filedata):
-    # Block to clean up some bad characters found in the file which gives
-    # trouble reading.
-
-    #filedata = filedata.replace("²", "^2")
-    with filedata as file:
-        content = file.read();
-        df = pd.read_csv(
-            StringIO(content),
-            skiprows=42,
-            nrows=3,
-            sep='\t',
-            index_col=0,
-            engine='python',
-            encoding='unicode_escape')
-
-        df_header = pd.read_csv(StringIO(content),
-                                skiprows=2,
-                                nrows=39,
-                                header=None,
-                                sep='\t',
-                                index_col=0,
-                                encoding='unicode_escape',
-                                engine='python').T
-
-
-        nlines = content.count('\n')
+def split_unitov_sections(content):
+    """
+    Splits the text of a UNITOV file in a single scan over its lines.
 
-        df_curves = pd.read_csv(StringIO(content),
-                                skiprows=47,
-                                nrows=nlines-47-2,
-                                sep='\t',
-                                encoding='unicode_escape',
-                                engine='python')
+    The instrument files start with a `## Header ##` block of tab separated
+    `key<TAB>value` lines, followed by a `## Data ##` block. For JV files the
+    data block holds the FW/RV figures-of-merit table, a blank line and the
+    curve table starting with the `V (V)` column header.
 
+    Returns:
+        header: dict mapping the header keys to their (string) values
+        table: list of the split lines of the figures-of-merit table
+        curve_offset: character offset of the curve table header in `content`,
+            or None if the file has no curve table
+    """
+    header = {}
+    table = []
+    curve_offset = None
+    in_data = False
+    offset = 0
+    for line in content.splitlines(keepends=True):
+        stripped = line.rstrip('\r\n')
+        if not in_data:
+            if stripped.startswith(DATA_MARKER):
+                in_data = True
+            elif stripped and not stripped.startswith('#'):
+                cells = stripped.split('\t')
+                if cells[0] and len(cells) > 1:
+                    header.setdefault(cells[0], cells[1])
+        elif stripped.startswith('V (V)'):
+            curve_offset = offset
+            break
+        elif stripped.strip():
+            table.append(stripped.split('\t'))
+        offset += len(line)
+
+    return header, table, curve_offset
+
+
+def read_curve_block(stream):
+    """
+    Parses the numeric curve table at the current position of `stream` (text
+    or binary) with the C engine of `pandas.read_csv` straight into a float64
+    array. Only the columns named in the table header are read, empty cells of
+    ragged scans become NaN and rows and columns without any value are dropped.
+    """
+    line = stream.readline()
+    columns = line.split(b'\t' if isinstance(line, bytes) else '\t')
+    values = pd.read_csv(
+        stream,
+        sep='\t',
+        header=None,
+        usecols=range(len(columns)),
+        dtype=np.float64,
+        engine='c',
+    ).to_numpy()
+    values = values[:, ~np.isnan(values).all(axis=0)]
+    values = values[~np.isnan(values).all(axis=1)]
+    return values
 
-    df_curves = df_curves.dropna(how='all', axis=1)
 
-    df_header.replace([np.inf, -np.inf, np.nan], 0, inplace=True)
-    df.replace([np.inf, -np.inf, np.nan], 0, inplace=True)
+def get_jv_dict(header, table, curves=None):
+    """
+    Builds the `jv_dict` consumed by `get_jv_archive` from the tokenized
+    header, the figures-of-merit table and the curve array of a JV file.
+    """
+    # first row holds the column names, rows without a scan label (units) are
+    # skipped
+    columns = table[0][1:] if table else []
+    rows = [row[1:] for row in table[1:] if row[0]]
+    fom = {}
+    for index, name in enumerate(columns):
+        column = np.array([get_value(row[index]) if index < len(row) else None
+                           for row in rows], dtype=np.float64)
+        fom[name] = np.nan_to_num(column, nan=0, posinf=0, neginf=0)
 
-    #number_of_curves = len(df_curves.columns)-1
     number_of_curves = 2
 
-    print(df_header.T)
-
     jv_dict = {}
-    jv_dict['active_area'] = float(df_header['Cell Area (cm2)'].iloc[0])
+    jv_dict['active_area'] = get_value(header.get('Cell Area (cm2)')) or 0.
     jv_dict['intensity'] = 100
+    if header.get('Date') and header.get('Time'):
+        jv_dict['datetime'] = f"{header['Date']} {header['Time']}"
+
+    jv_dict['J_sc'] = list(abs(fom['Jsc']))[:number_of_curves]
+    jv_dict['V_oc'] = list(abs(fom['Voc']))[:number_of_curves]
+    jv_dict['Fill_factor'] = list(fom['FF'])[:number_of_curves]
+    jv_dict['Efficiency'] = list(fom['Eff'])[:number_of_curves]
+    jv_dict['P_MPP'] = list(fom['P_MPP'])[:number_of_curves]
+    jv_dict['J_MPP'] = list(abs(fom['J_MPP']))[:number_of_curves]
+    jv_dict['U_MPP'] = list(fom['V_MPP'])[:number_of_curves]
+    jv_dict['R_ser'] = list(fom['Rs'])[:number_of_curves]
+    jv_dict['R_par'] = list(fom['R//'])[:number_of_curves]
+    # FW or RV, the scan direction of each row of the figures of merit
+    directions = [row[0] for row in table[1:] if row[0]]
+    jv_dict['scan_direction'] = directions[:number_of_curves]
+    jv_dict['jv_curve'] = []
 
+    if curves is None:
+        return jv_dict
 
-    #jv_dict['integration_time'] = df_header.iloc[2, 1]
-    #jv_dict['settling_time'] = df_header.iloc[3, 1]
-    #jv_dict['averaging'] = df_header.iloc[4, 1]
-    #jv_dict['compliance'] = df_header.iloc[5, 1]
-
-    df = df.drop([np.nan]).astype(float)
-
-    #print(df)
-
-    jv_dict['J_sc'] = list(abs(df['Jsc']))[:number_of_curves]
-    jv_dict['V_oc'] = list(abs(df['Voc']))[:number_of_curves]
+    for n in range(0, curves.shape[1] - 1, 2):
+        jv_dict['jv_curve'].append({'name': "Scan " + str(n+1),
+                                    'voltage': curves[:, n],
+                                    'current_density': curves[:, n+1]})
 
-    #print(jv_dict['V_oc'])
+    return jv_dict
 
-    jv_dict['Fill_factor'] = list(df['FF'])[:number_of_curves]
-    jv_dict['Efficiency'] = list(df['Eff'])[:number_of_curves]
-    jv_dict['P_MPP'] = list(df['P_MPP'])[:number_of_curves]
-    jv_dict['J_MPP'] = list(abs(df['J_MPP']))[:number_of_curves]
-    jv_dict['U_MPP'] = list(df['V_MPP'])[:number_of_curves]
-    jv_dict['R_ser'] = list(df['Rs'])[:number_of_curves]
-    jv_dict['R_par'] = list(df['R//'])[:number_of_curves]
-    jv_dict['jv_curve'] = []
 
+def read_file_jv_data(filedata):
+    """
+    Reads a UNITOV `*_JV.txt` file and returns the `jv_dict` consumed by
+    `get_jv_archive`. The file is read once, the header and the FW/RV
+    figures-of-merit table are tokenized in the same scan that locates the
+    curve table, and only the curve table goes through `pandas.read_csv`.
+    """
+    with filedata as file:
+        content = file.read()
 
-    for n in range(0, len(df_curves.columns),2):
+    with timed('header'):
+        header, table, curve_offset = split_unitov_sections(content)
+    curves = None
+    if curve_offset is not None:
+        with timed('data'):
+            curves = read_curve_block(StringIO(content[curve_offset:]))
 
-        jv_dict['jv_curve'].append({'name': "Scan " + str(n+1) ,
-                                    'voltage': df_curves[df_curves.columns[n]].values,
-                                    'current_density': df_curves[df_curves.columns[n+1]].values})
+    return get_jv_dict(header, table, curves), UPDLOADED_FLAG
 
 
+def read_jv_buffer(buffer, encoding=None):
+    """
+    Same as `read_file_jv_data`, but for the raw bytes of a JV file as given
+    by `open_raw_file` (a `mmap` or `bytes`). Only the header and the
+    figures-of-merit table are decoded, with `encoding` or the encoding
+    sniffed from the file prefix; the curve table is parsed from the buffer.
+    """
+    curve_offset = buffer.find(CURVE_MARKER)
+    curve_offset = curve_offset + 1 if curve_offset != -1 else len(buffer)
+    prefix = buffer[:curve_offset]
+    if encoding is None:
+        with timed('encoding'):
+            encoding = sniff_encoding(prefix)
+
+    with timed('header'):
+        header, table, _ = split_unitov_sections(
+            prefix.decode(encoding, errors='replace')
+        )
+    curves = None
+    if curve_offset < len(buffer):
+        with timed('data'):
+            curves = read_curve_block(buffer_stream(buffer, curve_offset))
+
+    return get_jv_dict(header, table, curves), UPDLOADED_FLAG
 
-    return jv_dict,UPDLOADED_FLAG
 
 
 
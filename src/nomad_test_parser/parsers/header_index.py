@@ -0,0 +1,216 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Index of the `## Header ##` metadata of UNITOV files.
+
+`read_header` only reads the header lines of a file, not its data. The
+`HeaderIndex` keeps the device, channel, test type and timestamp of every
+file in an SQLite table (in memory or on disk), so the JV scans of a device
+and channel can be grouped with their Tracking and Parameters siblings by an
+indexed lookup instead of opening and parsing the files again:
+
+    python -m nomad_test_parser.parsers.header_index <directory> --index <file>
+"""
+
+import os
+import re
+import sqlite3
+from itertools import islice
+
+from nomad_test_parser.parsers.matching import UTF8_BOM
+from nomad_test_parser.parsers.raw_file import DEFAULT_ENCODING
+
+HEADER_MARKER = '## Header ##'
+DATA_MARKER = '## Data ##'
+# the data marker is on line 42 of JV, Tracking and Parameters files
+HEADER_LINES = 45
+# 'Stability (JV)' -> 'JV', 'IPCE' -> 'IPCE'
+TEST_RE = re.compile(r'^(?:.*\()?(?P<test>[^()]+?)\)?$')
+
+COLUMNS = ['path', 'device', 'channel', 'test', 'timestamp', 'user', 'size', 'mtime']
+
+
+def read_header(path, max_lines=HEADER_LINES):
+    """
+    Returns the `key<TAB>value` pairs of the header block of the UNITOV file
+    at `path`, reading at most `max_lines` lines, or None if the file does
+    not start with a header block. Files with a UTF-8 byte order mark are
+    decoded as UTF-8.
+    """
+    with open(path, 'rb') as f:
+        lines = list(islice(f, max_lines))
+
+    encoding = DEFAULT_ENCODING
+    if lines and lines[0].startswith(UTF8_BOM):
+        lines[0] = lines[0][len(UTF8_BOM) :]
+        encoding = 'utf-8'
+    if not lines or not lines[0].startswith(HEADER_MARKER.encode()):
+        return None
+
+    header = {}
+    for raw_line in lines[1:]:
+        line = raw_line.decode(encoding, errors='replace').rstrip('\r\n')
+        if line.startswith(DATA_MARKER):
+            break
+        cells = line.split('\t')
+        if cells[0] and not cells[0].startswith(('#', '[')) and len(cells) > 1:
+            header.setdefault(cells[0], cells[1])
+    return header
+
+
+def get_test_type(test):
+    match = TEST_RE.match(test.strip()) if test else None
+    return match.group('test').strip() if match else None
+
+
+class HeaderIndex:
+    """
+    SQLite index of the headers of UNITOV files, by default in memory. With a
+    file `path` the index persists and files whose size and modification time
+    did not change are not read again on the next `scan`.
+    """
+
+    def __init__(self, path=':memory:'):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, device TEXT, '
+            'channel TEXT, test TEXT, timestamp TEXT, user TEXT, size INTEGER, '
+            'mtime REAL)'
+        )
+        self.connection.execute(
+            'CREATE INDEX IF NOT EXISTS files_group '
+            'ON files (device, channel, test, timestamp)'
+        )
+
+    def add(self, path, header, size=None, mtime=None):
+        timestamp = ' '.join(
+            value for value in (header.get('Date'), header.get('Time')) if value
+        )
+        self.connection.execute(
+            f'INSERT OR REPLACE INTO files VALUES ({", ".join("?" * len(COLUMNS))})',
+            (
+                path,
+                header.get('Device') or None,
+                header.get('Channel') or None,
+                get_test_type(header.get('Test')),
+                timestamp or None,
+                header.get('User') or None,
+                size,
+                mtime,
+            ),
+        )
+
+    def scan(self, directory):
+        """
+        Adds the headers of the files in `directory` to the index and removes
+        the files that are gone. Returns the number of files read.
+        """
+        directory = os.path.normpath(directory)
+        known = {
+            path: (size, mtime)
+            for path, size, mtime in self.connection.execute(
+                'SELECT path, size, mtime FROM files'
+            )
+            if os.path.dirname(path) == directory
+        }
+        n_read = 0
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                path = os.path.join(directory, entry.name)
+                stat = entry.stat()
+                if known.pop(path, None) == (stat.st_size, stat.st_mtime):
+                    continue
+                # files without a header are kept too, so they are not read again
+                self.add(path, read_header(path) or {}, stat.st_size, stat.st_mtime)
+                n_read += 1
+        self.connection.executemany(
+            'DELETE FROM files WHERE path = ?', [(path,) for path in known]
+        )
+        self.connection.commit()
+        return n_read
+
+    def find(self, device, channel=None, test=None):
+        """
+        Returns the files of `device`, optionally only of `channel` and
+        `test` type, sorted by their timestamp.
+        """
+        query = 'SELECT path FROM files WHERE device = ?'
+        arguments = [device]
+        for column, value in (('channel', channel), ('test', test)):
+            if value is not None:
+                query += f' AND {column} = ?'
+                arguments.append(value)
+        query += ' ORDER BY timestamp, path'
+        return [path for (path,) in self.connection.execute(query, arguments)]
+
+    def siblings(self, path, test=None):
+        """
+        Returns the files of the same device and channel as `path`, optionally
+        only of `test` type, e.g. the Tracking and Parameters files of a JV
+        scan.
+        """
+        row = self.connection.execute(
+            'SELECT device, channel FROM files WHERE path = ?', (path,)
+        ).fetchone()
+        if row is None:
+            return []
+        device, channel = row
+        query = 'SELECT path FROM files WHERE device IS ? AND channel IS ?'
+        arguments = [device, channel]
+        if test is not None:
+            query += ' AND test = ?'
+            arguments.append(test)
+        query += ' ORDER BY timestamp, path'
+        return [path for (path,) in self.connection.execute(query, arguments)]
+
+    def groups(self):
+        """
+        Returns a dict mapping `(device, channel)` to the `(test, path)` of
+        its files, sorted by timestamp.
+        """
+        groups = {}
+        for device, channel, test, path in self.connection.execute(
+            'SELECT device, channel, test, path FROM files WHERE device IS NOT NULL '
+            'ORDER BY device, channel, timestamp, path'
+        ):
+            groups.setdefault((device, channel), []).append((test, path))
+        return groups
+
+    def close(self):
+        self.connection.close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(
+        description='Index the headers of the UNITOV files of a directory.'
+    )
+    arg_parser.add_argument('directory')
+    arg_parser.add_argument('--index', default=':memory:')
+    args = arg_parser.parse_args()
+
+    index = HeaderIndex(args.index)
+    index.scan(args.directory)
+    for (device, channel), files in index.groups().items():
+        tests = sorted({test for test, _ in files if test})
+        print(f'{device} {channel or "-"}: {len(files)} files ({", ".join(tests)})')
+    index.close()
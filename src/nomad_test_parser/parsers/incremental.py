@@ -0,0 +1,231 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Incremental ingestion of `_Tracking.txt` files that keep growing during a
+running MPPT measurement.
+
+For every data file a state directory remembers the byte offset and the
+number of rows parsed so far, next to one append-only float64 file per
+column. When the file is read again only the rows appended since are parsed
+and appended to the column files, so the text parsing is O(new rows) instead
+of O(file). The columns are still read back in full with `np.fromfile` and
+the normalizer builds the archive from all rows, so a call stays O(file) in
+binary reads and archive building. The state is dropped and the file parsed
+from the start if its header changed, if it got shorter or if the last
+parsed row is not where it was, i.e. if the file was replaced rather than
+appended to.
+
+The state directories are kept below a size cap by removing the least
+recently updated ones. The directory is only scanned when a new state is
+created, and then at most every `SCAN_NEW_STATES` new states.
+"""
+
+import codecs
+import hashlib
+import json
+import os
+import shutil
+from io import StringIO
+
+import numpy as np
+
+from nomad_test_parser.parsers.file_reading import (
+    DATA_MARKER,
+    MPPT_CHUNK_SIZE,
+    UPDLOADED_FLAG,
+    get_mppt_dict,
+    read_mppt_header,
+    read_mppt_rows,
+)
+from nomad_test_parser.parsers.raw_file import buffer_stream
+
+STATE_FILE = 'state.json'
+COLUMN_FILES = ['time.f64', 'voltage.f64', 'current_density.f64', 'power.f64']
+# bytes before the parsed offset compared to detect replaced files
+TAIL_SIZE = 256
+# size cap in bytes of the state directories
+STATE_MAX_SIZE = 10 * 1024**3
+# the states are scanned for eviction after this many new states
+SCAN_NEW_STATES = 256
+# new states since the last scan of every directory
+NEW_STATES = {}
+
+
+def get_state_directory(directory, key):
+    return os.path.join(directory, hashlib.sha256(key.encode()).hexdigest()[:32])
+
+
+def scan_states(directory):
+    """
+    Returns the `(last update, size, path)` of the state directories.
+    """
+    states = []
+    with os.scandir(directory) as scan:
+        for entry in scan:
+            if not entry.is_dir():
+                continue
+            mtime, size = entry.stat().st_mtime, 0
+            with os.scandir(entry.path) as files:
+                for file_entry in files:
+                    stat = file_entry.stat()
+                    mtime = max(mtime, stat.st_mtime)
+                    size += stat.st_size
+            states.append((mtime, size, entry.path))
+    return states
+
+
+def evict_states(directory, max_size, keep=None):
+    """
+    Removes the least recently updated state directories of `directory`,
+    except `keep`, until the states take at most `max_size` bytes.
+
+    Returns:
+        the size of the remaining states
+    """
+    states = scan_states(directory)
+    size = sum(state[1] for state in states)
+    for _, state_size, path in sorted(states):
+        if size <= max_size:
+            break
+        if path == keep:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        size -= state_size
+    return size
+
+
+def add_state(directory, state_directory, max_size):
+    """
+    Counts the new state `state_directory` and evicts states if `directory`
+    was not scanned in this process or `SCAN_NEW_STATES` states ago.
+    """
+    new_states = NEW_STATES.get(directory)
+    if new_states is None or new_states >= SCAN_NEW_STATES:
+        evict_states(directory, max_size, keep=state_directory)
+        NEW_STATES[directory] = 0
+    else:
+        NEW_STATES[directory] = new_states + 1
+
+
+def get_data_offset(buffer):
+    """
+    Returns the offset of the first data row, after the `## Data ##` marker
+    and the column header line, or None if the data block is not complete
+    yet.
+    """
+    marker = buffer.find(DATA_MARKER.encode())
+    if marker == -1:
+        return None
+    marker_end = buffer.find(b'\n', marker)
+    columns_end = buffer.find(b'\n', marker_end + 1) if marker_end != -1 else -1
+    return columns_end + 1 if columns_end != -1 else None
+
+
+def load_state(state_directory):
+    try:
+        with open(os.path.join(state_directory, STATE_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_state(state_directory, state):
+    tmp_path = os.path.join(state_directory, f'{STATE_FILE}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, os.path.join(state_directory, STATE_FILE))
+
+
+def is_continuation(state, buffer, header_hash, end, column_paths):
+    if state is None or state['header_hash'] != header_hash or state['offset'] > end:
+        return False
+    size = state['rows'] * np.dtype(np.float64).itemsize
+    for path in column_paths:
+        if not os.path.exists(path) or os.path.getsize(path) < size:
+            return False
+    tail = bytes(buffer[max(0, state['offset'] - TAIL_SIZE):state['offset']])
+    return hashlib.sha256(tail).hexdigest() == state['tail_hash']
+
+
+def read_mppt_incremental(
+    buffer, directory, key, chunk_size=MPPT_CHUNK_SIZE, max_size=STATE_MAX_SIZE
+):
+    """
+    Same as `read_mppt_buffer`, but only parses the rows appended to the file
+    since the last call with the same `key` (e.g. upload id and data file).
+    The state and the column arrays are kept in a subdirectory of
+    `directory`, whose states are kept below `max_size` bytes. An incomplete
+    last row is left for the next call.
+
+    Returns the same `mppt_dict` as `read_mppt_file`.
+    """
+    state_directory = get_state_directory(directory, key)
+    new_state = not os.path.isdir(state_directory)
+    os.makedirs(state_directory, exist_ok=True)
+    column_paths = [os.path.join(state_directory, name) for name in COLUMN_FILES]
+
+    data_offset = get_data_offset(buffer)
+    if data_offset is None:
+        data_offset = len(buffer)
+    header_bytes = buffer[:data_offset]
+    header_hash = hashlib.sha256(header_bytes).hexdigest()
+    header, columns = read_mppt_header(
+        StringIO(bytes(header_bytes).decode('ascii', errors='replace'))
+    )
+    end = max(buffer.rfind(b'\n') + 1, data_offset)
+
+    state = load_state(state_directory)
+    if is_continuation(state, buffer, header_hash, end, column_paths):
+        offset, n_rows = state['offset'], state['rows']
+    else:
+        offset, n_rows = data_offset, 0
+    # drops rows appended by an interrupted call that did not save its state
+    for path in column_paths:
+        with open(path, 'ab') as f:
+            f.truncate(n_rows * np.dtype(np.float64).itemsize)
+
+    if end > offset:
+        # only the appended rows are copied out of the buffer
+        stream = codecs.getreader('ascii')(
+            buffer_stream(buffer[offset:end]), errors='replace'
+        )
+        arrays = read_mppt_rows(stream, columns, chunk_size=chunk_size)
+        for path, array in zip(column_paths, arrays):
+            with open(path, 'ab') as f:
+                array.tofile(f)
+        n_rows += len(arrays[0])
+
+    save_state(
+        state_directory,
+        dict(
+            offset=end,
+            rows=n_rows,
+            header_hash=header_hash,
+            tail_hash=hashlib.sha256(
+                bytes(buffer[max(0, end - TAIL_SIZE):end])
+            ).hexdigest(),
+        ),
+    )
+    if new_state:
+        add_state(directory, state_directory, max_size)
+
+    arrays = [
+        np.fromfile(path, dtype=np.float64, count=n_rows) for path in column_paths
+    ]
+    return get_mppt_dict(header, arrays), UPDLOADED_FLAG
@@ -0,0 +1,224 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Figures of merit of JV curves, computed from the curves instead of taken from
+the instrument table.
+
+All functions work on stacks of curves: 2D arrays of shape `(n_curves,
+n_points)` with one curve per row, shorter curves padded with NaN (see
+`stack_curves`). A whole file, or all scans of a stability campaign, is
+processed in one call without a Python loop over the curves.
+
+Voltages are in V, current densities in mA/cm^2 and the light intensity in
+mW/cm^2. The keys of the result are the ones of the `jv_dict` of the readers,
+so the computed values can be checked against the instrument table.
+"""
+
+import numpy as np
+
+# number of points around a crossing used for the slopes giving the series
+# and the shunt resistance
+SLOPE_POINTS = 6
+# keys of the figures of merit returned by `get_jv_parameters`
+PARAMETERS = [
+    'J_sc',
+    'V_oc',
+    'Fill_factor',
+    'Efficiency',
+    'P_MPP',
+    'J_MPP',
+    'U_MPP',
+    'R_ser',
+    'R_par',
+]
+
+
+def stack_curves(curves):
+    """
+    Stacks `(voltage, current_density)` pairs of arbitrary length into two 2D
+    arrays, padded with NaN.
+    """
+    curves = [
+        (np.asarray(voltage, dtype=np.float64), np.asarray(current, dtype=np.float64))
+        for voltage, current in curves
+    ]
+    n_points = max((len(voltage) for voltage, _ in curves), default=0)
+    voltage = np.full((len(curves), n_points), np.nan)
+    current_density = np.full((len(curves), n_points), np.nan)
+    for index, (curve_voltage, curve_current) in enumerate(curves):
+        voltage[index, : len(curve_voltage)] = curve_voltage
+        current_density[index, : len(curve_current)] = curve_current
+    return voltage, current_density
+
+
+def sort_by_voltage(voltage, current_density):
+    """
+    Sorts every curve by increasing voltage, so forward and reverse scans can
+    be handled alike. Points with a missing value are moved to the end.
+    """
+    voltage = np.where(np.isnan(current_density), np.nan, voltage)
+    order = np.argsort(voltage, axis=1, kind='stable')
+    return (
+        np.take_along_axis(voltage, order, axis=1),
+        np.take_along_axis(current_density, order, axis=1),
+    )
+
+
+def find_crossing(mask):
+    """
+    Returns the index of the first segment of every curve for which `mask`
+    holds and whether there is one.
+    """
+    return np.argmax(mask, axis=1), mask.any(axis=1)
+
+
+def interpolate_at_crossing(x, y, segment, found):
+    """
+    Linearly interpolates `x` at `y == 0` within the given segment (between
+    the points `segment` and `segment + 1`) of every curve.
+    """
+    rows = np.arange(len(x))
+    x0, x1 = x[rows, segment], x[rows, segment + 1]
+    y0, y1 = y[rows, segment], y[rows, segment + 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value = np.where(y1 != y0, x0 - y0 * (x1 - x0) / (y1 - y0), x0)
+    return np.where(found, value, np.nan)
+
+
+def get_slope_at(x, y, segment, found, n_points=SLOPE_POINTS):
+    """
+    Least-squares slope dy/dx of every curve over the (up to) `n_points`
+    points centered on the given segment.
+    """
+    offsets = np.arange(n_points) - (n_points - 1) // 2
+    index = segment[:, None] + offsets
+    inside = (index >= 0) & (index < x.shape[1])
+    index = np.clip(index, 0, x.shape[1] - 1)
+    x = np.take_along_axis(x, index, axis=1)
+    y = np.take_along_axis(y, index, axis=1)
+    valid = inside & np.isfinite(x) & np.isfinite(y)
+    count = valid.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_mean = np.where(valid, x, 0).sum(axis=1) / count
+        y_mean = np.where(valid, y, 0).sum(axis=1) / count
+        dx = np.where(valid, x - x_mean[:, None], 0)
+        dy = np.where(valid, y - y_mean[:, None], 0)
+        slope = (dx * dy).sum(axis=1) / (dx * dx).sum(axis=1)
+    return np.where(found & (count > 1), slope, np.nan)
+
+
+def get_jv_parameters(voltage, current_density, intensity=100, active_area=None):
+    """
+    Computes the figures of merit of a stack of JV curves.
+
+    J_sc and V_oc are interpolated at the zero crossings of the voltage and
+    of the current density, the maximum power point is the measured point of
+    maximum power in the power generating quadrant. The series and shunt
+    resistances are the inverse slopes of the curve at V_oc and J_sc, in
+    Ohm cm^2, or in Ohm if the `active_area` (cm^2) is given. The sign of the
+    current density is normalized, so curves with the photocurrent counted
+    positive or negative give the same results.
+
+    Arguments:
+        voltage, current_density: arrays of shape `(n_curves, n_points)` or
+            `(n_points,)` for a single curve
+
+    Returns:
+        dict with `J_sc`, `V_oc`, `Fill_factor` (%), `Efficiency` (%),
+        `P_MPP`, `J_MPP`, `U_MPP`, `R_ser` and `R_par`, each an array with one
+        value per curve (a float for a single curve). Values that cannot be
+        determined, e.g. because the curve does not cross zero or has fewer
+        than two points, are NaN.
+    """
+    single = np.ndim(voltage) == 1
+    voltage = np.atleast_2d(np.asarray(voltage, dtype=np.float64))
+    current_density = np.atleast_2d(np.asarray(current_density, dtype=np.float64))
+    if voltage.shape[1] <= 1:
+        # no segment to look for a crossing in
+        parameters = {key: np.full(len(voltage), np.nan) for key in PARAMETERS}
+        return get_result(parameters, single)
+    voltage, current_density = sort_by_voltage(voltage, current_density)
+
+    rows = np.arange(len(voltage))
+    with np.errstate(invalid='ignore'):
+        sc_segment, sc_found = find_crossing(
+            (voltage[:, :-1] <= 0) & (voltage[:, 1:] >= 0)
+        )
+        j_sc = interpolate_at_crossing(current_density, voltage, sc_segment, sc_found)
+        current_density = current_density * np.where(j_sc < 0, -1, 1)[:, None]
+        j_sc = np.abs(j_sc)
+
+        oc_segment, oc_found = find_crossing(
+            (current_density[:, :-1] > 0)
+            & (current_density[:, 1:] <= 0)
+            & (voltage[:, 1:] > 0)
+        )
+        v_oc = interpolate_at_crossing(voltage, current_density, oc_segment, oc_found)
+
+        power = voltage * current_density
+        generating = (voltage >= 0) & (current_density >= 0)
+        mpp = np.argmax(np.where(generating, power, -np.inf), axis=1)
+        mpp_found = generating.any(axis=1)
+        p_mpp = np.where(mpp_found, power[rows, mpp], np.nan)
+        u_mpp = np.where(mpp_found, voltage[rows, mpp], np.nan)
+        j_mpp = np.where(mpp_found, current_density[rows, mpp], np.nan)
+
+    # dV/dJ in V/(mA/cm^2) is 1000 Ohm cm^2
+    area = 1 if active_area is None else active_area
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fill_factor = 100 * p_mpp / (v_oc * j_sc)
+        oc_slope = get_slope_at(voltage, current_density, oc_segment, oc_found)
+        sc_slope = get_slope_at(voltage, current_density, sc_segment, sc_found)
+        r_ser = -1000 / oc_slope / area
+        r_par = -1000 / sc_slope / area
+
+    parameters = {
+        'J_sc': j_sc,
+        'V_oc': v_oc,
+        'Fill_factor': fill_factor,
+        'Efficiency': 100 * p_mpp / intensity,
+        'P_MPP': p_mpp,
+        'J_MPP': j_mpp,
+        'U_MPP': u_mpp,
+        'R_ser': r_ser,
+        'R_par': r_par,
+    }
+    return get_result(parameters, single)
+
+
+def get_result(parameters, single):
+    if single:
+        return {key: float(value[0]) for key, value in parameters.items()}
+    return parameters
+
+
+def get_jv_dict_parameters(jv_dict, intensity=None):
+    """
+    Computes the figures of merit of all curves of a `jv_dict` as returned by
+    the readers, to be compared with the instrument values in it.
+    """
+    voltage, current_density = stack_curves(
+        (curve['voltage'], curve['current_density']) for curve in jv_dict['jv_curve']
+    )
+    return get_jv_parameters(
+        voltage,
+        current_density,
+        intensity=intensity or jv_dict.get('intensity') or 100,
+        active_area=jv_dict.get('active_area') or None,
+    )
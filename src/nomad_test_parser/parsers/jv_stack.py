@@ -0,0 +1,247 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Storage of all JV scans of a stability run in one entry.
+
+A run writes one `_JV.txt` per scan, every scan with its FW and RV curve. By
+default each file becomes an entry of its own with small ragged curve lists.
+`stack_jv_dicts` instead concatenates the curves of all scans into two flat
+`voltage` and `current_density` arrays in CSR layout: curve `i` is
+`voltage[curve_offsets[i]:curve_offsets[i + 1]]`, so curves of different
+length are stored without the NaN padding of the readers. The scan of every
+curve and the date and time of every scan are kept next to them.
+`get_padded_curves` gives the NaN-padded 2D view expected by `jv_analysis`.
+
+A run grows by one JV file per scan. `update_stored_stack` keeps the stack of
+a run on disk and reads only the JV files added since it was stored, instead
+of reading all files of the run again for every new scan. The JV files are
+not changed once written, so the stacked ones are not checked again.
+"""
+
+import os
+from datetime import datetime
+
+import numpy as np
+
+from nomad_test_parser.parsers.incremental import (
+    STATE_MAX_SIZE,
+    add_state,
+    get_state_directory,
+)
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+# the header times are local times without time zone
+EPOCH = datetime(1970, 1, 1)
+# per-curve figures of merit of the `jv_dict` of the JV readers
+CURVE_METRICS = ['J_sc', 'V_oc', 'Fill_factor', 'Efficiency']
+STACK_FILE = 'jv_stack.npz'
+# stacked lists of strings, stored as string arrays
+STRING_KEYS = ['datetime', 'curve_direction', 'data_files']
+
+
+def get_scan_time(datetimes):
+    """
+    Returns the time in hours of every `datetime` string since the earliest
+    one, NaN for missing or malformed ones.
+    """
+    timestamps = []
+    for value in datetimes:
+        try:
+            scan_datetime = datetime.strptime(value, DATETIME_FORMAT)
+            timestamps.append((scan_datetime - EPOCH).total_seconds())
+        except (TypeError, ValueError):
+            timestamps.append(np.nan)
+    timestamps = np.array(timestamps, dtype=np.float64)
+    if not np.isfinite(timestamps).any():
+        return timestamps
+    return (timestamps - np.nanmin(timestamps)) / 3600
+
+
+def stack_jv_dicts(jv_dicts):
+    """
+    Stacks the curves of the `jv_dict`s of the scans of a run, in the given
+    order.
+
+    Returns:
+        dict with the `active_area` of the first scan (None without scans),
+        the `datetime` and the `time` (hours since the first scan) of every
+        scan; `voltage` and `current_density` of all curves concatenated, the
+        `curve_offsets` (n_curves + 1) into them, the `curve_scan` index and
+        the `curve_direction` of every curve, and the `CURVE_METRICS` of every
+        curve
+    """
+    jv_dicts = list(jv_dicts)
+    voltage = []
+    current_density = []
+    lengths = []
+    curve_scan = []
+    curve_direction = []
+    metrics = {key: [] for key in CURVE_METRICS}
+    for scan, jv_dict in enumerate(jv_dicts):
+        directions = jv_dict.get('scan_direction') or []
+        for index, curve in enumerate(jv_dict['jv_curve']):
+            curve_voltage = np.asarray(curve['voltage'], dtype=np.float64)
+            curve_current = np.asarray(curve['current_density'], dtype=np.float64)
+            # drops the NaN padding of the shorter curve of a file
+            measured = ~(np.isnan(curve_voltage) & np.isnan(curve_current))
+            voltage.append(curve_voltage[measured])
+            current_density.append(curve_current[measured])
+            lengths.append(len(voltage[-1]))
+            curve_scan.append(scan)
+            curve_direction.append(directions[index] if index < len(directions) else '')
+            for key in CURVE_METRICS:
+                values = jv_dict.get(key) or []
+                metrics[key].append(values[index] if index < len(values) else np.nan)
+
+    curve_offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=curve_offsets[1:])
+    datetimes = [jv_dict.get('datetime') for jv_dict in jv_dicts]
+    stacked = {
+        'active_area': jv_dicts[0].get('active_area') if jv_dicts else None,
+        'datetime': datetimes,
+        'time': get_scan_time(datetimes),
+        'voltage': np.concatenate(voltage) if voltage else np.empty(0),
+        'current_density': (
+            np.concatenate(current_density) if current_density else np.empty(0)
+        ),
+        'curve_offsets': curve_offsets,
+        'curve_scan': np.array(curve_scan, dtype=np.int64),
+        'curve_direction': curve_direction,
+    }
+    for key, values in metrics.items():
+        stacked[key] = np.array(values, dtype=np.float64)
+    return stacked
+
+
+def extend_stack(stacked, jv_dicts):
+    """
+    Returns the stack of the scans of `stacked` followed by the scans of the
+    `jv_dicts`. Only the new scans are stacked, the times of all scans are
+    computed again as the new scans may start earlier.
+    """
+    new = stack_jv_dicts(jv_dicts)
+    if not stacked['datetime']:
+        return new
+    n_scans = len(stacked['datetime'])
+    datetimes = list(stacked['datetime']) + new['datetime']
+    extended = {
+        'active_area': stacked['active_area'],
+        'datetime': datetimes,
+        'time': get_scan_time(datetimes),
+        'voltage': np.concatenate([stacked['voltage'], new['voltage']]),
+        'current_density': np.concatenate(
+            [stacked['current_density'], new['current_density']]
+        ),
+        'curve_offsets': np.concatenate(
+            [
+                stacked['curve_offsets'],
+                new['curve_offsets'][1:] + stacked['curve_offsets'][-1],
+            ]
+        ),
+        'curve_scan': np.concatenate(
+            [stacked['curve_scan'], new['curve_scan'] + n_scans]
+        ),
+        'curve_direction': list(stacked['curve_direction']) + new['curve_direction'],
+    }
+    for key in CURVE_METRICS:
+        extended[key] = np.concatenate([stacked[key], new[key]])
+    return extended
+
+
+def load_stack(path):
+    try:
+        with np.load(path) as data:
+            stacked = {name: data[name] for name in data.files}
+        for key in STRING_KEYS:
+            stacked[key] = stacked[key].tolist()
+        active_area = float(stacked['active_area'])
+    except (OSError, ValueError, KeyError):
+        return None
+    stacked['active_area'] = None if np.isnan(active_area) else active_area
+    return stacked
+
+
+def save_stack(path, stacked):
+    arrays = dict(stacked)
+    for key in STRING_KEYS:
+        arrays[key] = np.array([value or '' for value in stacked[key]], dtype=str)
+    active_area = stacked['active_area']
+    arrays['active_area'] = np.nan if active_area is None else active_area
+    tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+
+
+def update_stored_stack(
+    directory, key, data_files, read_jv_dict, max_size=STATE_MAX_SIZE
+):
+    """
+    Returns the stack of the JV files `data_files` of a run, as
+    `stack_jv_dicts`, with the `data_files` stacked. The stack of the last
+    call with the same `key` (e.g. upload id and data file) is kept in a
+    subdirectory of `directory`, whose stacks are kept below `max_size`
+    bytes. Only the files not in it are read with `read_jv_dict(path)`,
+    unless its files are not the first ones of `data_files`.
+    """
+    state_directory = get_state_directory(directory, key)
+    new_state = not os.path.isdir(state_directory)
+    os.makedirs(state_directory, exist_ok=True)
+    path = os.path.join(state_directory, STACK_FILE)
+    stacked = load_stack(path)
+    n_files = len(stacked['data_files']) if stacked is not None else 0
+    if stacked is not None and stacked['data_files'] != data_files[:n_files]:
+        # the files of the run were replaced, it is stacked from the start
+        stacked, n_files = None, 0
+    if stacked is None or n_files < len(data_files):
+        jv_dicts = [read_jv_dict(data_file) for data_file in data_files[n_files:]]
+        if stacked is None:
+            stacked = stack_jv_dicts(jv_dicts)
+        else:
+            stacked = extend_stack(stacked, jv_dicts)
+        stacked['data_files'] = list(data_files)
+        save_stack(path, stacked)
+    if new_state:
+        add_state(directory, state_directory, max_size)
+    return stacked
+
+
+def get_curve(curve_offsets, voltage, current_density, index):
+    """
+    Returns the `(voltage, current_density)` views of curve `index`.
+    """
+    start, end = curve_offsets[index], curve_offsets[index + 1]
+    return voltage[start:end], current_density[start:end]
+
+
+def get_padded_curves(curve_offsets, voltage, current_density):
+    """
+    Returns the curves as two 2D arrays of shape `(n_curves, n_points)`,
+    padded with NaN, as `jv_analysis.stack_curves`.
+    """
+    curve_offsets = np.asarray(curve_offsets, dtype=np.int64)
+    lengths = np.diff(curve_offsets)
+    n_points = int(lengths.max()) if len(lengths) else 0
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    columns = np.arange(curve_offsets[-1]) - np.repeat(curve_offsets[:-1], lengths)
+    padded = []
+    for values in (voltage, current_density):
+        array = np.full((len(lengths), n_points), np.nan)
+        array[rows, columns] = values
+        padded.append(array)
+    return tuple(padded)
@@ -0,0 +1,93 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Classification of candidate mainfiles for the UNITOV parsers.
+
+One regular expression, compiled once, gives the kind of a file (`JV`,
+`Tracking`, `Parameters` or `IPCE`) from its name. The kind is then checked
+against the `Test` line of the `## Header ##` block in the first
+`HEADER_SNIFF_SIZE` bytes of the file, as bytes and without decoding them,
+so a misnamed file is rejected at matching time instead of failing in the
+readers.
+"""
+
+import os
+import re
+
+HEADER_MARKER = b'## Header ##'
+UTF8_BOM = b'\xef\xbb\xbf'
+TEST_KEY = b'\nTest\t'
+# the Test line is within the first ten lines of all UNITOV files
+HEADER_SNIFF_SIZE = 512
+
+NAME_RE = re.compile(
+    r'.*_(?P<IPCE>IPCE)_.*\.txt$'
+    r'|.*(?:(?P<JV>JV)|(?P<Tracking>Tracking)|_(?P<Parameters>Parameters))\.txt$'
+)
+TEST_KINDS = {
+    b'Stability (JV)': 'JV',
+    b'Stability (Tracking)': 'Tracking',
+    b'Stability (Parameters)': 'Parameters',
+    b'IPCE': 'IPCE',
+}
+# kinds that are also exported without UNITOV header, see `detect_eqe_layout`
+HEADERLESS_KINDS = {'IPCE'}
+
+
+def get_kind_from_name(file_name):
+    """
+    Returns the kind of the UNITOV file `file_name` (a path or a name) from
+    its name, or None if it is not named like one.
+    """
+    match = NAME_RE.match(os.path.basename(file_name))
+    return match.lastgroup if match is not None else None
+
+
+def get_kind_from_header(head):
+    """
+    Returns the kind given in the `Test` line of the header block that `head`
+    (the first bytes of a file) starts with, '' for an unknown test, or None
+    if `head` does not start with a header block.
+    """
+    if head.startswith(UTF8_BOM):
+        head = head[len(UTF8_BOM) :]
+    if not head.startswith(HEADER_MARKER):
+        return None
+    start = head.find(TEST_KEY)
+    if start == -1:
+        return ''
+    start += len(TEST_KEY)
+    end = head.find(b'\n', start)
+    line = head[start : end if end != -1 else len(head)]
+    return TEST_KINDS.get(line.split(b'\t', 1)[0].strip(), '')
+
+
+def get_file_kind(file_name, buffer):
+    """
+    Returns the kind of the file `file_name` with the first bytes `buffer`,
+    or None if it is not a UNITOV file: if it is not named like one or if its
+    header gives another kind.
+    """
+    kind = get_kind_from_name(file_name)
+    if kind is None:
+        return None
+    header_kind = get_kind_from_header(bytes(buffer[:HEADER_SNIFF_SIZE]))
+    if header_kind is None:
+        return kind if kind in HEADERLESS_KINDS else None
+    return kind if header_kind == kind else None
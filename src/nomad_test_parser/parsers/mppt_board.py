@@ -0,0 +1,207 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Summary of the MPPT tracks of all pixels of a board.
+
+Every `_Tracking.txt` holds the track of one pixel (channel) of a board and
+the pixels are independent of each other. `summarize_board` computes the
+time-binned average efficiency and the decimated preview of every pixel and
+selects the best pixel. With `max_workers`, the tracks are copied once into
+a `multiprocessing.shared_memory` block and the pixels are processed on a
+process pool: the workers attach to the block by name, so only its layout
+and the small per-pixel results are pickled. The results are the same as
+those of the serial path.
+
+This is a standalone tool for a run directory, it is not called by the
+parsers: the MPPT parser normalizes one `_Tracking.txt`, i.e. one pixel, per
+entry, and there is no entry of a whole board that the summary could be
+written to. Run it on the raw directory of a run:
+
+    python -m nomad_test_parser.parsers.mppt_board <run-directory> --workers 8
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from nomad_test_parser.parsers.plotting import downsample_m4
+
+# time bins of the average efficiency of a pixel
+AVERAGE_BINS = 200
+# points of the preview of a pixel
+PREVIEW_POINTS = 5000
+# mW/cm^2, the efficiency in % is the power density in mW/cm^2 at 1 sun
+LIGHT_INTENSITY = 100
+# fewer pixels are not worth starting a process pool
+MIN_SHARED_PIXELS = 2
+
+
+def get_efficiency(power):
+    return 100 * np.asarray(power, dtype=np.float64) / LIGHT_INTENSITY
+
+
+def average_track(time, efficiency, n_bins=AVERAGE_BINS):
+    """
+    Averages the efficiency of a track over `n_bins` equally long time bins.
+    Returns the bin centers and mean efficiencies of the non-empty bins.
+    """
+    finite = np.isfinite(time) & np.isfinite(efficiency)
+    time, efficiency = time[finite], efficiency[finite]
+    if len(time) == 0:
+        return np.empty(0), np.empty(0)
+
+    start, end = time.min(), time.max()
+    width = (end - start) / n_bins if end > start else 1.0
+    bins = np.minimum(((time - start) / width).astype(np.int64), n_bins - 1)
+    counts = np.bincount(bins, minlength=n_bins)
+    sums = np.bincount(bins, weights=efficiency, minlength=n_bins)
+    filled = counts > 0
+    centers = start + (np.arange(n_bins) + 0.5) * width
+    return centers[filled], sums[filled] / counts[filled]
+
+
+def summarize_pixel(time, power, n_bins=AVERAGE_BINS, max_points=PREVIEW_POINTS):
+    """
+    Returns the `average` `(time, efficiency)` over time bins, the decimated
+    `preview` `(time, efficiency)` and the `mean_efficiency` of the track of
+    one pixel.
+    """
+    efficiency = get_efficiency(power)
+    average = average_track(time, efficiency, n_bins)
+    return {
+        'average': average,
+        'preview': downsample_m4(time, efficiency, max_points),
+        'mean_efficiency': float(np.mean(average[1])) if len(average[1]) else np.nan,
+    }
+
+
+def share_tracks(tracks):
+    """
+    Copies the `(time, power)` arrays of `tracks` into one shared memory block.
+    Returns the block and its layout: the offset and length of every track.
+    """
+    lengths = [len(time) for time, _ in tracks]
+    size = max(2 * sum(lengths), 1) * np.dtype(np.float64).itemsize
+    block = shared_memory.SharedMemory(create=True, size=size)
+    values = np.ndarray(size // 8, dtype=np.float64, buffer=block.buf)
+    layout = []
+    offset = 0
+    for (time, power), length in zip(tracks, lengths):
+        values[offset : offset + length] = time
+        values[offset + length : offset + 2 * length] = power
+        layout.append((offset, length))
+        offset += 2 * length
+    del values
+    return block, layout
+
+
+def summarize_shared_pixel(name, offset, length, n_bins, max_points):
+    # runs in the worker processes
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        values = np.ndarray(
+            2 * length, dtype=np.float64, buffer=block.buf, offset=offset * 8
+        )
+        result = summarize_pixel(values[:length], values[length:], n_bins, max_points)
+        # the preview may be a view of the block, which is closed below
+        result['preview'] = tuple(np.array(array) for array in result['preview'])
+        del values
+    finally:
+        block.close()
+    return result
+
+
+def summarize_board(
+    tracks, max_workers=None, n_bins=AVERAGE_BINS, max_points=PREVIEW_POINTS
+):
+    """
+    Summarizes the tracks of the pixels of a board.
+
+    Arguments:
+        tracks: dict mapping the pixel names to their `(time, power)` arrays,
+            e.g. the `time_data` and `power_data` of `read_mppt_buffer`
+        max_workers: number of processes, the pixels are processed in this
+            process if not given or 1
+
+    Returns:
+        dict with the `summarize_pixel` result of every pixel in `pixels` and
+        the name of the pixel with the highest mean efficiency in `best_pixel`
+    """
+    names = list(tracks)
+    arrays = [
+        (np.asarray(time, dtype=np.float64), np.asarray(power, dtype=np.float64))
+        for time, power in tracks.values()
+    ]
+
+    if not max_workers or max_workers == 1 or len(names) < MIN_SHARED_PIXELS:
+        results = [
+            summarize_pixel(time, power, n_bins, max_points) for time, power in arrays
+        ]
+    else:
+        block, layout = share_tracks(arrays)
+        try:
+            workers = min(max_workers, len(names))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(
+                    executor.map(
+                        summarize_shared_pixel,
+                        [block.name] * len(layout),
+                        [offset for offset, _ in layout],
+                        [length for _, length in layout],
+                        [n_bins] * len(layout),
+                        [max_points] * len(layout),
+                    )
+                )
+        finally:
+            block.close()
+            block.unlink()
+
+    pixels = dict(zip(names, results))
+    scores = [result['mean_efficiency'] for result in results]
+    best_pixel = None
+    if any(np.isfinite(scores)):
+        best_pixel = names[int(np.nanargmax(scores))]
+    return {'pixels': pixels, 'best_pixel': best_pixel}
+
+
+if __name__ == '__main__':
+    import argparse
+    import os
+
+    from nomad_test_parser.parsers.file_reading import read_mppt_buffer
+
+    arg_parser = argparse.ArgumentParser(
+        description='Summarize the MPPT tracks of the pixels of a run directory.'
+    )
+    arg_parser.add_argument('directory')
+    arg_parser.add_argument('--workers', type=int, default=None)
+    args = arg_parser.parse_args()
+
+    tracks = {}
+    for file_name in sorted(os.listdir(args.directory)):
+        if file_name.endswith('Tracking.txt'):
+            with open(os.path.join(args.directory, file_name), 'rb') as f:
+                mppt_dict, _ = read_mppt_buffer(f.read())
+            tracks[file_name] = (mppt_dict['time_data'], mppt_dict['power_data'])
+
+    summary = summarize_board(tracks, max_workers=args.workers or os.cpu_count())
+    for name, pixel in summary['pixels'].items():
+        best = ' (best)' if name == summary['best_pixel'] else ''
+        print(f'{name}: mean efficiency {pixel["mean_efficiency"]:.2f} %{best}')
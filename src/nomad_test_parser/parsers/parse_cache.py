@@ -0,0 +1,191 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Persistent on-disk cache for the results of the raw file readers.
+
+Raw measurement files never change after upload, so on reprocessing the
+parsed arrays can be loaded from a `.npz` file instead of parsing the file
+again. Entries are keyed by the SHA-256 of the file content, the reader and
+its arguments, and the reader version: a hash of the `READER_MODULES`
+sources, so any change of the reader code invalidates all entries. The cache
+directory is kept below a size cap by evicting the least recently used
+entries. Its size is tracked while writing, so the directory is only scanned
+when the cap is passed and every `SCAN_MISSES` misses.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+CACHE_STATS = {'hits': 0, 'misses': 0}
+# the readers, the decoding of the raw files they use, and the stacking of
+# the JV curves read by them
+READER_MODULES = ['file_reading', 'raw_file', 'jv_stack']
+# eviction goes below the cap, so that not every following miss evicts again
+EVICT_FRACTION = 0.9
+# the size is scanned anew after this many misses, to count the entries
+# written by other processes
+SCAN_MISSES = 256
+# size (bytes) and misses since the last scan of every cache directory
+CACHE_SIZES = {}
+
+
+def get_reader_version(modules=READER_MODULES):
+    version = hashlib.sha256()
+    for module in modules:
+        with open(os.path.join(os.path.dirname(__file__), f'{module}.py'), 'rb') as f:
+            version.update(f.read())
+    return version.hexdigest()[:16]
+
+
+READER_VERSION = get_reader_version()
+
+
+def pack(value, arrays, path='r'):
+    """
+    Splits a reader result into a JSON-serializable structure and the arrays
+    it references by path.
+    """
+    if isinstance(value, np.ndarray):
+        arrays[path] = value
+        return {'__array__': path}
+    if isinstance(value, dict):
+        return {key: pack(item, arrays, f'{path}/{key}') for key, item in value.items()}
+    if isinstance(value, tuple):
+        return {'__tuple__': pack(list(value), arrays, path)}
+    if isinstance(value, list):
+        return [
+            pack(item, arrays, f'{path}/{index}') for index, item in enumerate(value)
+        ]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def unpack(value, arrays):
+    if isinstance(value, dict):
+        if '__array__' in value:
+            return arrays[value['__array__']]
+        if '__tuple__' in value:
+            return tuple(unpack(value['__tuple__'], arrays))
+        return {key: unpack(item, arrays) for key, item in value.items()}
+    if isinstance(value, list):
+        return [unpack(item, arrays) for item in value]
+    return value
+
+
+def get_cache_key(buffer, reader, kwargs):
+    key = hashlib.sha256(buffer)
+    key.update(f'{reader.__name__}:{sorted(kwargs.items())}:{READER_VERSION}'.encode())
+    return key.hexdigest()
+
+
+def scan_entries(directory):
+    """
+    Returns the `(modification time, size, path)` of the cache entries.
+    """
+    entries = []
+    with os.scandir(directory) as scan:
+        for entry in scan:
+            if entry.name.endswith('.npz'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    return entries
+
+
+def evict(directory, max_size):
+    """
+    Removes the least recently used entries until the cache is below
+    `max_size` bytes. Hits touch the modification time of their entry.
+
+    Returns:
+        the size of the remaining entries
+    """
+    entries = scan_entries(directory)
+    size = sum(entry[1] for entry in entries)
+    for _, entry_size, path in sorted(entries):
+        if size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        size -= entry_size
+    return size
+
+
+def add_entry(directory, entry_size, max_size):
+    """
+    Counts a new entry of `entry_size` bytes in the size of the cache and
+    evicts entries if it passes `max_size`.
+    """
+    cache_size = CACHE_SIZES.get(directory)
+    if cache_size is None or cache_size['misses'] >= SCAN_MISSES:
+        size = sum(entry[1] for entry in scan_entries(directory))
+        cache_size = CACHE_SIZES[directory] = {'size': size, 'misses': 0}
+    else:
+        cache_size['size'] += entry_size
+        cache_size['misses'] += 1
+
+    if cache_size['size'] > max_size:
+        cache_size['size'] = evict(directory, int(max_size * EVICT_FRACTION))
+        cache_size['misses'] = 0
+
+
+def cached_read(reader, buffer, directory=None, max_size=None, logger=None, **kwargs):
+    """
+    Returns `reader(buffer, **kwargs)`, loading it from the cache in
+    `directory` if the same content was read by the same reader version
+    before. Without `directory` the cache is disabled.
+    """
+    if directory is None:
+        return reader(buffer, **kwargs)
+
+    path = os.path.join(directory, f'{get_cache_key(buffer, reader, kwargs)}.npz')
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {key: data[key] for key in data.files}
+        result = unpack(json.loads(str(arrays.pop('__structure__'))), arrays)
+        os.utime(path)
+        CACHE_STATS['hits'] += 1
+        hit = True
+    except (OSError, ValueError, KeyError):
+        result = reader(buffer, **kwargs)
+        arrays = {}
+        structure = pack(result, arrays)
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, __structure__=np.array(json.dumps(structure)), **arrays)
+        os.replace(tmp_path, path)
+        if max_size is not None:
+            add_entry(directory, os.path.getsize(path), max_size)
+        CACHE_STATS['misses'] += 1
+        hit = False
+
+    if logger is not None:
+        logger.info(
+            'parse cache hit' if hit else 'parse cache miss',
+            reader=reader.__name__,
+            **CACHE_STATS,
+        )
+
+    return result
@@ -11,28 +11,28 @@ if TYPE_CHECKING:
     )
 
 from nomad.config import config
-from nomad.datamodel.metainfo.workflow import Workflow
 from nomad.parsing.parser import MatchingParser
 import numpy as np
 #importa ArchiveSection
-from nomad.metainfo import Section, Quantity  # Added import
+from nomad.metainfo import Section, SubSection, Quantity  # Added import
 from nomad.datamodel.data import ArchiveSection # Added import, replaces commented out #importa ArchiveSection
 from nomad.datamodel.data import EntryData
+from baseclasses import BaseMeasurement
 from baseclasses.solar_energy import JVMeasurement
 from baseclasses.solar_energy import EQEMeasurement, SolarCellEQECustom,  MPPTrackingHsprintCustom
-from baseclasses.helper.add_solar_cell import add_band_gap
-import os;
-from baseclasses.helper.utilities import set_sample_reference, create_archive, get_entry_id_from_file_name, get_reference
-import datetime;
 from nomad.datamodel.metainfo.basesections import (
     Entity,
 )
 from nomad.datamodel.metainfo.annotations import (
     ELNAnnotation,
 )
-from baseclasses.helper.utilities import get_encoding
 from nomad.datamodel.metainfo.plot import PlotlyFigure, PlotSection
-from nomad.units import ureg
+from nomad_test_parser.parsers.unitov import (  # noqa: F401
+    EQEParser,
+    JVParser,
+    MPPTParser,
+    ParametersParser,
+)
 
 class RawFileUNITOV(EntryData):
     processed_archive = Quantity(
@@ -78,26 +78,40 @@ class UNITOV_JVmeasurement(JVMeasurement, RawFileUNITOV):
             }])
 
     def normalize(self, archive, logger):
-        print("starting normalize JV with datafile: ",self.data_file)
-        if self.data_file:
-            # todo detect file format
-
-            with archive.m_context.raw_file(self.data_file, "br") as f:
-                encoding = get_encoding(f)
+        from nomad_test_parser.parsers.timing import log_timings, start_timing, timed
 
-            with archive.m_context.raw_file(self.data_file, "tr", encoding=encoding) as f:
-                from nomad_test_parser.parsers.file_reading import read_file_jv_data
-                from baseclasses.helper.archive_builder.jv_archive import get_jv_archive
+        start_timing(configuration.timing)
 
-                jv_dict, location = read_file_jv_data(f)
+        if self.data_file:
+            # todo detect file format
 
-                self.location = location
+            from baseclasses.helper.archive_builder.jv_archive import get_jv_archive
+
+            from nomad_test_parser.parsers.file_reading import read_jv_buffer
+            from nomad_test_parser.parsers.parse_cache import cached_read
+            from nomad_test_parser.parsers.raw_file import open_raw_file
+
+            with open_raw_file(
+                archive,
+                self.data_file,
+                prefetch=get_prefetch_options(configuration),
+            ) as buffer:
+                jv_dict, location = cached_read(
+                    read_jv_buffer,
+                    buffer,
+                    logger=logger,
+                    **get_parse_cache_options(configuration),
+                )
+
+            self.location = location
+            with timed('archive'):
                 get_jv_archive(jv_dict, self.data_file, self)
 
-            print("=======================================WRITTEN DATA IN ARCHIVE")
-
         super(UNITOV_JVmeasurement,
               self).normalize(archive, logger)
+        log_timings(
+            logger, 'UNITOV_JVmeasurement.normalize timing', data_file=self.data_file
+        )
 
 
 class UNITOV_MPPTracking_Measurement(MPPTrackingHsprintCustom, PlotSection, RawFileUNITOV):
@@ -135,7 +149,14 @@ class UNITOV_MPPTracking_Measurement(MPPTrackingHsprintCustom, PlotSection, RawF
         from baseclasses.helper.archive_builder.mpp_hysprint_archive import get_mpp_hysprint_samples
         from baseclasses.helper.utilities import rewrite_json
 
-        from nomad_test_parser.parsers.file_reading import read_mppt_file
+        from nomad_test_parser.parsers.file_reading import read_mppt_buffer
+        from nomad_test_parser.parsers.incremental import read_mppt_incremental
+        from nomad_test_parser.parsers.matching import get_kind_from_name
+        from nomad_test_parser.parsers.parse_cache import cached_read
+        from nomad_test_parser.parsers.raw_file import open_raw_file
+        from nomad_test_parser.parsers.timing import log_timings, start_timing, timed
+
+        start_timing(mppt_configuration.timing)
 
         if self.data_file and self.load_data_from_file:
             self.load_data_from_file = False
@@ -146,71 +167,65 @@ class UNITOV_MPPTracking_Measurement(MPPTrackingHsprintCustom, PlotSection, RawF
             # with archive.m_context.raw_file(self.data_file, "br") as f:
             #     encoding = get_encoding(f)
 
-            with archive.m_context.raw_file(self.data_file, 'tr', encoding='ascii') as f:
-                if os.path.splitext(f.name)[-1] != '.csv':
-                    return
-
-                data = read_mppt_file(f.read())  # , encoding)
-
-            self.samples = get_mpp_hysprint_samples(self, data)
-
-        import pandas as pd
-        import plotly.express as px
-
-        column_names = ['Time [hr]', 'Efficiency [%]', 'P']
+            # only the UNITOV `_Tracking.txt` files can be read
+            if get_kind_from_name(self.data_file) == 'Tracking':
+                with open_raw_file(
+                    archive,
+                    self.data_file,
+                    prefetch=get_prefetch_options(mppt_configuration),
+                ) as buffer:
+                    if mppt_configuration.incremental_directory:
+                        # the tracking file may still grow, only the new rows
+                        # are parsed
+                        mppt_dict, _ = read_mppt_incremental(
+                            buffer,
+                            mppt_configuration.incremental_directory,
+                            f'{archive.metadata.upload_id}/{self.data_file}',
+                            max_size=mppt_configuration.incremental_max_size,
+                        )
+                    else:
+                        mppt_dict, _ = cached_read(
+                            read_mppt_buffer,
+                            buffer,
+                            logger=logger,
+                            **get_parse_cache_options(mppt_configuration),
+                        )
+
+                with timed('archive'):
+                    self.samples = get_mpp_hysprint_samples(self, mppt_dict)
+
+        from nomad_test_parser.parsers.plotting import get_scatter_figure
+
+        column_names = ('Time [hr]', 'Efficiency [%]', 'P')
         self.figures = []
-        if self.averages:
-            fig = px.scatter()
-            df = pd.DataFrame(columns=column_names)
-            for avg in self.averages:
-                df1 = pd.DataFrame(columns=column_names)
-                df1[column_names[0]] = avg.time * ureg('hr')
-                df1[column_names[1]] = avg.efficiency
-                df1[column_names[2]] = avg.name
-                df = pd.concat([df, df1])
-
-            fig = px.scatter(
-                df,
-                x=column_names[0],
-                y=column_names[1],
-                color=column_names[2],
-                symbol=column_names[2],
-                title='Averages',
-            )
-            fig.update_traces(marker=dict(size=4))
-            fig.update_layout(
-                showlegend=True,
-                xaxis=dict(fixedrange=False),
-                yaxis=dict(fixedrange=False),
-            )
-            self.figures.append(PlotlyFigure(label='Averages', index=0, figure=fig.to_plotly_json()))
-
-        if self.best_pixels:
-            df = pd.DataFrame(columns=column_names)
-            for bp in self.best_pixels:
-                df1 = pd.DataFrame(columns=column_names)
-                df1[column_names[0]] = bp.time * ureg('hr')
-                df1[column_names[1]] = bp.efficiency
-                df1[column_names[2]] = bp.name
-                df = pd.concat([df, df1])
-
-            fig = px.scatter(
-                df,
-                x=column_names[0],
-                y=column_names[1],
-                color=column_names[2],
-                symbol=column_names[2],
-                title='Best Pixels',
-            )
-            fig.update_traces(marker=dict(size=4))
-            fig.update_layout(
-                showlegend=True,
-                xaxis=dict(fixedrange=False),
-                yaxis=dict(fixedrange=False),
-            )
-            self.figures.append(PlotlyFigure(label='Best Pixel', index=1, figure=fig.to_plotly_json()))
+        with timed('figures'):
+            if self.averages:
+                figure = get_scatter_figure(
+                    'Averages',
+                    [(avg.name, avg.time, avg.efficiency) for avg in self.averages],
+                    column_names,
+                    max_points=mppt_configuration.plot_max_points,
+                )
+                self.figures.append(
+                    PlotlyFigure(label='Averages', index=0, figure=figure)
+                )
+
+            if self.best_pixels:
+                figure = get_scatter_figure(
+                    'Best Pixels',
+                    [(bp.name, bp.time, bp.efficiency) for bp in self.best_pixels],
+                    column_names,
+                    max_points=mppt_configuration.plot_max_points,
+                )
+                self.figures.append(
+                    PlotlyFigure(label='Best Pixel', index=1, figure=figure)
+                )
 
         super().normalize(archive, logger)
+        log_timings(
+            logger, 'UNITOV_MPPTracking_Measurement.normalize timing',
+            data_file=self.data_file,
+        )
 
 class UNITOV_EQEmeasurement(EQEMeasurement, RawFileUNITOV):
     m_def = Section(
@@ -243,27 +258,37 @@ class UNITOV_EQEmeasurement(EQEMeasurement, RawFileUNITOV):
     )
 
     def normalize(self, archive, logger):
-        from nomad_test_parser.parsers.file_reading import read_file_eqe
+        from nomad_test_parser.parsers.file_reading import read_eqe_buffer
+        from nomad_test_parser.parsers.parse_cache import cached_read
+        from nomad_test_parser.parsers.raw_file import open_raw_file
+        from nomad_test_parser.parsers.timing import log_timings, start_timing, timed
+
+        start_timing(eqe_configuration.timing)
 
         #if not self.samples and self.data_file:
         #    search_id = self.data_file.split('.')[0]
         #    set_sample_reference(archive, self, search_id, upload_id=archive.metadata.upload_id)
 
         if self.data_file:
-            with archive.m_context.raw_file(self.data_file, 'br') as f:
-                encoding = get_encoding(f)
-
-            with archive.m_context.raw_file(self.data_file, 'tr', encoding=encoding) as f:
-                eqe_dict,UPLOAD_FLAG = read_file_eqe(f,header_lines=24)
-
-
-            entry = SolarCellEQECustom(
-                photon_energy_array=eqe_dict.get('photon_energy'),
-                raw_photon_energy_array=eqe_dict.get('photon_energy_raw'),
-                eqe_array=eqe_dict.get('intensity'),
-                raw_eqe_array=eqe_dict.get('intensty_raw'),
-            )
-            entry.normalize(archive, logger)
+            with open_raw_file(
+                archive,
+                self.data_file,
+                prefetch=get_prefetch_options(eqe_configuration),
+            ) as buffer:
+                eqe_dict,UPLOAD_FLAG = cached_read(
+                    read_eqe_buffer, buffer, logger=logger, header_lines=24,
+                    **get_parse_cache_options(eqe_configuration)
+                )
+
+
+            with timed('archive'):
+                entry = SolarCellEQECustom(
+                    photon_energy_array=eqe_dict.get('photon_energy'),
+                    raw_photon_energy_array=eqe_dict.get('photon_energy_raw'),
+                    eqe_array=eqe_dict.get('intensity'),
+                    raw_eqe_array=eqe_dict.get('intensty_raw'),
+                )
+                entry.normalize(archive, logger)
             eqe_data = list();
             eqe_data.append(entry)
 
@@ -275,12 +300,398 @@ class UNITOV_EQEmeasurement(EQEMeasurement, RawFileUNITOV):
         #     add_band_gap(archive, band_gaps[np.isfinite(band_gaps)].mean())
 
         super().normalize(archive, logger)
+        log_timings(
+            logger, 'UNITOV_EQEmeasurement.normalize timing', data_file=self.data_file
+        )
+
+
+class UNITOV_StabilityParametersScan(ArchiveSection):
+    """
+    The figures of merit of all JV scans of a stability run in one scan
+    direction, one value per scan.
+    """
+    name = Quantity(type=str, description='Scan direction, FW or RV.')
+    open_circuit_voltage = Quantity(type=np.float64, shape=['*'], unit='V')
+    short_circuit_current_density = Quantity(
+        type=np.float64, shape=['*'], unit='mA/cm**2'
+    )
+    potential_at_maximum_power_point = Quantity(type=np.float64, shape=['*'], unit='V')
+    current_density_at_maximum_power_point = Quantity(
+        type=np.float64, shape=['*'], unit='mA/cm**2'
+    )
+    power_at_maximum_power_point = Quantity(
+        type=np.float64, shape=['*'], unit='mW/cm**2'
+    )
+    series_resistance = Quantity(type=np.float64, shape=['*'], unit='ohm')
+    shunt_resistance = Quantity(type=np.float64, shape=['*'], unit='ohm')
+    fill_factor = Quantity(
+        type=np.float64, shape=['*'], description='Fill factor, between 0 and 1.'
+    )
+    efficiency = Quantity(
+        type=np.float64, shape=['*'], description='Power conversion efficiency in %.'
+    )
+
+
+class UNITOV_StabilityRunDirection(ArchiveSection):
+    """
+    The degradation of the JV scans of a stability run in one scan direction.
+    """
+    name = Quantity(type=str, description='Scan direction, FW or RV.')
+    initial_efficiency = Quantity(
+        type=np.float64, description='Efficiency in % of the first scan.'
+    )
+    normalized_efficiency = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='Efficiency of every scan relative to the initial efficiency.',
+    )
+    t80 = Quantity(
+        type=np.float64,
+        unit='hour',
+        description='Time of the first scan below 80 % of the initial efficiency.',
+    )
+    trends = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='Slope of the least squares line over time of each of the '
+        '`metrics` of the summary, in their unit per hour.',
+    )
+
+
+class UNITOV_StabilityRunSummary(ArchiveSection):
+    """
+    Hysteresis and degradation of the JV scans of a stability run, see
+    `nomad_test_parser.parsers.run_analysis`.
+    """
+    time = Quantity(
+        type=np.float64,
+        shape=['*'],
+        unit='hour',
+        description='Time of the JV scans since the start of the run.',
+    )
+    hysteresis_index = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='(PCE_RV - PCE_FW) / PCE_RV of every scan.',
+    )
+    metrics = Quantity(
+        type=str, shape=['*'], description='Figures of merit of the `trends`.'
+    )
+    directions = SubSection(section_def=UNITOV_StabilityRunDirection, repeats=True)
 
 
+class UNITOV_StabilityParameters(BaseMeasurement, PlotSection, RawFileUNITOV):
+    """
+    The `_Parameters.txt` of a stability run: the figures of merit of every JV
+    scan over the run, stored as one array per quantity so the degradation of
+    a run can be read without the entries of the single scans.
+    """
+    m_def = Section(
+        a_eln=dict(
+            hide=[
+                'lab_id',
+                'solution',
+                'users',
+                'author',
+                'end_time',
+                'steps',
+                'instruments',
+                'results',
+                'location',
+                'figures',
+            ],
+            properties=dict(order=['name', 'data_file', 'active_area', 'samples']),
+        )
+    )
+
+    data_file = Quantity(
+        type=str,
+        a_eln=dict(component='FileEditQuantity'),
+        a_browser=dict(adaptor='RawFileAdaptor'),
+    )
+    active_area = Quantity(type=np.float64, unit='cm**2')
+    time = Quantity(
+        type=np.float64,
+        shape=['*'],
+        unit='hour',
+        description='Time of the JV scans since the start of the run.',
+    )
+    scans = SubSection(section_def=UNITOV_StabilityParametersScan, repeats=True)
+    summary = SubSection(section_def=UNITOV_StabilityRunSummary)
+
+    def normalize(self, archive, logger):
+        from nomad_test_parser.parsers.file_reading import read_parameters_buffer
+        from nomad_test_parser.parsers.parse_cache import cached_read
+        from nomad_test_parser.parsers.plotting import get_scatter_figure
+        from nomad_test_parser.parsers.raw_file import open_raw_file
+        from nomad_test_parser.parsers.run_analysis import (
+            DIRECTIONS,
+            METRICS,
+            get_run_summary,
+            stack_parameters,
+            update_stored_run_summary,
+        )
+        from nomad_test_parser.parsers.timing import log_timings, start_timing, timed
+
+        start_timing(parameters_configuration.timing)
+
+        if self.data_file:
+            with open_raw_file(
+                archive,
+                self.data_file,
+                prefetch=get_prefetch_options(parameters_configuration),
+            ) as buffer:
+                parameters_dict, _ = cached_read(
+                    read_parameters_buffer,
+                    buffer,
+                    logger=logger,
+                    **get_parse_cache_options(parameters_configuration),
+                )
+
+            with timed('archive'):
+                self.active_area = parameters_dict['active_area']
+                self.time = parameters_dict['time']
+                self.scans = [
+                    UNITOV_StabilityParametersScan(name=direction, **scan)
+                    for direction, scan in parameters_dict['scans'].items()
+                ]
+
+                time, values = stack_parameters(parameters_dict)
+                if parameters_configuration.incremental_directory:
+                    # the parameters file grows during the run, only the new
+                    # scans are added to the summary of the last normalization
+                    summary = update_stored_run_summary(
+                        parameters_configuration.incremental_directory,
+                        f'{archive.metadata.upload_id}/{self.data_file}',
+                        time,
+                        values,
+                        max_size=parameters_configuration.incremental_max_size,
+                    )
+                else:
+                    summary = get_run_summary(time, values)
+                self.summary = UNITOV_StabilityRunSummary(
+                    time=summary['time'],
+                    hysteresis_index=summary['hysteresis_index'],
+                    metrics=METRICS,
+                    directions=[
+                        UNITOV_StabilityRunDirection(
+                            name=direction,
+                            initial_efficiency=summary['initial_efficiency'][index],
+                            normalized_efficiency=summary['normalized_efficiency'][
+                                :, index
+                            ],
+                            t80=summary['t80'][index],
+                            trends=summary['trend'][index],
+                        )
+                        for index, direction in enumerate(DIRECTIONS)
+                    ],
+                )
+
+        self.figures = []
+        if self.scans and self.time is not None:
+            with timed('figures'):
+                figure = get_scatter_figure(
+                    'Efficiency',
+                    [(scan.name, self.time, scan.efficiency) for scan in self.scans],
+                    ('Time [hr]', 'Efficiency [%]', 'Scan'),
+                    max_points=parameters_configuration.plot_max_points,
+                )
+            self.figures.append(
+                PlotlyFigure(label='Efficiency', index=0, figure=figure)
+            )
+
+        if self.summary and self.summary.directions:
+            with timed('figures'):
+                figure = get_scatter_figure(
+                    'Normalized efficiency',
+                    [
+                        (
+                            direction.name,
+                            self.summary.time,
+                            direction.normalized_efficiency,
+                        )
+                        for direction in self.summary.directions
+                    ],
+                    ('Time [hr]', 'Normalized efficiency', 'Scan'),
+                    max_points=parameters_configuration.plot_max_points,
+                )
+            self.figures.append(
+                PlotlyFigure(label='Normalized efficiency', index=1, figure=figure)
+            )
+
+        super().normalize(archive, logger)
+        log_timings(
+            logger,
+            'UNITOV_StabilityParameters.normalize timing',
+            data_file=self.data_file,
+        )
+
+
+class UNITOV_JVRun(BaseMeasurement, RawFileUNITOV):
+    """
+    All JV scans of a stability run in one entry, written with the
+    `aggregate_jv_scans` option. The curves of all scans are concatenated in
+    CSR layout, see `nomad_test_parser.parsers.jv_stack`.
+    """
+    m_def = Section(
+        a_eln=dict(
+            hide=[
+                'lab_id',
+                'solution',
+                'users',
+                'author',
+                'end_time',
+                'steps',
+                'instruments',
+                'results',
+                'location',
+            ],
+            properties=dict(order=['name', 'data_file', 'active_area', 'samples']),
+        )
+    )
+
+    data_file = Quantity(
+        type=str,
+        description='The parameters file of the run.',
+        a_eln=dict(component='FileEditQuantity'),
+        a_browser=dict(adaptor='RawFileAdaptor'),
+    )
+    active_area = Quantity(type=np.float64, unit='cm**2')
+    data_files = Quantity(type=str, shape=['*'], description='JV file of every scan.')
+    scan_datetime = Quantity(
+        type=str,
+        shape=['*'],
+        description='Date and time of every scan, from the header of its file.',
+    )
+    scan_time = Quantity(
+        type=np.float64,
+        shape=['*'],
+        unit='hour',
+        description='Time of every scan since the first one.',
+    )
+    curve_offsets = Quantity(
+        type=np.int64,
+        shape=['*'],
+        description='Start of every curve in `voltage` and `current_density` and '
+        'their length as last value: curve i is '
+        '`voltage[curve_offsets[i]:curve_offsets[i + 1]]`.',
+    )
+    curve_scan = Quantity(
+        type=np.int64, shape=['*'], description='Index of the scan of every curve.'
+    )
+    curve_direction = Quantity(
+        type=str, shape=['*'], description='Scan direction of every curve, FW or RV.'
+    )
+    voltage = Quantity(type=np.float64, shape=['*'], unit='V')
+    current_density = Quantity(type=np.float64, shape=['*'], unit='mA/cm**2')
+    short_circuit_current_density = Quantity(
+        type=np.float64, shape=['*'], unit='mA/cm**2'
+    )
+    open_circuit_voltage = Quantity(type=np.float64, shape=['*'], unit='V')
+    fill_factor = Quantity(
+        type=np.float64, shape=['*'], description='Fill factor of every curve in %.'
+    )
+    efficiency = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='Power conversion efficiency of every curve in %.',
+    )
+
+    def normalize(self, archive, logger):
+        from nomad_test_parser.parsers.file_reading import read_jv_buffer
+        from nomad_test_parser.parsers.jv_stack import (
+            stack_jv_dicts,
+            update_stored_stack,
+        )
+        from nomad_test_parser.parsers.parse_cache import cached_read
+        from nomad_test_parser.parsers.raw_file import open_raw_file
+        from nomad_test_parser.parsers.timing import log_timings, start_timing, timed
+        from nomad_test_parser.parsers.unitov import list_run_jv_files
+
+        start_timing(configuration.timing)
+
+        def read_jv_dict(path):
+            with open_raw_file(
+                archive, path, prefetch=get_prefetch_options(configuration)
+            ) as buffer:
+                # the run is written with the `aggregate_jv_scans` option of
+                # the JV parser and reads the JV files with its options
+                jv_dict, _ = cached_read(
+                    read_jv_buffer,
+                    buffer,
+                    logger=logger,
+                    **get_parse_cache_options(configuration),
+                )
+            return jv_dict
+
+        if self.data_file:
+            data_files = list_run_jv_files(archive, self.data_file)
+            if configuration.incremental_directory:
+                # a new scan adds a JV file, only the new files are read
+                stacked = update_stored_stack(
+                    configuration.incremental_directory,
+                    f'{archive.metadata.upload_id}/{self.data_file}',
+                    data_files,
+                    read_jv_dict,
+                    max_size=configuration.incremental_max_size,
+                )
+            else:
+                stacked = stack_jv_dicts(read_jv_dict(path) for path in data_files)
+
+            with timed('archive'):
+                if stacked['active_area'] is not None:
+                    self.active_area = stacked['active_area']
+                self.data_files = data_files
+                self.scan_datetime = [value or '' for value in stacked['datetime']]
+                self.scan_time = stacked['time']
+                self.curve_offsets = stacked['curve_offsets']
+                self.curve_scan = stacked['curve_scan']
+                self.curve_direction = stacked['curve_direction']
+                self.voltage = stacked['voltage']
+                self.current_density = stacked['current_density']
+                self.short_circuit_current_density = stacked['J_sc']
+                self.open_circuit_voltage = stacked['V_oc']
+                self.fill_factor = stacked['Fill_factor']
+                self.efficiency = stacked['Efficiency']
+
+        super().normalize(archive, logger)
+        log_timings(logger, 'UNITOV_JVRun.normalize timing', data_file=self.data_file)
+
 
 configuration = config.get_plugin_entry_point(
     'nomad_test_parser.parsers:parser_entry_point'
 )
+mppt_configuration = config.get_plugin_entry_point(
+    'nomad_test_parser.parsers:parser_mppt_entry_point'
+)
+eqe_configuration = config.get_plugin_entry_point(
+    'nomad_test_parser.parsers:parser_eqe_entry_point'
+)
+parameters_configuration = config.get_plugin_entry_point(
+    'nomad_test_parser.parsers:parser_parameters_entry_point'
+)
+
+
+def get_parse_cache_options(entry_point):
+    """
+    Returns the `cached_read` options of the configuration `entry_point` of a
+    UNITOV parser.
+    """
+    return dict(
+        directory=entry_point.parse_cache_directory,
+        max_size=entry_point.parse_cache_max_size,
+    )
+
+
+def get_prefetch_options(entry_point):
+    """
+    Returns the `open_raw_file` read-ahead options of the configuration
+    `entry_point` of a UNITOV parser.
+    """
+    return dict(
+        depth=entry_point.prefetch_depth,
+        max_bytes=entry_point.prefetch_max_bytes,
+    )
 
 class SimpleOutput(ArchiveSection):
     """
@@ -314,10 +725,6 @@ class NewParser(MatchingParser):
         child_archives: dict[str, 'EntryArchive'] = None,
     ) -> None:
         logger.info('JVParser.parse', parameter=configuration.parameter)
-        print("PIPPO ==========================================")
-        print("PIPPO ==========================================")
-        print("PIPPO ==========================================")
-        print("PIPPO ==========================================")
 
         # 1. Create an instance of your custom section
         my_simple_output_data = SimpleOutput()
@@ -331,104 +738,3 @@ class NewParser(MatchingParser):
         # 3. Assign your custom section to archive.data
         #    archive.data is the typical place for the primary data extracted by the parser.
         archive.data = my_simple_output_data
-
-
-class EQEParser(MatchingParser):
-    def parse(
-        self,
-        mainfile: str,
-        archive: 'EntryArchive',
-        logger: 'BoundLogger',
-        child_archives: dict[str, 'EntryArchive'] = None,
-    ) -> None:
-        logger.info('EQEParser.parse', parameter=configuration.parameter)
-        print("Parse EQE ==========================================")
-
-        # 1. Create an instance of your custom section
-        #entry = UNITOV_JVmeasurement()
-        notes = ''
-
-        basename = os.path.basename(mainfile)
-        file_name = f'{basename}.archive.json'
-        archive.data = UNITOV_EQEmeasurement()
-        archive.data.message = 'This is a test EQE measurement parsing.'
-        archive.data.datetime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
-        archive.data.data_file = basename;
-        archive.data.m_to_dict(with_root_def=True)
-        create_archive(archive.data, archive, file_name, overwrite=True)
-
-class MPPTParser(MatchingParser):
-    def parse(
-        self,
-        mainfile: str,
-        archive: 'EntryArchive',
-        logger: 'BoundLogger',
-        child_archives: dict[str, 'EntryArchive'] = None,
-    ) -> None:
-        logger.info('MPPTParser.parse', parameter=configuration.parameter)
-        print("Parse MPPT ==========================================")
-
-        # 1. Create an instance of your custom section
-        #entry = UNITOV_JVmeasurement()
-        notes = ''
-
-        file_name = f'{os.path.basename(mainfile)}.archive.json'
-
-        archive.data = UNITOV_MPPTracking_Measurement()
-        archive.data.message = 'This is a test MPPT measurement parsing.'
-        archive.data.datetime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
-        archive.data.data_file = os.path.basename(mainfile)
-        archive.data.m_to_dict(with_root_def=True)
-        create_archive(archive.data, archive, file_name, overwrite=True)
-
-
-class JVParser(MatchingParser):
-    def parse(
-        self,
-        mainfile: str,
-        archive: 'EntryArchive',
-        logger: 'BoundLogger',
-        child_archives: dict[str, 'EntryArchive'] = None,
-    ) -> None:
-        logger.info('NewParser.parse', parameter=configuration.parameter)
-        print("Parse JV curve ==========================================")
-
-        # 1. Create an instance of your custom section
-        #entry = UNITOV_JVmeasurement()
-        notes = ''
-
-        # 2. Populate the section with some data
-        #    (In a real parser, this data would come from parsing the 'mainfile')
-
-        #archive.metadata.entry_name = os.path.basename(mainfile)
-
-        #mainfile_split = mainfile.split('.');
-
-        #if not mainfile_split[-1] in ["nk"]:
-        #    search_id = mainfile_split[0]
-        #    set_sample_reference(archive, entry, search_id)
-
-        #    entry.name = f"{search_id} {notes}"
-        #    entry.description = f"Notes from file name: {notes}"
-
-        #if not measurment_type in ["uvvis", "sem", "SEM"]:
-        #    entry.data_file = os.path.basename(mainfile)
-
-
-
-        file_name = f'{os.path.basename(mainfile)}.archive.json'
-        #eid = get_entry_id_from_file_name(file_name, archive)
-
-        #archive.data = UNITOV_JVmeasurement(processed_archive=get_reference(archive.metadata.upload_id, eid))
-        archive.data = UNITOV_JVmeasurement()
-        basename = os.path.basename(mainfile)
-        archive.data.message = 'This is a test JV measurement parsing.'
-        archive.data.datetime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
-        archive.data.data_file = basename;
-        archive.data.m_to_dict(with_root_def=True)
-        create_archive(archive.data, archive, file_name, overwrite=True)
-
-
-        # 3. Assign your custom section to archive.data
-        #    archive.data is the typical place for the primary data extracted by the parser.
-        #archive.data = my_simple_output_data
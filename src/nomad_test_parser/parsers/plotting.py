@@ -0,0 +1,126 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import numpy as np
+
+# plotly.express defaults for discrete `color` and `symbol` sequences
+COLORS = [
+    '#636efa', '#EF553B', '#00cc96', '#ab63fa', '#FFA15A',
+    '#19d3f3', '#FF6692', '#B6E880', '#FF97FF', '#FECB52',
+]
+SYMBOLS = ['circle', 'diamond', 'square', 'x', 'cross']
+# above this number of points plotly.express renders with WebGL
+WEBGL_THRESHOLD = 1000
+
+
+def get_magnitude(value):
+    """
+    Returns the values of a (pint) quantity or array-like as a float64 array.
+    """
+    return np.asarray(getattr(value, 'magnitude', value), dtype=np.float64)
+
+
+def downsample_m4(x, y, max_points):
+    """
+    Min/max-preserving (M4) decimation of a trace to at most `max_points`
+    points. The x range is split into `max_points // 4` equally wide buckets
+    and of each bucket the first, last, minimum and maximum point is kept, so
+    spikes and drops stay visible in the preview. The kept points stay in
+    their original order. Non-finite points are dropped when decimating.
+    """
+    x = get_magnitude(x)
+    y = get_magnitude(y)
+    if max_points is None or len(x) <= max_points:
+        return x, y
+
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    if len(x) <= max_points:
+        return x, y
+
+    n_buckets = max(1, max_points // 4)
+    x_min, x_max = x.min(), x.max()
+    if x_max > x_min:
+        buckets = ((x - x_min) / (x_max - x_min) * n_buckets).astype(np.int64)
+        np.minimum(buckets, n_buckets - 1, out=buckets)
+    else:
+        buckets = np.zeros(len(x), dtype=np.int64)
+
+    # stable sort by bucket keeps the original order within a bucket, sorting
+    # by (bucket, y) puts the minimum first and the maximum last
+    by_index = np.argsort(buckets, kind='stable')
+    by_value = np.lexsort((y, buckets))
+    sorted_buckets = buckets[by_index]
+    starts = np.flatnonzero(np.r_[True, sorted_buckets[1:] != sorted_buckets[:-1]])
+    ends = np.r_[starts[1:], len(x)] - 1
+
+    keep = np.unique(np.concatenate([
+        by_index[starts], by_index[ends], by_value[starts], by_value[ends],
+    ]))
+    return x[keep], y[keep]
+
+
+def get_scatter_figure(title, traces, labels, max_points=None):
+    """
+    Builds the Plotly JSON of a scatter plot with one marker trace per
+    `(name, x, y)` in `traces`. `labels` are the `(x_label, y_label,
+    legend_title)` of the plot; the traces are colored and with symbols as
+    `plotly.express` would with `color=symbol=legend_title`.
+
+    The traces are emitted directly from the arrays, without collecting them
+    in a DataFrame or going through a `plotly.graph_objects.Figure`. With
+    `max_points` each trace is decimated with `downsample_m4` to a preview of
+    at most that many points.
+    """
+    x_label, y_label, legend_title = labels
+    arrays = [(name, *downsample_m4(x, y, max_points)) for name, x, y in traces]
+    n_points = sum(len(x) for _, x, _ in arrays)
+    trace_type = 'scattergl' if n_points > WEBGL_THRESHOLD else 'scatter'
+
+    data = []
+    for index, (name, x, y) in enumerate(arrays):
+        data.append(
+            {
+                'type': trace_type,
+                'mode': 'markers',
+                'name': name,
+                'legendgroup': name,
+                'showlegend': True,
+                'x': x.tolist(),
+                'y': y.tolist(),
+                'xaxis': 'x',
+                'yaxis': 'y',
+                'marker': {
+                    'color': COLORS[index % len(COLORS)],
+                    'symbol': SYMBOLS[index % len(SYMBOLS)],
+                    'size': 4,
+                },
+                'hovertemplate': f'{legend_title}={name}<br>{x_label}=%{{x}}'
+                f'<br>{y_label}=%{{y}}<extra></extra>',
+            }
+        )
+
+    layout = {
+        'title': {'text': title},
+        'showlegend': True,
+        'legend': {'title': {'text': legend_title}, 'tracegroupgap': 0},
+        'xaxis': {'title': {'text': x_label}, 'fixedrange': False},
+        'yaxis': {'title': {'text': y_label}, 'fixedrange': False},
+    }
+
+    return {'data': data, 'layout': layout}
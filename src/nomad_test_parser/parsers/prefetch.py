@@ -0,0 +1,202 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Read-ahead of the raw files of an upload during normalization.
+
+The entries of an upload are normalized one after the other, each blocking on
+the read of its raw file. On networked file systems the latency of these
+reads dominates. When a UNITOV raw file is opened, the `RawFilePrefetcher` of
+the upload reads the next mainfiles of the same kind in its directory on a
+thread pool while the current one is parsed, so later entries find their
+content in memory. The number of files read ahead and the bytes held are
+bounded by the options of the parser of that kind.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from nomad_test_parser.parsers.matching import get_kind_from_name
+
+PREFETCH_WORKERS = 4
+
+
+class RawFilePrefetcher:
+    """
+    Reads the files in `paths` ahead of their use with `open_file(path)` on a
+    thread pool. At most `depth` files are read ahead and no new reads are
+    started while the files read but not taken yet hold `max_bytes` or more.
+    """
+
+    def __init__(
+        self, open_file, paths, depth, max_bytes, max_workers=PREFETCH_WORKERS
+    ):
+        self.open_file = open_file
+        self.paths = list(paths)
+        self.position = {path: index for index, path in enumerate(self.paths)}
+        self.depth = depth
+        self.max_bytes = max_bytes
+        self.executor = ThreadPoolExecutor(max_workers=min(max_workers, depth))
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.taken = set()
+        self.size = 0
+
+    def read(self, path):
+        with self.open_file(path) as f:
+            data = f.read()
+        with self.lock:
+            self.size += len(data)
+        return data
+
+    def advance(self, path):
+        """
+        Starts reading the files following `path`.
+        """
+        start = self.position.get(path, -1) + 1
+        with self.lock:
+            for next_path in self.paths[start:]:
+                if len(self.pending) >= self.depth or self.size >= self.max_bytes:
+                    break
+                if next_path in self.pending or next_path in self.taken:
+                    continue
+                self.pending[next_path] = self.executor.submit(self.read, next_path)
+
+    def release(self, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self.lock:
+            self.size -= len(future.result())
+
+    def take(self, path):
+        """
+        Returns the content of `path` if it was read ahead (waiting for a read
+        in progress) or None, and starts reading the files following it.
+
+        The files read ahead of the ones before `path` were skipped by the
+        processing: their reads are cancelled and their contents dropped, so
+        they do not hold the read-ahead slots and bytes.
+        """
+        index = self.position.get(path, -1)
+        with self.lock:
+            future = self.pending.pop(path, None)
+            self.taken.add(path)
+            skipped = [
+                self.pending.pop(pending_path)
+                for pending_path in list(self.pending)
+                if self.position[pending_path] < index
+            ]
+        for skipped_future in skipped:
+            # the bytes of a read in progress are released when it ends
+            if not skipped_future.cancel():
+                skipped_future.add_done_callback(self.release)
+
+        data = None
+        if future is not None:
+            try:
+                data = future.result()
+            except OSError:
+                data = None
+            else:
+                with self.lock:
+                    self.size -= len(data)
+
+        self.advance(path)
+        return data
+
+    def close(self):
+        with self.lock:
+            for future in self.pending.values():
+                future.cancel()
+            self.pending.clear()
+        self.executor.shutdown(wait=False)
+
+
+def list_mainfiles(archive, path, kind=None):
+    """
+    Returns the UNITOV mainfiles in the directory of `path`, sorted, only the
+    ones of `kind` (see `get_kind_from_name`) if given. Raw files
+    are listed with the upload files of a `ServerContext` or from the
+    directory of a `DirectoryContext`, other contexts are not supported.
+    """
+    directory = os.path.dirname(path)
+    context = archive.m_context
+    try:
+        upload_files = getattr(context, 'upload_files', None)
+        if upload_files is not None:
+            names = [
+                info.path
+                for info in upload_files.raw_directory_list(directory, files_only=True)
+            ]
+        elif hasattr(context, 'directory'):
+            names = [
+                os.path.join(directory, name)
+                for name in os.listdir(os.path.join(context.directory, directory))
+            ]
+        else:
+            return []
+    except (OSError, KeyError, AttributeError):
+        return []
+    name_kinds = {name: get_kind_from_name(name) for name in names}
+    return sorted(
+        name
+        for name, name_kind in name_kinds.items()
+        if name_kind is not None and kind in (None, name_kind)
+    )
+
+
+# the prefetcher of the upload processed by this process, per file kind
+PREFETCHERS = {}
+
+
+def close_prefetchers():
+    """
+    Stops the read-ahead of all file kinds.
+    """
+    for slot in PREFETCHERS.values():
+        slot['prefetcher'].close()
+    PREFETCHERS.clear()
+
+
+def take_raw_file(archive, path, depth, max_bytes):
+    """
+    Returns the content of the raw file `path` if it was read ahead, or None,
+    and reads ahead the mainfiles of the same kind following it in its
+    directory.
+    """
+    # entries of the same upload can come with their own context
+    upload_id = getattr(archive.metadata, 'upload_id', None) or id(archive.m_context)
+    key = (upload_id, os.path.dirname(path), depth, max_bytes)
+    kind = get_kind_from_name(path)
+    slot = PREFETCHERS.get(kind)
+    if slot is None or slot['key'] != key:
+        if slot is not None:
+            slot['prefetcher'].close()
+        paths = list_mainfiles(archive, path, kind=kind)
+        slot = PREFETCHERS[kind] = {
+            'key': key,
+            'prefetcher': RawFilePrefetcher(
+                lambda raw_path: archive.m_context.raw_file(raw_path, 'br'),
+                paths,
+                depth,
+                max_bytes,
+            ),
+        }
+
+    return slot['prefetcher'].take(path)
@@ -0,0 +1,104 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import io
+import mmap
+from contextlib import ExitStack, contextmanager
+
+from nomad_test_parser.parsers.timing import timed
+
+# Bytes inspected to decide the encoding, enough for the header and the
+# units line of the figures-of-merit table.
+ENCODING_PREFIX_SIZE = 4096
+DEFAULT_ENCODING = 'windows-1252'
+
+
+@contextmanager
+def open_raw_file(archive, path, prefetch=None):
+    """
+    Opens a raw file of the upload once in binary mode and yields its content.
+
+    When the context hands out a real file (e.g. the staging volumes of a
+    `ServerContext`) the file is memory-mapped read-only and the `mmap` object
+    is yielded, so parsers can search and slice it without reading the whole
+    file into memory. For contexts that return non-seekable streams, or for
+    empty files, the content is read once into `bytes`.
+
+    With `prefetch`, a dict with the `depth` and `max_bytes` of the read-ahead
+    (see `nomad_test_parser.parsers.prefetch`), the content is taken from the
+    files read ahead if possible and the following mainfiles are read ahead.
+    """
+    if prefetch is not None and prefetch['depth'] > 0:
+        from nomad_test_parser.parsers.prefetch import take_raw_file
+
+        with timed('open'):
+            data = take_raw_file(archive, path, **prefetch)
+        if data is not None:
+            yield data
+            return
+
+    with ExitStack() as stack:
+        with timed('open'):
+            f = stack.enter_context(archive.m_context.raw_file(path, 'br'))
+            try:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+                buffer = f.read()
+
+        if not isinstance(buffer, mmap.mmap):
+            yield buffer
+            return
+
+        try:
+            yield buffer
+        finally:
+            buffer.close()
+
+
+def buffer_stream(buffer, offset=0):
+    """
+    Returns a binary file-like object positioned at `offset` of `buffer`
+    without copying it: a `mmap` is a file-like object itself and a
+    `io.BytesIO` shares the memory of the `bytes` it is created from.
+    """
+    stream = buffer if isinstance(buffer, mmap.mmap) else io.BytesIO(buffer)
+    stream.seek(offset)
+    return stream
+
+
+def sniff_encoding(buffer, size=ENCODING_PREFIX_SIZE):
+    """
+    Decides the encoding of a raw file from its first `size` bytes. UNITOV
+    files are either plain ASCII, UTF-8 (newer exports) or windows-1252 (the
+    `mA/cm²` units of the instruments), so the prefix is tried as UTF-8 and
+    anything else falls back to windows-1252.
+
+    Tracking, parameters and IPCE files are ASCII, the check for non-ASCII
+    bytes decides these without decoding. Detection of the files with
+    non-ASCII units costs about a microsecond, so the decision is not cached.
+    """
+    prefix = buffer[:size]
+    if prefix.isascii():
+        return 'utf-8'
+    try:
+        prefix.decode('utf-8')
+    except UnicodeDecodeError as error:
+        # only a multi-byte character cut in half at the end of the prefix
+        if len(prefix) < size or error.reason != 'unexpected end of data':
+            return DEFAULT_ENCODING
+    return 'utf-8'
@@ -0,0 +1,339 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Hysteresis and degradation analytics of the JV scans of a stability run.
+
+The figures of merit of all scans of one device and channel, from the
+`_Parameters.txt` of the run (`stack_parameters`) or from its `_JV.txt` files
+(`stack_jv_scans`), are stacked into one array of shape `(n_scans,
+n_directions, n_metrics)`, with the `DIRECTIONS` FW and RV and the `METRICS`
+of the parameters reader. The run summary holds, computed for all scans at
+once:
+
+- the hysteresis index `(PCE_RV - PCE_FW) / PCE_RV` of every scan,
+- the efficiency of every scan normalized to the first one and the time at
+  which it first falls below `DECAY_THRESHOLD` (T80), per direction,
+- the trend of every metric, the slope per hour of its least squares line,
+  per direction.
+
+The trends are kept as running sums, so `update_run_summary` folds new scans
+into a summary in O(new scans) instead of recomputing it from all scans, and
+`update_stored_run_summary` keeps the summary of a growing `_Parameters.txt`
+on disk between two normalizations.
+
+    python -m nomad_test_parser.parsers.run_analysis <run-directory>
+"""
+
+import os
+
+import numpy as np
+
+from nomad_test_parser.parsers.file_reading import (
+    PARAMETERS_COLUMNS,
+    PARAMETERS_DIRECTIONS,
+)
+from nomad_test_parser.parsers.incremental import (
+    STATE_MAX_SIZE,
+    add_state,
+    get_state_directory,
+)
+
+METRICS = list(PARAMETERS_COLUMNS)
+DIRECTIONS = PARAMETERS_DIRECTIONS
+EFFICIENCY = METRICS.index('efficiency')
+# T80, the time until the efficiency falls below 80 % of the initial one
+DECAY_THRESHOLD = 0.8
+# keys of the figures of merit of the `jv_dict` of the JV readers
+JV_DICT_METRICS = {
+    'open_circuit_voltage': 'V_oc',
+    'short_circuit_current_density': 'J_sc',
+    'potential_at_maximum_power_point': 'U_MPP',
+    'current_density_at_maximum_power_point': 'J_MPP',
+    'power_at_maximum_power_point': 'P_MPP',
+    'series_resistance': 'R_ser',
+    'shunt_resistance': 'R_par',
+    'fill_factor': 'Fill_factor',
+    'efficiency': 'Efficiency',
+}
+SUMMARY_FILE = 'run_summary.npz'
+# running sums of the least squares trends, per direction and metric
+SUMS = ['count', 'sum_t', 'sum_tt', 'sum_y', 'sum_ty']
+
+
+def stack_parameters(parameters_dict):
+    """
+    Returns the `time` (hours) and the stacked figures of merit of the
+    `parameters_dict` of `read_parameters_file`.
+    """
+    scans = parameters_dict['scans']
+    values = np.stack(
+        [
+            np.column_stack([scans[direction][metric] for metric in METRICS])
+            for direction in DIRECTIONS
+        ],
+        axis=1,
+    )
+    return np.asarray(parameters_dict['time'], dtype=np.float64), values
+
+
+def stack_jv_scans(scans):
+    """
+    Returns the time and the stacked figures of merit of `(time, jv_dict)`
+    pairs, one per `_JV.txt` file of a run. The rows of a `jv_dict` are
+    assigned to the directions by its `scan_direction`, or in the order of
+    `DIRECTIONS` if it has none and one row per direction. Rows of an unknown
+    direction or without all figures of merit are skipped, missing
+    directions are NaN. The fill factor is converted to a fraction, as in the
+    parameters files.
+    """
+    times = []
+    rows = []
+    for time, jv_dict in scans:
+        row = np.full((len(DIRECTIONS), len(METRICS)), np.nan)
+        values = [jv_dict.get(JV_DICT_METRICS[metric]) or [] for metric in METRICS]
+        n_rows = min(len(metric_values) for metric_values in values)
+        directions = jv_dict.get('scan_direction') or (
+            DIRECTIONS if n_rows == len(DIRECTIONS) else []
+        )
+        for index, direction in enumerate(directions[:n_rows]):
+            if direction in DIRECTIONS:
+                row[DIRECTIONS.index(direction)] = [
+                    metric_values[index] for metric_values in values
+                ]
+        times.append(time)
+        rows.append(row)
+    values = np.array(rows, dtype=np.float64).reshape(
+        -1, len(DIRECTIONS), len(METRICS)
+    )
+    values[:, :, METRICS.index('fill_factor')] /= 100
+    return np.array(times, dtype=np.float64), values
+
+
+def new_run_summary():
+    """
+    Returns the summary of a run without scans.
+    """
+    shape = (len(DIRECTIONS), len(METRICS))
+    summary = {
+        'time': np.empty(0),
+        'values': np.empty((0, *shape)),
+        'hysteresis_index': np.empty(0),
+        'normalized_efficiency': np.empty((0, len(DIRECTIONS))),
+        'initial_efficiency': np.full(len(DIRECTIONS), np.nan),
+        't80': np.full(len(DIRECTIONS), np.nan),
+        'trend': np.full(shape, np.nan),
+    }
+    for name in SUMS:
+        summary[name] = np.zeros(shape)
+    return summary
+
+
+def get_first(mask, values):
+    """
+    Returns the value at the first True of `mask` along the first axis, NaN
+    where there is none.
+    """
+    first = np.argmax(mask, axis=0)
+    found = mask.any(axis=0)
+    return np.where(found, np.take_along_axis(values, first[None], axis=0)[0], np.nan)
+
+
+def fold_scans(summary, time, values):
+    """
+    Returns `summary` with the scans `time`, `values` added, which are sorted
+    and not earlier than the scans of the summary. Only the new scans are
+    processed.
+    """
+    summary = dict(summary)
+    finite = np.isfinite(values) & np.isfinite(time)[:, None, None]
+    t = np.where(finite, time[:, None, None], 0)
+    y = np.where(finite, values, 0)
+    summary['count'] = summary['count'] + finite.sum(axis=0)
+    summary['sum_t'] = summary['sum_t'] + t.sum(axis=0)
+    summary['sum_tt'] = summary['sum_tt'] + (t * t).sum(axis=0)
+    summary['sum_y'] = summary['sum_y'] + y.sum(axis=0)
+    summary['sum_ty'] = summary['sum_ty'] + (t * y).sum(axis=0)
+
+    count, sum_t = summary['count'], summary['sum_t']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        trend = (count * summary['sum_ty'] - sum_t * summary['sum_y']) / (
+            count * summary['sum_tt'] - sum_t**2
+        )
+    summary['trend'] = np.where(count > 1, trend, np.nan)
+
+    efficiency = values[:, :, EFFICIENCY]
+    # the first scan with a positive efficiency is the reference of a direction
+    initial = summary['initial_efficiency']
+    summary['initial_efficiency'] = np.where(
+        np.isnan(initial), get_first(efficiency > 0, efficiency), initial
+    )
+    rv = efficiency[:, DIRECTIONS.index('RV')]
+    fw = efficiency[:, DIRECTIONS.index('FW')]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        normalized = efficiency / summary['initial_efficiency']
+        hysteresis_index = np.where(rv != 0, (rv - fw) / rv, np.nan)
+    scan_time = np.broadcast_to(time[:, None], normalized.shape)
+    t80 = summary['t80']
+    summary['t80'] = np.where(
+        np.isnan(t80), get_first(normalized < DECAY_THRESHOLD, scan_time), t80
+    )
+
+    summary['time'] = np.concatenate([summary['time'], time])
+    summary['values'] = np.concatenate([summary['values'], values])
+    summary['normalized_efficiency'] = np.concatenate(
+        [summary['normalized_efficiency'], normalized]
+    )
+    summary['hysteresis_index'] = np.concatenate(
+        [summary['hysteresis_index'], hysteresis_index]
+    )
+    return summary
+
+
+def update_run_summary(summary, time, values):
+    """
+    Returns `summary` with the scans `time`, `values` added. Scans later than
+    those of the summary, the usual case while a run is measured, are folded
+    in from the running sums; otherwise the summary is recomputed from the
+    stacked scans.
+    """
+    time = np.asarray(time, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    if len(time) == 0:
+        return summary
+    order = np.argsort(time, kind='stable')
+    time, values = time[order], values[order]
+    if len(summary['time']) and time[0] < summary['time'][-1]:
+        return get_run_summary(
+            np.concatenate([summary['time'], time]),
+            np.concatenate([summary['values'], values]),
+        )
+    return fold_scans(summary, time, values)
+
+
+def get_run_summary(time, values):
+    """
+    Computes the summary of the stacked scans `time`, `values` of a run.
+
+    Returns:
+        dict with the sorted `time` and `values`, the `hysteresis_index` and
+        the `normalized_efficiency` (per direction) of every scan, and per
+        direction the `initial_efficiency`, the `t80` (hours) and the `trend`
+        of every metric (per hour), next to the running sums they are
+        computed from
+    """
+    return update_run_summary(new_run_summary(), time, values)
+
+
+def extend_run_summary(summary, time, values):
+    """
+    Returns the summary of the scans `time`, `values` of a run of which
+    `summary` holds the first scans, e.g. of a `_Parameters.txt` that grew
+    since it was summarized. Only the new scans are processed, unless the
+    scans of the summary are not the first ones of the stack.
+    """
+    n_scans = len(summary['time'])
+    if (
+        0 < n_scans <= len(time)
+        and np.array_equal(time[:n_scans], summary['time'])
+        and np.array_equal(values[n_scans - 1], summary['values'][-1], equal_nan=True)
+    ):
+        return update_run_summary(summary, time[n_scans:], values[n_scans:])
+    return get_run_summary(time, values)
+
+
+def load_run_summary(path):
+    try:
+        with np.load(path) as data:
+            summary = {name: data[name] for name in data.files}
+    except (OSError, ValueError):
+        return None
+    return summary if summary.keys() == new_run_summary().keys() else None
+
+
+def save_run_summary(path, summary):
+    tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+    np.savez(tmp_path, **summary)
+    os.replace(tmp_path, path)
+
+
+def update_stored_run_summary(directory, key, time, values, max_size=STATE_MAX_SIZE):
+    """
+    Same as `extend_run_summary`, with the summary of the last call with the
+    same `key` (e.g. upload id and data file) kept in a subdirectory of
+    `directory`, whose summaries are kept below `max_size` bytes.
+    """
+    state_directory = get_state_directory(directory, key)
+    new_state = not os.path.isdir(state_directory)
+    os.makedirs(state_directory, exist_ok=True)
+    path = os.path.join(state_directory, SUMMARY_FILE)
+    summary = load_run_summary(path) or new_run_summary()
+    summary = extend_run_summary(summary, time, values)
+    save_run_summary(path, summary)
+    if new_state:
+        add_state(directory, state_directory, max_size)
+    return summary
+
+
+if __name__ == '__main__':
+    import argparse
+    from datetime import datetime
+
+    from nomad_test_parser.parsers.file_reading import read_jv_buffer
+    from nomad_test_parser.parsers.header_index import HeaderIndex, read_header
+
+    arg_parser = argparse.ArgumentParser(
+        description='Summarize the JV scans of every device and channel of a run '
+        'directory.'
+    )
+    arg_parser.add_argument('directory')
+    args = arg_parser.parse_args()
+
+    index = HeaderIndex()
+    index.scan(args.directory)
+    for (device, channel), files in index.groups().items():
+        scans = []
+        for test, path in files:
+            if test != 'JV':
+                continue
+            header = read_header(path)
+            timestamp = datetime.strptime(
+                f'{header["Date"]} {header["Time"]}', '%Y-%m-%d %H:%M:%S'
+            )
+            with open(path, 'rb') as f:
+                jv_dict, _ = read_jv_buffer(f.read())
+            scans.append((timestamp, jv_dict))
+        if not scans:
+            continue
+        start = min(timestamp for timestamp, _ in scans)
+        summary = get_run_summary(
+            *stack_jv_scans(
+                ((timestamp - start).total_seconds() / 3600, jv_dict)
+                for timestamp, jv_dict in scans
+            )
+        )
+        trends = ', '.join(
+            f'{direction} {trend:+.3f} %/h'
+            for direction, trend in zip(DIRECTIONS, summary['trend'][:, EFFICIENCY])
+        )
+        print(
+            f'{device} {channel or "-"}: {len(scans)} scans, '
+            f'mean hysteresis index {np.nanmean(summary["hysteresis_index"]):.3f}, '
+            f'efficiency trend {trends}'
+        )
+    index.close()
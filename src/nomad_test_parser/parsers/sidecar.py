@@ -0,0 +1,238 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Binary side-car for the arrays of serialized archives.
+
+Written as JSON, float arrays take about three times their binary size and
+are slow to load. `write_archive` moves the large numeric arrays of an
+archive dict into a chunked and compressed HDF5 file next to the
+`<file>.archive.json` and leaves a `{"m_sidecar": "<file>.h5#<dataset>"}`
+reference in their place. `read_archive` puts `SidecarArray`s in place of
+the references, which only read their dataset on first access.
+
+With `encode`, the float arrays are stored with `array_encoding`, as scaled
+int32, as float32 or as the start, step and count of a regular axis, and
+identical arrays, e.g. a voltage axis shared by many curves, are stored once.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from nomad_test_parser.parsers.array_encoding import decode_array, encode_array
+
+SIDECAR_KEY = 'm_sidecar'
+# arrays with fewer elements stay inline in the JSON
+SIDECAR_MIN_SIZE = 256
+# chunking and compression of the side-car datasets
+SIDECAR_CHUNK_ROWS = 65536
+SIDECAR_COMPRESSION = 'gzip'
+
+
+def to_array(value):
+    """
+    Returns the numeric (nested) list `value` as int or float array, or None
+    if it is not one, e.g. because it holds None or strings.
+    """
+    if not value or isinstance(value[0], (bool, str, dict)):
+        return None
+    try:
+        array = np.asarray(value)
+    except (TypeError, ValueError):
+        return None
+    return array if array.ndim > 0 and array.dtype.kind in 'iuf' else None
+
+
+def split_arrays(value, arrays, sidecar_name, min_size, path=''):
+    """
+    Replaces the numeric arrays with at least `min_size` elements in the
+    archive dict `value` by references into the side-car `sidecar_name` and
+    collects them in `arrays` by their dataset path.
+    """
+    if isinstance(value, dict):
+        return {
+            key: split_arrays(
+                item,
+                arrays,
+                sidecar_name,
+                min_size,
+                f'{path}/{key.replace("/", "%2F")}',
+            )
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        array = to_array(value)
+        if array is not None and array.size >= min_size:
+            arrays[path] = array
+            return {SIDECAR_KEY: f'{sidecar_name}#{path}'}
+        return [
+            split_arrays(item, arrays, sidecar_name, min_size, f'{path}/{index}')
+            for index, item in enumerate(value)
+        ]
+    return value
+
+
+def write_dataset(f, dataset, array, decimals=None):
+    """
+    Writes `array` encoded with `encode_array` into the `dataset` of the
+    open HDF5 file `f`, the encoding in its attributes.
+    """
+    encoded = encode_array(array, decimals)
+    values = encoded.pop('values', np.empty(0, dtype=np.int32))
+    if len(values):
+        h5_dataset = f.create_dataset(
+            dataset,
+            data=values,
+            chunks=(min(len(values), SIDECAR_CHUNK_ROWS), *values.shape[1:]),
+            compression=SIDECAR_COMPRESSION,
+        )
+    else:
+        h5_dataset = f.create_dataset(dataset, data=values)
+    h5_dataset.attrs.update(encoded)
+
+
+def write_archive(
+    archive_dict, path, min_size=SIDECAR_MIN_SIZE, encode=False, decimals=None
+):
+    """
+    Writes `archive_dict` as JSON to `path`, with the arrays of `min_size` or
+    more elements in the HDF5 side-car `<path without .json>.h5`, in chunks
+    of `SIDECAR_CHUNK_ROWS` rows compressed with `SIDECAR_COMPRESSION`.
+
+    With `encode`, the float arrays are encoded with `encode_array`, exactly
+    unless `decimals` maps their quantity name (e.g. `current_density`) to
+    the number of decimals they are rounded to, and identical arrays are
+    stored once, as hard links to the first one.
+    """
+    sidecar_path = f'{os.path.splitext(path)[0]}.h5'
+    arrays = {}
+    content = split_arrays(
+        archive_dict, arrays, os.path.basename(sidecar_path), min_size
+    )
+
+    if arrays:
+        import h5py
+
+        written = {}
+        with h5py.File(sidecar_path, 'w') as f:
+            for dataset, array in arrays.items():
+                if not encode or array.dtype.kind != 'f':
+                    f.create_dataset(
+                        dataset,
+                        data=array,
+                        chunks=(
+                            min(len(array), SIDECAR_CHUNK_ROWS),
+                            *array.shape[1:],
+                        ),
+                        compression=SIDECAR_COMPRESSION,
+                    )
+                    continue
+
+                name = dataset.rsplit('/', 1)[-1]
+                key = (
+                    name if decimals and name in decimals else None,
+                    array.shape,
+                    hashlib.sha256(array.tobytes()).hexdigest(),
+                )
+                if key in written:
+                    f[dataset] = f[written[key]]
+                    continue
+                written[key] = dataset
+                write_dataset(
+                    f,
+                    dataset,
+                    array,
+                    decimals.get(name) if decimals else None,
+                )
+    elif os.path.exists(sidecar_path):
+        os.remove(sidecar_path)
+
+    with open(path, 'w') as f:
+        json.dump(content, f)
+
+
+def read_dataset(h5_dataset):
+    """
+    Returns the array of a dataset, decoded if it was written encoded.
+    """
+    if 'encoding' not in h5_dataset.attrs:
+        return h5_dataset[()]
+    return decode_array(dict(h5_dataset.attrs, values=h5_dataset[()]))
+
+
+def resolve_references(value, resolve):
+    if isinstance(value, dict):
+        if SIDECAR_KEY in value:
+            return resolve(value[SIDECAR_KEY])
+        return {key: resolve_references(item, resolve) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(item, resolve) for item in value]
+    return value
+
+
+class SidecarArray:
+    """
+    An array in a side-car file that is read on first access.
+    """
+
+    def __init__(self, path, dataset):
+        self.path = path
+        self.dataset = dataset
+        self._value = None
+
+    @property
+    def value(self):
+        if self._value is None:
+            import h5py
+
+            with h5py.File(self.path, 'r') as f:
+                self._value = read_dataset(f[self.dataset])
+        return self._value
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.value, dtype=dtype)
+
+    def __len__(self):
+        return len(self.value)
+
+    def __getitem__(self, index):
+        return self.value[index]
+
+    def tolist(self):
+        return self.value.tolist()
+
+
+def read_archive(path, lazy=True):
+    """
+    Reads an archive written by `write_archive`. The side-car arrays are
+    `SidecarArray`s, or read right away without `lazy`.
+    """
+    with open(path) as f:
+        content = json.load(f)
+
+    directory = os.path.dirname(path)
+
+    def resolve(reference):
+        file_name, dataset = reference.split('#', 1)
+        array = SidecarArray(os.path.join(directory, file_name), dataset)
+        return array if lazy else array.value
+
+    return resolve_references(content, resolve)
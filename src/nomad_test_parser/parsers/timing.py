@@ -0,0 +1,115 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Timing of the stages of parsing and normalizing a raw file.
+
+The readers and normalizers wrap their stages in `timed(stage)`, with one of
+`STAGES`. While timing is enabled, the durations are summed per stage for the
+entry being processed, and `log_timings` emits them as one structured log
+event at the end of the entry. `TIMING_STATS` counts the calls and the total
+time of every stage over the life of the process; the event carries them,
+with the mean duration, as `process_timings` (see `get_metrics`).
+
+The parsers and normalizers call `start_timing` when they start an entry,
+with the `timing` option of their own entry point. Timing is disabled by
+default; `timed` then returns a shared no-op context manager.
+"""
+
+from contextlib import nullcontext
+from time import perf_counter
+
+STAGES = ['open', 'encoding', 'header', 'data', 'archive', 'figures', 'serialize']
+
+TIMING = {'enabled': False}
+# stage -> {'count': calls, 'seconds': total time} over the life of the process
+TIMING_STATS = {}
+# stage -> seconds of the entry being processed
+ENTRY_TIMINGS = {}
+
+NULL_TIMER = nullcontext()
+
+
+class StageTimer:
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = perf_counter() - self.start
+        ENTRY_TIMINGS[self.stage] = ENTRY_TIMINGS.get(self.stage, 0.0) + elapsed
+        stats = TIMING_STATS.setdefault(self.stage, {'count': 0, 'seconds': 0.0})
+        stats['count'] += 1
+        stats['seconds'] += elapsed
+        return False
+
+
+def start_timing(enabled):
+    """
+    Starts timing a new entry if `enabled`, and drops the stages timed so far.
+    """
+    TIMING['enabled'] = enabled
+    ENTRY_TIMINGS.clear()
+
+
+def timed(stage):
+    """
+    Returns a context manager that adds its duration to `stage`, or a no-op
+    one if timing is disabled.
+    """
+    if not TIMING['enabled']:
+        return NULL_TIMER
+    return StageTimer(stage)
+
+
+def log_timings(logger, event, **fields):
+    """
+    Logs the stage durations of the current entry and the `get_metrics` of
+    the process with `logger.info(event)` and starts a new entry. Does
+    nothing if timing is disabled or no stage was timed.
+    """
+    if not TIMING['enabled'] or not ENTRY_TIMINGS:
+        return
+    timings = {
+        f'{stage}_seconds': round(seconds, 6)
+        for stage, seconds in ENTRY_TIMINGS.items()
+    }
+    total = sum(ENTRY_TIMINGS.values())
+    ENTRY_TIMINGS.clear()
+    logger.info(
+        event,
+        total_seconds=round(total, 6),
+        process_timings=get_metrics(),
+        **timings,
+        **fields,
+    )
+
+
+def get_metrics():
+    """
+    Returns a copy of `TIMING_STATS` with the mean duration of every stage.
+    """
+    return {
+        stage: dict(stats, mean_seconds=stats['seconds'] / stats['count'])
+        for stage, stats in TIMING_STATS.items()
+    }
@@ -0,0 +1,299 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+The parsers of the UNITOV files, loaded by the entry points.
+
+Every worker that loads the plugin entry points imports this module, also
+workers that never see a UNITOV file. It therefore only depends on NOMAD's
+parser base class; the sections in `nomad_test_parser.parsers.parser`, with
+`baseclasses` and the archive builders behind them, are imported on the
+first call of `parse`.
+"""
+
+import datetime
+import os
+from typing import (
+    TYPE_CHECKING,
+)
+
+if TYPE_CHECKING:
+    from nomad.datamodel.datamodel import EntryArchive
+    from structlog.stdlib import (
+        BoundLogger,
+    )
+
+from nomad.config import config
+from nomad.parsing.parser import MatchingParser
+
+from nomad_test_parser.parsers.child_archive import write_child_archive
+from nomad_test_parser.parsers.matching import get_file_kind, get_kind_from_name
+from nomad_test_parser.parsers.timing import log_timings, start_timing
+
+configuration = config.get_plugin_entry_point(
+    'nomad_test_parser.parsers:parser_entry_point'
+)
+# directory -> (device, channel) of the parameters files seen in it
+PARAMETERS_GROUPS = {}
+
+
+class UNITOVParser(MatchingParser):
+    """
+    Matches the files of its `file_kind` by name and by the `Test` line of
+    their header, see `nomad_test_parser.parsers.matching`.
+    """
+
+    file_kind = None
+    # the id of the entry point whose options the parser reads
+    entry_point = None
+
+    def start_timing(self):
+        """
+        Starts timing the entry with the `timing` option of the entry point.
+        """
+        start_timing(config.get_plugin_entry_point(self.entry_point).timing)
+
+    def is_mainfile(
+        self,
+        filename: str,
+        mime: str,
+        buffer: bytes,
+        decoded_buffer: str,
+        compression: str = None,
+    ) -> bool:
+        return get_file_kind(filename, buffer) == self.file_kind
+
+
+class EQEParser(UNITOVParser):
+    file_kind = 'IPCE'
+    entry_point = 'nomad_test_parser.parsers:parser_eqe_entry_point'
+
+    def parse(
+        self,
+        mainfile: str,
+        archive: 'EntryArchive',
+        logger: 'BoundLogger',
+        child_archives: dict[str, 'EntryArchive'] = None,
+    ) -> None:
+        self.start_timing()
+        logger.info('EQEParser.parse', parameter=configuration.parameter)
+
+        # 1. Create an instance of your custom section
+        #entry = UNITOV_JVmeasurement()
+
+        basename = os.path.basename(mainfile)
+        file_name = f'{basename}.archive.json'
+        from nomad_test_parser.parsers.parser import UNITOV_EQEmeasurement
+
+        archive.data = UNITOV_EQEmeasurement()
+        archive.data.message = 'This is a test EQE measurement parsing.'
+        archive.data.datetime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+        archive.data.data_file = basename
+        write_child_archive(archive.data, archive, file_name)
+        log_timings(logger, 'EQEParser.parse timing', mainfile=mainfile)
+
+class MPPTParser(UNITOVParser):
+    file_kind = 'Tracking'
+    entry_point = 'nomad_test_parser.parsers:parser_mppt_entry_point'
+
+    def parse(
+        self,
+        mainfile: str,
+        archive: 'EntryArchive',
+        logger: 'BoundLogger',
+        child_archives: dict[str, 'EntryArchive'] = None,
+    ) -> None:
+        self.start_timing()
+        logger.info('MPPTParser.parse', parameter=configuration.parameter)
+
+        # 1. Create an instance of your custom section
+        #entry = UNITOV_JVmeasurement()
+
+        file_name = f'{os.path.basename(mainfile)}.archive.json'
+
+        from nomad_test_parser.parsers.parser import UNITOV_MPPTracking_Measurement
+
+        archive.data = UNITOV_MPPTracking_Measurement()
+        archive.data.message = 'This is a test MPPT measurement parsing.'
+        archive.data.datetime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+        archive.data.data_file = os.path.basename(mainfile)
+        write_child_archive(archive.data, archive, file_name)
+        log_timings(logger, 'MPPTParser.parse timing', mainfile=mainfile)
+
+
+class JVParser(UNITOVParser):
+    file_kind = 'JV'
+    entry_point = 'nomad_test_parser.parsers:parser_entry_point'
+
+    def is_mainfile(
+        self,
+        filename: str,
+        mime: str,
+        buffer: bytes,
+        decoded_buffer: str,
+        compression: str = None,
+    ) -> bool:
+        # the scans are stored in the run entry of the parameters file
+        # instead, the runs without parameters file keep their JV entries
+        if configuration.aggregate_jv_scans and has_parameters_file(filename):
+            return False
+        return super().is_mainfile(filename, mime, buffer, decoded_buffer, compression)
+
+    def parse(
+        self,
+        mainfile: str,
+        archive: 'EntryArchive',
+        logger: 'BoundLogger',
+        child_archives: dict[str, 'EntryArchive'] = None,
+    ) -> None:
+        self.start_timing()
+        logger.info('NewParser.parse', parameter=configuration.parameter)
+
+        # 1. Create an instance of your custom section
+        #entry = UNITOV_JVmeasurement()
+
+        # 2. Populate the section with some data
+        #    (In a real parser, this data would come from parsing the 'mainfile')
+
+        #archive.metadata.entry_name = os.path.basename(mainfile)
+
+        #mainfile_split = mainfile.split('.');
+
+        #if not mainfile_split[-1] in ["nk"]:
+        #    search_id = mainfile_split[0]
+        #    set_sample_reference(archive, entry, search_id)
+
+        #    entry.name = f"{search_id} {notes}"
+        #    entry.description = f"Notes from file name: {notes}"
+
+        #if not measurment_type in ["uvvis", "sem", "SEM"]:
+        #    entry.data_file = os.path.basename(mainfile)
+
+
+
+        file_name = f'{os.path.basename(mainfile)}.archive.json'
+        #eid = get_entry_id_from_file_name(file_name, archive)
+
+        #archive.data = UNITOV_JVmeasurement(
+        #    processed_archive=get_reference(archive.metadata.upload_id, eid)
+        #)
+        from nomad_test_parser.parsers.parser import UNITOV_JVmeasurement
+
+        archive.data = UNITOV_JVmeasurement()
+        basename = os.path.basename(mainfile)
+        archive.data.message = 'This is a test JV measurement parsing.'
+        archive.data.datetime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+        archive.data.data_file = basename
+        write_child_archive(archive.data, archive, file_name)
+        log_timings(logger, 'JVParser.parse timing', mainfile=mainfile)
+
+
+        # 3. Assign your custom section to archive.data
+        #    archive.data is the typical place for the primary data extracted by
+        #    the parser.
+        #archive.data = my_simple_output_data
+
+
+class ParametersParser(UNITOVParser):
+    file_kind = 'Parameters'
+    entry_point = 'nomad_test_parser.parsers:parser_parameters_entry_point'
+
+    def parse(
+        self,
+        mainfile: str,
+        archive: 'EntryArchive',
+        logger: 'BoundLogger',
+        child_archives: dict[str, 'EntryArchive'] = None,
+    ) -> None:
+        self.start_timing()
+        logger.info('ParametersParser.parse', parameter=configuration.parameter)
+
+        from nomad_test_parser.parsers.parser import UNITOV_StabilityParameters
+
+        basename = os.path.basename(mainfile)
+        archive.data = UNITOV_StabilityParameters()
+        archive.data.datetime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+        archive.data.data_file = basename
+        write_child_archive(archive.data, archive, f'{basename}.archive.json')
+
+        if configuration.aggregate_jv_scans:
+            # the parameters file is rewritten after every scan; the JV files
+            # in the child change its content hash, so the run entry is
+            # written and normalized anew with every new JV file
+            from nomad_test_parser.parsers.parser import UNITOV_JVRun
+
+            run = UNITOV_JVRun()
+            run.datetime = archive.data.datetime
+            run.data_file = basename
+            run.data_files = list_run_jv_files(archive, basename)
+            write_child_archive(run, archive, get_run_archive_name(basename))
+        log_timings(logger, 'ParametersParser.parse timing', mainfile=mainfile)
+
+
+def get_run_archive_name(parameters_file):
+    """
+    Returns the name of the child archive of the JV run entry of the
+    parameters file `parameters_file`.
+    """
+    return f'{parameters_file.removesuffix("_Parameters.txt")}_JVRun.archive.json'
+
+
+def has_parameters_file(path):
+    """
+    Returns whether the directory of the run file `path` holds the parameters
+    file of its device and channel. The directory is only listed again for
+    the runs it held no parameters file of.
+    """
+    from nomad_test_parser.parsers.batch import parse_file_name
+
+    run = parse_file_name(os.path.basename(path))
+    if run is None:
+        return False
+    group = (run['device'], run['channel'])
+    directory = os.path.dirname(path)
+    if group not in PARAMETERS_GROUPS.get(directory, ()):
+        try:
+            names = os.listdir(directory or '.')
+        except OSError:
+            names = []
+        infos = [parse_file_name(name) for name in names]
+        PARAMETERS_GROUPS[directory] = {
+            (info['device'], info['channel'])
+            for info in infos
+            if info is not None and info['kind'] == 'Parameters'
+        }
+    return group in PARAMETERS_GROUPS[directory]
+
+
+def list_run_jv_files(archive, data_file):
+    """
+    Returns the JV files of the device and channel of the run file
+    `data_file`, in run order.
+    """
+    from nomad_test_parser.parsers.batch import group_run_files, parse_file_name
+    from nomad_test_parser.parsers.prefetch import list_mainfiles
+
+    run = parse_file_name(os.path.basename(data_file))
+    if run is None:
+        return []
+    groups = group_run_files(list_mainfiles(archive, data_file))
+    return [
+        path
+        for path in groups.get((run['device'], run['channel']), [])
+        if get_kind_from_name(path) == 'JV'
+    ]
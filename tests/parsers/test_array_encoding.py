@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+import pytest
+
+from nomad_test_parser.parsers.array_encoding import (
+    decode_array,
+    encode_array,
+    get_decimals,
+)
+from nomad_test_parser.parsers.file_reading import read_jv_buffer, read_mppt_buffer
+
+DATA_DIR = os.path.join('tests', 'data')
+TRACKING_FILE = '000_2023_10_19_18.33.10_1A_3C_C1_1_Tracking.txt'
+JV_FILE = '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt'
+# the tracking columns are written with up to 6 decimals
+TRACKING_DECIMALS = 6
+
+
+def read_tracking_columns():
+    with open(os.path.join(DATA_DIR, TRACKING_FILE), 'rb') as f:
+        mppt_dict, _ = read_mppt_buffer(f.read())
+    return [
+        mppt_dict[key]
+        for key in ['time_data', 'voltage_data', 'current_density_data', 'power_data']
+    ]
+
+
+def test_tracking_columns():
+    for column in read_tracking_columns():
+        encoded = encode_array(column)
+        assert encoded['encoding'] in ('scaled', 'range')
+        assert get_decimals(column) <= TRACKING_DECIMALS
+        assert np.array_equal(decode_array(encoded), column)
+
+
+@pytest.mark.parametrize(
+    'values, encoding',
+    [
+        (np.arange(300, 1101, 5) / 1.0, 'range'),
+        (np.round(np.arange(-0.2, 1.2, 0.01), 2), 'range'),
+        (np.array([0.5, 0.25, -1.125, 7.0]), 'scaled'),
+        (np.array([0.5, 2.0**-40, np.nan]), 'float32'),
+        (np.array([np.pi, 2.0, np.inf]), 'float64'),
+        (np.array([[0.1, 0.2], [0.3, 0.4]]), 'scaled'),
+    ],
+)
+def test_encode_array(values, encoding):
+    encoded = encode_array(values)
+    assert encoded['encoding'] == encoding
+    decoded = decode_array(encoded)
+    assert decoded.shape == values.shape
+    assert np.array_equal(decoded, values, equal_nan=True)
+
+
+def test_encode_array_decimals():
+    with open(os.path.join(DATA_DIR, JV_FILE), 'rb') as f:
+        jv_dict, _ = read_jv_buffer(f.read())
+    current_density = np.asarray(jv_dict['jv_curve'][0]['current_density'])
+    current_density = current_density[np.isfinite(current_density)]
+
+    encoded = encode_array(current_density, decimals=4)
+    assert encoded['encoding'] == 'scaled'
+    assert encoded['values'].dtype == np.int32
+    error = np.abs(decode_array(encoded) - current_density)
+    assert error.max() <= 0.5e-4 + 1e-12
+
+    # no rounding of values that do not fit
+    encoded = encode_array(np.array([1e6, 2.5, np.nan]), decimals=4)
+    assert encoded['encoding'] == 'float32'
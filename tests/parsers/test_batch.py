@@ -0,0 +1,185 @@
+import json
+import os
+import shutil
+
+import numpy as np
+from baseclasses.helper.archive_builder import mpp_hysprint_archive
+from nomad import utils
+from nomad.datamodel import EntryArchive, EntryMetadata
+
+from nomad_test_parser.parsers import parser as sections
+from nomad_test_parser.parsers import unitov
+from nomad_test_parser.parsers.batch import (
+    DirectoryContext,
+    group_run_files,
+    parse_file_name,
+    parse_run_directory,
+)
+from nomad_test_parser.parsers.file_reading import read_mppt_buffer
+from nomad_test_parser.parsers.parser import (
+    UNITOV_JVRun,
+    UNITOV_MPPTracking_Measurement,
+)
+
+DATA_DIR = os.path.join('tests', 'data')
+
+
+def test_parse_file_name():
+    info = parse_file_name('001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt')
+    assert info == dict(
+        index=1,
+        timestamp='2023_10_19_18.33.25',
+        channel='1A',
+        device='3C_C1_1',
+        kind='JV',
+    )
+
+    info = parse_file_name('2024-01-25_18.05.03_IPCE_Hafez-H7-PTAA_T_23C.txt')
+    assert info['kind'] == 'IPCE'
+    assert info['device'] == 'Hafez-H7-PTAA_T_23C'
+    assert info['channel'] is None
+
+    assert parse_file_name('example.out') is None
+
+
+def test_group_run_files():
+    groups = group_run_files(sorted(os.listdir(DATA_DIR), reverse=True))
+
+    assert set(groups) == {('3C_C1_1', '1A'), ('Hafez-H7-PTAA_T_23C', None)}
+    assert [parse_file_name(name)['index'] for name in groups[('3C_C1_1', '1A')]] == [
+        0,
+        0,
+        1,
+        2,
+        3,
+    ]
+
+
+def test_parse_run_directory(tmp_path):
+    groups = parse_run_directory(DATA_DIR, max_workers=2, output=str(tmp_path))
+
+    files = dict(groups[('3C_C1_1', '1A')])
+    jv_file = '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt'
+    assert files[jv_file]['data']['data_file'] == jv_file
+    assert os.path.exists(tmp_path / f'{jv_file}.archive.json')
+
+
+def test_jv_run_entry():
+    parameters_file = '000_2023_10_19_18.33.10_1A_3C_C1_1_Parameters.txt'
+    archive = EntryArchive(
+        m_context=DirectoryContext(DATA_DIR),
+        metadata=EntryMetadata(mainfile=parameters_file),
+    )
+    archive.data = UNITOV_JVRun(data_file=parameters_file)
+    archive.data.normalize(archive, utils.get_logger(__name__))
+
+    run = archive.data
+    assert list(run.data_files) == [
+        '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt',
+        '002_2023_10_19_18.33.51_1A_3C_C1_1_JV.txt',
+        '003_2023_10_19_18.34.18_1A_3C_C1_1_JV.txt',
+    ]
+    assert len(run.scan_time) == len(run.data_files)
+    assert list(run.curve_scan) == [0, 0, 1, 1, 2, 2]
+    assert run.curve_offsets[-1] == len(run.voltage) == len(run.current_density)
+
+
+def test_jv_run_entry_incremental(tmp_path, monkeypatch):
+    monkeypatch.setattr(sections.configuration, 'incremental_directory', str(tmp_path))
+    parameters_file = '000_2023_10_19_18.33.10_1A_3C_C1_1_Parameters.txt'
+    runs = []
+    for _ in range(2):
+        archive = EntryArchive(
+            m_context=DirectoryContext(DATA_DIR),
+            metadata=EntryMetadata(mainfile=parameters_file),
+        )
+        archive.data = UNITOV_JVRun(data_file=parameters_file)
+        archive.data.normalize(archive, utils.get_logger(__name__))
+        runs.append(archive.data)
+
+    # the second normalization takes the stored scans
+    for run in runs:
+        assert len(run.data_files) == len(run.scan_time)
+        assert list(run.curve_scan) == [0, 0, 1, 1, 2, 2]
+    assert np.array_equal(runs[0].voltage, runs[1].voltage)
+    assert runs[0].active_area == runs[1].active_area
+
+
+def test_jv_run_entry_new_scan(tmp_path, monkeypatch):
+    logger = utils.get_logger(__name__)
+
+    class Context(DirectoryContext):
+        # normalizes the updated child archives like the processing would
+        def __init__(self, directory):
+            super().__init__(directory)
+            self.runs = []
+
+        def process_updated_raw_file(self, path, allow_modify=False):
+            if not path.endswith('_JVRun.archive.json'):
+                return
+            with self.raw_file(path) as f:
+                run = UNITOV_JVRun.m_from_dict(json.load(f)['data'])
+            child = EntryArchive(m_context=self, metadata=EntryMetadata(mainfile=path))
+            child.data = run
+            run.normalize(child, logger)
+            self.runs.append(run)
+
+    monkeypatch.setattr(unitov.configuration, 'aggregate_jv_scans', True)
+    parameters_file = '000_2023_10_19_18.33.10_1A_3C_C1_1_Parameters.txt'
+    jv_files = [
+        '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt',
+        '002_2023_10_19_18.33.51_1A_3C_C1_1_JV.txt',
+    ]
+    for file_name in [parameters_file, jv_files[0]]:
+        shutil.copy(os.path.join(DATA_DIR, file_name), tmp_path)
+
+    context = Context(str(tmp_path))
+
+    def parse():
+        archive = EntryArchive(
+            m_context=context, metadata=EntryMetadata(mainfile=parameters_file)
+        )
+        unitov.ParametersParser().parse(
+            str(tmp_path / parameters_file), archive, logger
+        )
+
+    parse()
+    assert list(context.runs[-1].curve_scan) == [0, 0]
+
+    # reparsing the same run does not update its entry
+    parse()
+    assert [list(run.data_files) for run in context.runs] == [jv_files[:1]]
+
+    shutil.copy(os.path.join(DATA_DIR, jv_files[1]), tmp_path)
+    parse()
+    assert [list(run.data_files) for run in context.runs] == [jv_files[:1], jv_files]
+    assert list(context.runs[-1].curve_scan) == [0, 0, 1, 1]
+
+
+def test_mppt_entry(monkeypatch):
+    mppt_dicts = []
+    get_samples = mpp_hysprint_archive.get_mpp_hysprint_samples
+
+    def get_mpp_hysprint_samples(section, mppt_dict):
+        mppt_dicts.append(mppt_dict)
+        return get_samples(section, mppt_dict)
+
+    monkeypatch.setattr(
+        mpp_hysprint_archive, 'get_mpp_hysprint_samples', get_mpp_hysprint_samples
+    )
+    tracking_file = '000_2023_10_19_18.33.10_1A_3C_C1_1_Tracking.txt'
+    archive = EntryArchive(
+        m_context=DirectoryContext(DATA_DIR),
+        metadata=EntryMetadata(mainfile=tracking_file),
+    )
+    archive.data = UNITOV_MPPTracking_Measurement(
+        data_file=tracking_file, load_data_from_file=True
+    )
+    archive.data.normalize(archive, utils.get_logger(__name__))
+
+    with open(os.path.join(DATA_DIR, tracking_file), 'rb') as f:
+        expected, _ = read_mppt_buffer(f.read())
+    [mppt_dict] = mppt_dicts
+    for key in ['time_data', 'voltage_data', 'current_density_data', 'power_data']:
+        assert list(mppt_dict[key]) == list(expected[key])
+    assert not archive.data.load_data_from_file
@@ -0,0 +1,89 @@
+import json
+import os
+
+from nomad_test_parser.parsers import child_archive
+from nomad_test_parser.parsers.child_archive import write_child_archive
+
+
+class Context:
+    def __init__(self, directory):
+        self.directory = directory
+        self.processed = []
+
+    def raw_file(self, path, *args, **kwargs):
+        return open(os.path.join(self.directory, path), *args, **kwargs)
+
+    def raw_path_exists(self, path):
+        return os.path.exists(os.path.join(self.directory, path))
+
+    def process_updated_raw_file(self, path, allow_modify=False):
+        self.processed.append(path)
+
+
+class Archive:
+    def __init__(self, directory):
+        self.m_context = Context(directory)
+
+
+class Section:
+    def __init__(self, **quantities):
+        self.quantities = quantities
+        self.serialized = 0
+
+    def m_to_dict(self, with_root_def=False):
+        self.serialized += 1
+        return dict(m_def='UNITOV_JVmeasurement', **self.quantities)
+
+
+def test_write_child_archive(tmp_path):
+    archive = Archive(str(tmp_path))
+    file_name = 'scan_JV.txt.archive.json'
+
+    section = Section(data_file='scan_JV.txt', datetime='2024-01-01 10:00:00.0')
+    assert write_child_archive(section, archive, file_name)
+    assert section.serialized == 1
+    with open(tmp_path / file_name) as f:
+        assert json.load(f)['data']['data_file'] == 'scan_JV.txt'
+
+    # reprocessing only changes the parse time
+    section = Section(data_file='scan_JV.txt', datetime='2024-01-02 10:00:00.0')
+    assert not write_child_archive(section, archive, file_name)
+    assert section.serialized == 1
+    with open(tmp_path / file_name) as f:
+        assert json.load(f)['data']['datetime'] == '2024-01-01 10:00:00.0'
+
+    section = Section(data_file='other_JV.txt', datetime='2024-01-02 10:00:00.0')
+    assert write_child_archive(section, archive, file_name)
+    assert archive.m_context.processed == [file_name, file_name]
+
+
+def test_write_child_archive_corrupt(tmp_path):
+    archive = Archive(str(tmp_path))
+    file_name = 'scan_JV.txt.archive.json'
+    (tmp_path / file_name).write_text('{"data": ')
+
+    assert write_child_archive(Section(data_file='scan_JV.txt'), archive, file_name)
+    with open(tmp_path / file_name) as f:
+        assert json.load(f)['data']['data_file'] == 'scan_JV.txt'
+
+
+def test_write_child_archive_encodes_once(tmp_path, monkeypatch):
+    archive = Archive(str(tmp_path))
+    file_name = 'scan_JV.txt.archive.json'
+    encoded = []
+    dumps = json.dumps
+
+    def count_dumps(value, **kwargs):
+        encoded.append(value)
+        return dumps(value, **kwargs)
+
+    monkeypatch.setattr(child_archive.json, 'dumps', count_dumps)
+    section = Section(data_file='scan_JV.txt', datetime='2024-01-01 10:00:00.0')
+    assert write_child_archive(section, archive, file_name)
+
+    # the content once, the volatile quantities on their own
+    assert [value.get('data_file') for value in encoded] == ['scan_JV.txt', None]
+    with open(tmp_path / file_name) as f:
+        assert json.load(f) == {
+            'data': dict(m_def='UNITOV_JVmeasurement', **section.quantities)
+        }
@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pytest
+
+from nomad_test_parser.parsers.eqe_analysis import (
+    get_eqe_dicts_parameters,
+    get_eqe_parameters,
+    interpolate_spectra,
+    stack_spectra,
+)
+from nomad_test_parser.parsers.file_reading import read_eqe_buffer
+
+DATA_FILE = os.path.join(
+    'tests', 'data', '2024-01-25_18.05.03_IPCE_Hafez-H7-PTAA_T_23C.txt'
+)
+
+
+def read_eqe_dict():
+    with open(DATA_FILE, 'rb') as f:
+        eqe_dict, _ = read_eqe_buffer(f.read(), header_lines=24)
+    return eqe_dict
+
+
+def test_get_eqe_parameters():
+    eqe_dict = read_eqe_dict()
+    parameters = get_eqe_parameters(eqe_dict['photon_energy_raw'], eqe_dict['eqe_raw'])
+
+    # same grid and values as `interpolate_eqe`
+    assert np.allclose(parameters['photon_energy'], eqe_dict['photon_energy'])
+    assert np.allclose(parameters['eqe'], eqe_dict['intensity'])
+    # last value of the `J integrated (mA/cm2)` column of the instrument
+    assert parameters['integrated_jsc'] == pytest.approx(21.0134, rel=0.03)
+    # eV, a perovskite absorber
+    assert parameters['bandgap'] == pytest.approx(1.6, abs=0.1)
+
+
+def test_batch_matches_single_spectra():
+    eqe_dict = read_eqe_dict()
+    photon_energy, eqe = eqe_dict['photon_energy_raw'], eqe_dict['eqe_raw']
+    spectra = [
+        (photon_energy[index:] + 0.01 * index, eqe[index:] * (1 - 0.01 * index))
+        for index in range(10)
+    ]
+    batch = get_eqe_parameters(*stack_spectra(spectra))
+
+    grid = batch['photon_energy']
+    assert batch['eqe'].shape == (10, len(grid))
+    for index, (x, y) in enumerate(spectra):
+        single = get_eqe_parameters(x, y)
+        assert batch['integrated_jsc'][index] == pytest.approx(single['integrated_jsc'])
+        assert batch['bandgap'][index] == pytest.approx(single['bandgap'])
+
+        inside = (grid >= x.min()) & (grid <= x.max())
+        assert np.allclose(batch['eqe'][index, inside], np.interp(grid[inside], x, y))
+        assert np.isnan(batch['eqe'][index, ~inside]).all()
+
+    assert np.allclose(
+        get_eqe_dicts_parameters([eqe_dict, eqe_dict])['integrated_jsc'],
+        batch['integrated_jsc'][0],
+    )
+
+
+def test_interpolate_spectra_unsorted_and_empty():
+    x = np.array([[3.0, 1.0, 2.0], [np.nan, np.nan, np.nan]])
+    y = np.array([[0.3, 0.1, 0.2], [np.nan, np.nan, np.nan]])
+
+    result = interpolate_spectra(x, y, [0.5, 1.5, 2.5, 3.5], fill_value=0)
+
+    assert np.allclose(result, [[0, 0.15, 0.25, 0], [0, 0, 0, 0]])
+    parameters = get_eqe_parameters(x, y, n_points=5)
+    assert np.isnan(parameters['bandgap'][1])
+    assert parameters['integrated_jsc'][1] == 0
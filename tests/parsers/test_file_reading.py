@@ -0,0 +1,120 @@
+import io
+import os
+
+import numpy as np
+import pytest
+
+from nomad_test_parser.parsers import file_reading
+from nomad_test_parser.parsers.file_reading import (
+    read_file_eqe,
+    read_file_jv_data,
+    read_mppt_file,
+    read_mppt_file_chunked,
+    read_parameters_file,
+)
+
+DATA_DIR = os.path.join('tests', 'data')
+# cm^2, the active area in the headers of the UNITOV test files
+ACTIVE_AREA = 0.5
+# measured and interpolated points of the EQE test file
+EQE_POINTS = 60
+EQE_INTERPOLATED_POINTS = 1000
+
+
+def open_data_file(file_name, encoding='windows-1252'):
+    with open(os.path.join(DATA_DIR, file_name), 'rb') as f:
+        return io.StringIO(f.read().decode(encoding))
+
+
+@pytest.mark.parametrize(
+    'file_name, n_points, v_oc, j_sc',
+    [
+        ('001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt', 47, [0.788, 0.7941],
+         [17.2247, 17.3153]),
+        ('003_2023_10_19_18.34.18_1A_3C_C1_1_JV.txt', 48, [0.8282, 0.8331],
+         [17.4781, 17.3289]),
+    ],
+)
+def test_read_file_jv_data(file_name, n_points, v_oc, j_sc):
+    jv_dict, location = read_file_jv_data(open_data_file(file_name))
+
+    assert location == 'UNITOV'
+    assert jv_dict['active_area'] == ACTIVE_AREA
+    assert jv_dict['V_oc'] == v_oc
+    assert jv_dict['J_sc'] == j_sc
+    assert [curve['name'] for curve in jv_dict['jv_curve']] == ['Scan 1', 'Scan 3']
+    for curve in jv_dict['jv_curve']:
+        assert curve['voltage'].dtype == np.float64
+        assert len(curve['voltage']) == len(curve['current_density']) == n_points
+    # the RV scan starts where the FW scan ends
+    fw, rv = jv_dict['jv_curve']
+    assert rv['voltage'][0] == pytest.approx(np.nanmax(fw['voltage']), abs=1e-5)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 100000])
+def test_read_mppt_file_chunked(chunk_size):
+    file_name = '000_2023_10_19_18.33.10_1A_3C_C1_1_Tracking.txt'
+    mppt_dict, _ = read_mppt_file_chunked(
+        open_data_file(file_name), chunk_size=chunk_size
+    )
+
+    assert mppt_dict['total_time'] == 100 * 60
+    assert mppt_dict['step_size'] == pytest.approx(12)
+    assert {key: mppt_dict[key] for key in ['time_per_track', 'active_area']} == {
+        'time_per_track': 2,
+        'active_area': ACTIVE_AREA,
+    }
+
+    reference = np.loadtxt(os.path.join(DATA_DIR, file_name), skiprows=43)
+    assert mppt_dict['voltage_data'][0] == reference[0, 1]
+    for index, key in enumerate(
+        ['time_data', 'voltage_data', 'current_density_data', 'power_data']
+    ):
+        assert np.array_equal(mppt_dict[key], reference[:, index])
+
+
+def test_read_mppt_file():
+    file_name = '000_2023_10_19_18.33.10_1A_3C_C1_1_Tracking.txt'
+    mppt_dict, _ = read_mppt_file(open_data_file(file_name).read())
+
+    reference = np.loadtxt(os.path.join(DATA_DIR, file_name), skiprows=43)
+    assert mppt_dict['total_time'] == 100 * 60
+    assert np.array_equal(mppt_dict['power_data'], reference[:, 3])
+
+
+@pytest.mark.parametrize(
+    'separator, header_lines',
+    [('\t', 24), (',', 24), ('\t', 23)],
+)
+def test_read_file_eqe(separator, header_lines):
+    file_name = '2024-01-25_18.05.03_IPCE_Hafez-H7-PTAA_T_23C.txt'
+    content = open_data_file(file_name).read().replace('\t', separator)
+    file_reading.EQE_LAYOUT_CACHE.clear()
+
+    for _ in range(2):
+        eqe_dict, _ = read_file_eqe(io.StringIO(content), header_lines=header_lines)
+
+        assert len(eqe_dict['photon_energy_raw']) == EQE_POINTS
+        assert eqe_dict['eqe_raw'][0] == pytest.approx(9.75929e-4)
+        assert len(eqe_dict['photon_energy']) == EQE_INTERPOLATED_POINTS
+        assert np.all(np.diff(eqe_dict['photon_energy']) > 0)
+
+    assert list(file_reading.EQE_LAYOUT_CACHE.values()) == [(separator, 23)]
+
+
+def test_read_parameters_file():
+    file_name = '000_2023_10_19_18.33.10_1A_3C_C1_1_Parameters.txt'
+    parameters_dict, _ = read_parameters_file(open_data_file(file_name))
+
+    reference = np.loadtxt(os.path.join(DATA_DIR, file_name), skiprows=43)
+    assert parameters_dict['active_area'] == ACTIVE_AREA
+    assert np.array_equal(parameters_dict['time'], reference[:, 0])
+    assert list(parameters_dict['scans']) == ['FW', 'RV']
+
+    for offset, scan in zip([1, 10], parameters_dict['scans'].values()):
+        assert list(scan) == list(file_reading.PARAMETERS_COLUMNS)
+        for index, (quantity, values) in enumerate(scan.items()):
+            assert values.dtype == np.float64
+            assert values.flags['C_CONTIGUOUS']
+            factor = 100 if quantity == 'fill_factor' else 1
+            assert np.allclose(values * factor, reference[:, offset + index])
@@ -0,0 +1,96 @@
+import os
+import shutil
+
+import pytest
+
+from nomad_test_parser.parsers.header_index import HeaderIndex, read_header
+
+DATA_DIR = os.path.join('tests', 'data')
+
+
+@pytest.mark.parametrize(
+    'file_name, device, channel, test',
+    [
+        (
+            '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt',
+            '3C_C1_1',
+            '1A',
+            'Stability (JV)',
+        ),
+        (
+            '000_2023_10_19_18.33.10_1A_3C_C1_1_Tracking.txt',
+            '3C_C1_1',
+            '1A',
+            'Stability (Tracking)',
+        ),
+        (
+            '2024-01-25_18.05.03_IPCE_Hafez-H7-PTAA_T_23C.txt',
+            'MAURI-H7-PTAA',
+            None,
+            'IPCE',
+        ),
+    ],
+)
+def test_read_header(file_name, device, channel, test):
+    header = read_header(os.path.join(DATA_DIR, file_name))
+
+    assert header['Device'] == device
+    assert header.get('Channel') == channel
+    assert header['Test'] == test
+
+
+def test_read_header_bom(tmp_path):
+    file_name = '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt'
+    with open(os.path.join(DATA_DIR, file_name), 'rb') as f:
+        content = f.read().decode('windows-1252')
+    path = tmp_path / file_name
+    path.write_bytes(b'\xef\xbb\xbf' + content.encode())
+
+    header = read_header(str(path))
+    assert header == read_header(os.path.join(DATA_DIR, file_name))
+    assert header['Device'] == '3C_C1_1'
+
+
+def test_read_header_no_header():
+    assert read_header(os.path.join(DATA_DIR, 'example.out')) is None
+
+
+def test_header_index(tmp_path):
+    directory = str(tmp_path / 'upload')
+    os.makedirs(directory)
+    for file_name in os.listdir(DATA_DIR):
+        shutil.copy(os.path.join(DATA_DIR, file_name), directory)
+
+    index_path = str(tmp_path / 'index.sqlite')
+    index = HeaderIndex(index_path)
+    assert index.scan(directory) == len(os.listdir(DATA_DIR))
+
+    jv = os.path.join(directory, '002_2023_10_19_18.33.51_1A_3C_C1_1_JV.txt')
+    assert [os.path.basename(path) for path in index.siblings(jv, test='Tracking')] == [
+        '000_2023_10_19_18.33.10_1A_3C_C1_1_Tracking.txt'
+    ]
+    jv_files = [
+        '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt',
+        '002_2023_10_19_18.33.51_1A_3C_C1_1_JV.txt',
+        '003_2023_10_19_18.34.18_1A_3C_C1_1_JV.txt',
+    ]
+    assert sorted(os.path.basename(path) for path in index.siblings(jv)) == [
+        name for name in sorted(os.listdir(DATA_DIR)) if '_1A_3C_C1_1_' in name
+    ]
+    assert [
+        os.path.basename(path) for path in index.find('3C_C1_1', '1A', 'JV')
+    ] == jv_files
+    assert set(index.groups()) == {('3C_C1_1', '1A'), ('MAURI-H7-PTAA', None)}
+    index.close()
+
+    # reopened, only changed files are read again and removed files dropped
+    os.remove(jv)
+    tracking = os.path.join(
+        directory, '000_2023_10_19_18.33.10_1A_3C_C1_1_Tracking.txt'
+    )
+    with open(tracking, 'a') as f:
+        f.write('\n')
+    index = HeaderIndex(index_path)
+    assert index.scan(directory) == 1
+    assert len(index.find('3C_C1_1', test='JV')) == len(jv_files) - 1
+    index.close()
@@ -0,0 +1,61 @@
+import subprocess
+import sys
+
+LOAD_ENTRY_POINTS = """
+from nomad_test_parser import parsers
+
+for entry_point in (
+    parsers.parser_entry_point,
+    parsers.parser_eqe_entry_point,
+    parsers.parser_mppt_entry_point,
+    parsers.parser_parameters_entry_point,
+):
+    entry_point.load()
+"""
+
+# only imported when the first UNITOV file is parsed
+DEFERRED_MODULES = [
+    'baseclasses',
+    'nomad_test_parser.parsers.parser',
+    'nomad_test_parser.parsers.file_reading',
+    'nomad_test_parser.parsers.parse_cache',
+    'nomad_test_parser.parsers.plotting',
+]
+
+
+def get_import_times(code):
+    """
+    Runs `code` in a fresh interpreter with `-X importtime` and returns the
+    self and cumulative import time in microseconds of every imported module.
+    """
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_time, cumulative, module = line[len('import time:') :].split('|')
+        times[module.strip()] = (int(self_time), int(cumulative))
+    return times
+
+
+def test_entry_points_import_time():
+    times = get_import_times(LOAD_ENTRY_POINTS)
+
+    print('slowest imports when loading the entry points [cumulative us]:')
+    for module, (_, cumulative) in sorted(
+        times.items(), key=lambda item: item[1][1], reverse=True
+    )[:15]:
+        print(f'{cumulative:10d}  {module}')
+
+    assert 'nomad_test_parser.parsers.unitov' in times
+    for deferred in DEFERRED_MODULES:
+        assert not [
+            module
+            for module in times
+            if module == deferred or module.startswith(f'{deferred}.')
+        ], deferred
@@ -0,0 +1,113 @@
+import os
+
+import numpy as np
+
+from nomad_test_parser.parsers import incremental
+from nomad_test_parser.parsers.file_reading import read_mppt_buffer
+from nomad_test_parser.parsers.incremental import read_mppt_incremental
+
+DATA_FILE = os.path.join(
+    'tests', 'data', '000_2023_10_19_18.33.10_1A_3C_C1_1_Tracking.txt'
+)
+KEY = 'upload/000_2023_10_19_18.33.10_1A_3C_C1_1_Tracking.txt'
+COLUMNS = ['time_data', 'voltage_data', 'current_density_data', 'power_data']
+
+
+def read_content():
+    with open(DATA_FILE, 'rb') as f:
+        return f.read()
+
+
+def count_parsed_rows(monkeypatch):
+    parsed = []
+
+    def read_mppt_rows(*args, **kwargs):
+        arrays = incremental.read_mppt_rows.__wrapped__(*args, **kwargs)
+        parsed.append(len(arrays[0]))
+        return arrays
+
+    read_mppt_rows.__wrapped__ = incremental.read_mppt_rows
+    monkeypatch.setattr(incremental, 'read_mppt_rows', read_mppt_rows)
+    return parsed
+
+
+def assert_same_data(mppt_dict, reference):
+    for key in COLUMNS:
+        assert np.array_equal(mppt_dict[key], reference[key]), key
+    assert mppt_dict['total_time'] == reference['total_time']
+
+
+def test_read_mppt_incremental(tmp_path, monkeypatch):
+    content = read_content()
+    reference, _ = read_mppt_buffer(content)
+    parsed = count_parsed_rows(monkeypatch)
+
+    # the file as written up to the middle of the fourth data row
+    rows = content.rstrip(b'\n').split(b'\n')
+    cut = len(b'\n'.join(rows[:-4])) + 5
+    n_rows = len(reference['time_data']) - 4
+    mppt_dict, _ = read_mppt_incremental(content[:cut], str(tmp_path), KEY)
+    assert len(mppt_dict['time_data']) == n_rows
+    for key in COLUMNS:
+        assert np.array_equal(mppt_dict[key], reference[key][:n_rows]), key
+
+    mppt_dict, _ = read_mppt_incremental(content, str(tmp_path), KEY)
+    assert_same_data(mppt_dict, reference)
+    assert parsed == [3, 4]
+
+    # unchanged file, nothing to parse
+    mppt_dict, _ = read_mppt_incremental(content, str(tmp_path), KEY)
+    assert_same_data(mppt_dict, reference)
+    assert parsed == [3, 4]
+
+
+def test_read_mppt_incremental_replaced(tmp_path, monkeypatch):
+    content = read_content()
+    parsed = count_parsed_rows(monkeypatch)
+    read_mppt_incremental(content, str(tmp_path), KEY)
+
+    replaced = content.replace(b'6.383707', b'6.383708')
+    reference, _ = read_mppt_buffer(replaced)
+    mppt_dict, _ = read_mppt_incremental(replaced, str(tmp_path), KEY)
+
+    assert_same_data(mppt_dict, reference)
+    assert parsed == [7, 7]
+
+
+def test_read_mppt_incremental_interrupted(tmp_path):
+    content = read_content()
+    reference, _ = read_mppt_buffer(content)
+    read_mppt_incremental(content, str(tmp_path), KEY)
+
+    # rows appended to the column files without the state being saved
+    state_directory = incremental.get_state_directory(str(tmp_path), KEY)
+    for name in incremental.COLUMN_FILES:
+        with open(os.path.join(state_directory, name), 'ab') as f:
+            np.ones(3).tofile(f)
+
+    last_row = content.rstrip(b'\n').split(b'\n')[-1]
+    mppt_dict, _ = read_mppt_incremental(content + last_row + b'\n', str(tmp_path), KEY)
+    n_rows = len(reference['time_data'])
+    assert len(mppt_dict['time_data']) == n_rows + 1
+    for key in COLUMNS:
+        assert np.array_equal(mppt_dict[key][:n_rows], reference[key]), key
+        assert mppt_dict[key][n_rows] == reference[key][-1], key
+
+
+def test_read_mppt_incremental_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(incremental, 'NEW_STATES', {})
+    content = read_content()
+    read_mppt_incremental(content, str(tmp_path), 'upload/old')
+    old_directory = incremental.get_state_directory(str(tmp_path), 'upload/old')
+    os.utime(old_directory, (0, 0))
+    for name in os.listdir(old_directory):
+        os.utime(os.path.join(old_directory, name), (0, 0))
+    state_size = incremental.evict_states(str(tmp_path), float('inf'))
+
+    # the first new state of the process scans the states, the old one is
+    # removed to make room for it
+    monkeypatch.setattr(incremental, 'NEW_STATES', {})
+    read_mppt_incremental(content, str(tmp_path), 'upload/new', max_size=state_size)
+    new_directory = incremental.get_state_directory(str(tmp_path), 'upload/new')
+    assert not os.path.exists(old_directory)
+    assert os.path.isdir(new_directory)
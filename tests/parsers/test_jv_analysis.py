@@ -0,0 +1,99 @@
+import os
+
+import numpy as np
+import pytest
+
+from nomad_test_parser.parsers.file_reading import read_jv_buffer
+from nomad_test_parser.parsers.jv_analysis import (
+    get_jv_dict_parameters,
+    get_jv_parameters,
+    stack_curves,
+)
+
+DATA_DIR = os.path.join('tests', 'data')
+
+
+def read_jv_dict(file_name):
+    with open(os.path.join(DATA_DIR, file_name), 'rb') as f:
+        jv_dict, _ = read_jv_buffer(f.read())
+    return jv_dict
+
+
+@pytest.mark.parametrize(
+    'file_name',
+    [
+        '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt',
+        '002_2023_10_19_18.33.51_1A_3C_C1_1_JV.txt',
+        '003_2023_10_19_18.34.18_1A_3C_C1_1_JV.txt',
+    ],
+)
+def test_get_jv_dict_parameters(file_name):
+    jv_dict = read_jv_dict(file_name)
+    parameters = get_jv_dict_parameters(jv_dict)
+
+    for key in ['J_sc', 'V_oc', 'P_MPP', 'J_MPP', 'U_MPP']:
+        assert parameters[key] == pytest.approx(jv_dict[key], rel=1e-4), key
+    for key in ['Fill_factor', 'Efficiency']:
+        assert parameters[key] == pytest.approx(jv_dict[key], abs=0.01), key
+    # the instrument fits the slopes differently
+    for key in ['R_ser', 'R_par']:
+        assert parameters[key] == pytest.approx(jv_dict[key], rel=0.5), key
+
+
+def test_get_jv_parameters_batch():
+    jv_dict = read_jv_dict('003_2023_10_19_18.34.18_1A_3C_C1_1_JV.txt')
+    curves = [
+        (curve['voltage'], curve['current_density']) for curve in jv_dict['jv_curve']
+    ]
+    # ragged stack of scaled curves, with negative photocurrent for every
+    # second one
+    rng = np.random.default_rng(0)
+    batch = []
+    for index in range(1000):
+        voltage, current_density = curves[index % 2]
+        sign = -1 if index % 4 in (2, 3) else 1
+        n_points = len(voltage) - index % 5
+        scale = sign * rng.uniform(0.5, 1.5)
+        batch.append((voltage[:n_points], scale * current_density[:n_points]))
+
+    parameters = get_jv_parameters(*stack_curves(batch))
+
+    for index in [0, 1, 2, 3, 517, 999]:
+        single = get_jv_parameters(*batch[index])
+        for key, value in single.items():
+            assert parameters[key][index] == pytest.approx(value, nan_ok=True), key
+    assert np.all(parameters['J_sc'] > 0)
+    # truncated forward scans end before V_oc
+    assert np.array_equal(np.isnan(parameters['V_oc']), np.isnan(parameters['R_ser']))
+
+
+def test_get_jv_parameters_no_crossing():
+    parameters = get_jv_parameters(np.linspace(0.1, 0.5, 5), np.full(5, 10.0))
+
+    assert np.isnan(parameters['J_sc'])
+    assert np.isnan(parameters['V_oc'])
+    assert parameters['P_MPP'] == pytest.approx(5)
+
+
+def test_get_jv_parameters_degenerate():
+    # no curves
+    parameters = get_jv_parameters(np.empty((0, 0)), np.empty((0, 0)))
+    assert all(len(value) == 0 for value in parameters.values())
+
+    # curves of a single point
+    parameters = get_jv_parameters(np.array([[0.1], [0.2]]), np.array([[10.0], [5.0]]))
+    assert all(np.isnan(value).all() for value in parameters.values())
+    assert parameters['V_oc'].shape == (2,)
+
+    for voltage, current_density in [([], []), ([0.1], [10.0])]:
+        parameters = get_jv_parameters(np.array(voltage), np.array(current_density))
+        assert all(np.isnan(value) for value in parameters.values())
+
+    # an empty curve in a stack of measured ones
+    jv_dict = read_jv_dict('001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt')
+    curve = jv_dict['jv_curve'][0]
+    parameters = get_jv_parameters(
+        *stack_curves([(curve['voltage'], curve['current_density']), ([], [])])
+    )
+    assert parameters['J_sc'][0] > 0
+    assert np.isnan(parameters['J_sc'][1])
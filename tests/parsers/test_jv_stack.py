@@ -0,0 +1,128 @@
+import os
+
+import numpy as np
+import pytest
+
+from nomad_test_parser.parsers.file_reading import read_jv_buffer
+from nomad_test_parser.parsers.jv_analysis import get_jv_parameters, stack_curves
+from nomad_test_parser.parsers.jv_stack import (
+    get_curve,
+    get_padded_curves,
+    get_scan_time,
+    stack_jv_dicts,
+    update_stored_stack,
+)
+
+DATA_DIR = os.path.join('tests', 'data')
+JV_FILES = [
+    '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt',
+    '002_2023_10_19_18.33.51_1A_3C_C1_1_JV.txt',
+    '003_2023_10_19_18.34.18_1A_3C_C1_1_JV.txt',
+]
+
+
+def read_jv_dicts():
+    jv_dicts = []
+    for file_name in JV_FILES:
+        with open(os.path.join(DATA_DIR, file_name), 'rb') as f:
+            jv_dict, _ = read_jv_buffer(f.read())
+        jv_dicts.append(jv_dict)
+    return jv_dicts
+
+
+def test_stack_jv_dicts():
+    jv_dicts = read_jv_dicts()
+    stacked = stack_jv_dicts(jv_dicts)
+
+    assert stacked['datetime'] == [
+        '2023-10-19 18:33:25',
+        '2023-10-19 18:33:51',
+        '2023-10-19 18:34:18',
+    ]
+    assert stacked['time'] == pytest.approx([0, 26 / 3600, 53 / 3600])
+    assert list(stacked['curve_scan']) == [0, 0, 1, 1, 2, 2]
+    assert stacked['curve_direction'] == ['FW', 'RV'] * 3
+    assert stacked['Efficiency'][:2] == pytest.approx(jv_dicts[0]['Efficiency'])
+
+    curves = [curve for jv_dict in jv_dicts for curve in jv_dict['jv_curve']]
+    offsets = stacked['curve_offsets']
+    assert offsets[-1] == len(stacked['voltage']) == len(stacked['current_density'])
+    for index, curve in enumerate(curves):
+        voltage, current_density = get_curve(
+            offsets, stacked['voltage'], stacked['current_density'], index
+        )
+        measured = ~np.isnan(curve['voltage'])
+        assert np.array_equal(voltage, curve['voltage'][measured])
+        assert np.array_equal(current_density, curve['current_density'][measured])
+
+    # the padded view is the input of the figure-of-merit engine
+    padded = get_padded_curves(offsets, stacked['voltage'], stacked['current_density'])
+    reference = stack_curves(
+        (curve['voltage'], curve['current_density']) for curve in curves
+    )
+    n_points = padded[0].shape[1]
+    reference = [array[:, :n_points] for array in reference]
+    for array, expected in zip(padded, reference):
+        assert np.array_equal(array, expected, equal_nan=True)
+    assert get_jv_parameters(*padded)['J_sc'] == pytest.approx(
+        [value for jv_dict in jv_dicts for value in jv_dict['J_sc']], rel=1e-4
+    )
+
+
+def test_stack_ragged_curves():
+    jv_dicts = [
+        {'jv_curve': [{'voltage': [0, 1, 2], 'current_density': [3, 2, 1]}]},
+        {'jv_curve': [{'voltage': [0, 1], 'current_density': [4, 5]}]},
+    ]
+    stacked = stack_jv_dicts(jv_dicts)
+
+    assert list(stacked['curve_offsets']) == [0, 3, 5]
+    assert stacked['curve_direction'] == ['', '']
+    assert np.isnan(stacked['time']).all()
+    voltage, _ = get_padded_curves(
+        stacked['curve_offsets'], stacked['voltage'], stacked['current_density']
+    )
+    assert np.array_equal(voltage, [[0, 1, 2], [0, 1, np.nan]], equal_nan=True)
+
+
+def test_get_scan_time():
+    time = get_scan_time(['2023-10-19 23:30:00', None, '2023-10-20 00:30:00'])
+    assert np.array_equal(time, [0, np.nan, 1], equal_nan=True)
+
+
+def assert_same_stack(stacked, reference):
+    for key, value in reference.items():
+        if isinstance(value, np.ndarray):
+            assert np.array_equal(stacked[key], value, equal_nan=True), key
+        else:
+            assert stacked[key] == value, key
+
+
+def test_update_stored_stack(tmp_path):
+    jv_dicts = dict(zip(JV_FILES, read_jv_dicts()))
+    read = []
+
+    def read_jv_dict(path):
+        read.append(path)
+        return jv_dicts[path]
+
+    reference = stack_jv_dicts(jv_dicts.values())
+    update_stored_stack(str(tmp_path), 'upload/run', JV_FILES[:2], read_jv_dict)
+    stacked = update_stored_stack(str(tmp_path), 'upload/run', JV_FILES, read_jv_dict)
+    # only the file of the new scan is read
+    assert read == JV_FILES
+    assert stacked['data_files'] == JV_FILES
+    assert_same_stack(stacked, reference)
+
+    # an unchanged run reads no file
+    stacked = update_stored_stack(str(tmp_path), 'upload/run', JV_FILES, read_jv_dict)
+    assert read == JV_FILES
+    assert_same_stack(stacked, reference)
+
+    # a replaced run is stacked from the start
+    read.clear()
+    stacked = update_stored_stack(
+        str(tmp_path), 'upload/run', JV_FILES[1:], read_jv_dict
+    )
+    assert read == JV_FILES[1:]
+    assert list(stacked['curve_scan']) == [0, 0, 1, 1]
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from nomad_test_parser.parsers.matching import (
+    HEADER_SNIFF_SIZE,
+    get_file_kind,
+    get_kind_from_name,
+)
+
+DATA_DIR = os.path.join('tests', 'data')
+
+
+def read_head(file_name):
+    with open(os.path.join(DATA_DIR, file_name), 'rb') as f:
+        return f.read(HEADER_SNIFF_SIZE)
+
+
+@pytest.mark.parametrize(
+    'file_name, kind',
+    [
+        ('001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt', 'JV'),
+        ('000_2023_10_19_18.33.10_1A_3C_C1_1_Tracking.txt', 'Tracking'),
+        ('000_2023_10_19_18.33.10_1A_3C_C1_1_Parameters.txt', 'Parameters'),
+        ('2024-01-25_18.05.03_IPCE_Hafez-H7-PTAA_T_23C.txt', 'IPCE'),
+        ('example.out', None),
+    ],
+)
+def test_get_file_kind(file_name, kind):
+    path = os.path.join('upload', file_name)
+    assert get_file_kind(path, read_head(file_name)) == kind
+
+
+def test_get_file_kind_misnamed():
+    head = read_head('001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt')
+
+    assert get_kind_from_name('001_1A_3C_C1_1_Tracking.txt') == 'Tracking'
+    assert get_file_kind('001_1A_3C_C1_1_Tracking.txt', head) is None
+    misnamed_test = head.replace(b'(JV)', b'(XY)')
+    assert get_file_kind('001_1A_3C_C1_1_JV.txt', misnamed_test) is None
+    # JV files without a header are rejected, IPCE files of other exports are not
+    assert get_file_kind('001_1A_3C_C1_1_JV.txt', b'V (V)\tJ (mAcm-2)\n') is None
+    assert get_file_kind('2024_IPCE_cell.txt', b'Wavelength (nm)\tEQE\n') == 'IPCE'
+    assert get_file_kind('001_1A_3C_C1_1_JV.txt', b'\xef\xbb\xbf' + head) == 'JV'
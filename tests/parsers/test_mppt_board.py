@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+
+from nomad_test_parser.parsers.file_reading import read_mppt_buffer
+from nomad_test_parser.parsers.mppt_board import average_track, summarize_board
+
+DATA_FILE = os.path.join(
+    'tests', 'data', '000_2023_10_19_18.33.10_1A_3C_C1_1_Tracking.txt'
+)
+
+
+def get_tracks(n_pixels, n_rows):
+    rng = np.random.default_rng(0)
+    time = np.linspace(0, 100, n_rows)
+    tracks = {}
+    for index in range(n_pixels):
+        power = 15 + index * 0.1 - 0.01 * time + rng.normal(size=n_rows)
+        tracks[f'pixel {index}'] = (time, power)
+    return tracks
+
+
+def test_average_track():
+    time = np.array([0.0, 1, 2, 3, np.nan])
+    efficiency = np.array([1.0, 3, 5, 7, 100])
+
+    centers, averages = average_track(time, efficiency, n_bins=2)
+
+    np.testing.assert_allclose(centers, [0.75, 2.25])
+    np.testing.assert_allclose(averages, [2, 6])
+
+
+def test_summarize_board_shared_memory():
+    tracks = get_tracks(n_pixels=6, n_rows=20000)
+
+    max_points = 400
+    serial = summarize_board(tracks, n_bins=50, max_points=max_points)
+    shared = summarize_board(tracks, max_workers=3, n_bins=50, max_points=max_points)
+
+    assert serial['best_pixel'] == shared['best_pixel'] == 'pixel 5'
+    for name, pixel in serial['pixels'].items():
+        assert pixel['mean_efficiency'] == shared['pixels'][name]['mean_efficiency']
+        for key in ('average', 'preview'):
+            for expected, actual in zip(pixel[key], shared['pixels'][name][key]):
+                np.testing.assert_array_equal(expected, actual)
+        assert len(pixel['preview'][0]) <= max_points
+
+
+def test_summarize_board_tracking_file():
+    with open(DATA_FILE, 'rb') as f:
+        mppt_dict, _ = read_mppt_buffer(f.read())
+    track = (mppt_dict['time_data'], mppt_dict['power_data'])
+
+    summary = summarize_board({'1A': track, '1B': track}, max_workers=2)
+
+    pixel = summary['pixels']['1A']
+    assert summary['best_pixel'] == '1A'
+    np.testing.assert_allclose(pixel['mean_efficiency'], np.mean(pixel['average'][1]))
+    np.testing.assert_array_equal(pixel['preview'][1], mppt_dict['power_data'])
@@ -0,0 +1,126 @@
+import os
+
+import numpy as np
+
+from nomad_test_parser.parsers import parse_cache
+from nomad_test_parser.parsers.file_reading import read_eqe_buffer, read_jv_buffer
+from nomad_test_parser.parsers.parse_cache import CACHE_STATS, cached_read
+
+DATA_DIR = os.path.join('tests', 'data')
+
+
+def read_data_file(file_name):
+    with open(os.path.join(DATA_DIR, file_name), 'rb') as f:
+        return f.read()
+
+
+def test_cached_read(tmp_path):
+    buffer = read_data_file('003_2023_10_19_18.34.18_1A_3C_C1_1_JV.txt')
+    hits, misses = CACHE_STATS['hits'], CACHE_STATS['misses']
+
+    parsed = cached_read(read_jv_buffer, buffer, directory=str(tmp_path))
+    cached = cached_read(read_jv_buffer, buffer, directory=str(tmp_path))
+
+    assert CACHE_STATS['misses'] == misses + 1
+    assert CACHE_STATS['hits'] == hits + 1
+    assert isinstance(cached, tuple)
+    jv_dict, location = cached
+    assert location == parsed[1]
+    assert jv_dict['V_oc'] == parsed[0]['V_oc']
+    for curve, parsed_curve in zip(jv_dict['jv_curve'], parsed[0]['jv_curve']):
+        assert curve['name'] == parsed_curve['name']
+        assert np.array_equal(
+            curve['current_density'], parsed_curve['current_density'], equal_nan=True
+        )
+
+
+def test_cached_read_invalidation(tmp_path, monkeypatch):
+    buffer = read_data_file('2024-01-25_18.05.03_IPCE_Hafez-H7-PTAA_T_23C.txt')
+
+    for header_lines in [24, 23]:
+        misses = CACHE_STATS['misses']
+        cached_read(
+            read_eqe_buffer, buffer, directory=str(tmp_path), header_lines=header_lines
+        )
+        assert CACHE_STATS['misses'] == misses + 1
+
+    monkeypatch.setattr(parse_cache, 'READER_VERSION', 'changed')
+    misses = CACHE_STATS['misses']
+    cached_read(read_eqe_buffer, buffer, directory=str(tmp_path), header_lines=24)
+    assert CACHE_STATS['misses'] == misses + 1
+
+
+def test_cached_read_eviction(tmp_path):
+    entries = []
+    for file_name in [
+        '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt',
+        '002_2023_10_19_18.33.51_1A_3C_C1_1_JV.txt',
+    ]:
+        cached_read(read_jv_buffer, read_data_file(file_name), directory=str(tmp_path))
+        (path,) = set(tmp_path.iterdir()) - set(entries)
+        # make the access order explicit
+        os.utime(path, (1e9 + len(entries), 1e9 + len(entries)))
+        entries.append(path)
+
+    cached_read(
+        read_jv_buffer,
+        read_data_file('003_2023_10_19_18.34.18_1A_3C_C1_1_JV.txt'),
+        directory=str(tmp_path),
+        max_size=sum(path.stat().st_size for path in entries) * 5 // 4,
+    )
+
+    assert not entries[0].exists()
+    assert entries[1].exists()
+    assert len(os.listdir(tmp_path)) == len(entries)
+
+
+def test_cached_read_size_tracking(tmp_path, monkeypatch):
+    scans = []
+    scan_entries = parse_cache.scan_entries
+
+    def count_scans(directory):
+        scans.append(directory)
+        return scan_entries(directory)
+
+    monkeypatch.setattr(parse_cache, 'scan_entries', count_scans)
+    file_names = [
+        '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt',
+        '002_2023_10_19_18.33.51_1A_3C_C1_1_JV.txt',
+        '003_2023_10_19_18.34.18_1A_3C_C1_1_JV.txt',
+    ]
+    directory = str(tmp_path)
+    for file_name in file_names:
+        cached_read(
+            read_jv_buffer,
+            read_data_file(file_name),
+            directory=directory,
+            max_size=10**9,
+        )
+    # the directory is only scanned once below the cap
+    assert scans == [directory]
+
+    entry_size = max(path.stat().st_size for path in tmp_path.iterdir())
+    cached_read(
+        read_eqe_buffer,
+        read_data_file('2024-01-25_18.05.03_IPCE_Hafez-H7-PTAA_T_23C.txt'),
+        directory=directory,
+        max_size=2 * entry_size,
+        header_lines=24,
+    )
+    assert scans == [directory, directory]
+    assert sum(path.stat().st_size for path in tmp_path.iterdir()) <= 2 * entry_size
+    assert parse_cache.CACHE_SIZES[directory]['size'] == sum(
+        path.stat().st_size for path in tmp_path.iterdir()
+    )
+
+
+def test_reader_version():
+    assert parse_cache.READER_VERSION == parse_cache.get_reader_version()
+    for module in parse_cache.READER_MODULES:
+        assert (
+            parse_cache.get_reader_version(
+                [name for name in parse_cache.READER_MODULES if name != module]
+            )
+            != parse_cache.READER_VERSION
+        )
+    assert 'raw_file' in parse_cache.READER_MODULES
@@ -2,10 +2,22 @@ import logging
 import numpy as np # Import numpy for type comparison if needed
 import sys
 import os
+import shutil
 from pydantic import BaseModel
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from nomad_test_parser.parsers.parser import NewParser, SimpleOutput,JVParser,EQEParser,MPPTParser,RawFileUNITOV,UNITOV_JVmeasurement # Import SimpleOutput
+from nomad_test_parser.parsers.parser import (  # Import SimpleOutput
+    EQEParser,
+    JVParser,
+    MPPTParser,
+    NewParser,
+    ParametersParser,
+    RawFileUNITOV,
+    SimpleOutput,
+    UNITOV_JVmeasurement,
+)
+from nomad_test_parser.parsers import parser as sections
+from nomad_test_parser.parsers import unitov
 
 from nomad.datamodel import EntryArchive, EntryMetadata
 from nomad.datamodel.metainfo.workflow import Workflow
@@ -180,3 +192,114 @@ def test_parse_MPPT_file():
 
     # Check if archive.data is an instance of RawFileUNITOV
     assert isinstance(archive.data, RawFileUNITOV)
+
+
+def test_parse_Parameters_file():
+    Path(".volumes/fs/staging/42/42").mkdir(parents=True, exist_ok=True)
+
+    mainfile_path = '000_2023_10_19_18.33.10_1A_3C_C1_1_Parameters.txt'
+    parser = ParametersParser()
+    context = ServerContext(Upload(upload_id="42"))
+    context.uploadFiles = UploadFiles.get("42",create=True)
+
+    archive = EntryArchive(m_context=context)
+    archive.metadata = EntryMetadata()
+    archive.metadata.entry_name = 'test'
+    archive.workflow2=Workflow(name='test')
+
+    parser.parse(mainfile_path, archive, logging.getLogger())
+
+    assert archive.data.data_file
+
+    archive.data.normalize(archive, logging.getLogger())
+
+    assert isinstance(archive.data, RawFileUNITOV)
+    assert [scan.name for scan in archive.data.scans] == ['FW', 'RV']
+    assert len(archive.data.time) == len(archive.data.scans[0].efficiency)
+
+
+def test_unitov_is_mainfile():
+    parsers = [JVParser(), EQEParser(), MPPTParser(), ParametersParser()]
+    for file_name, matching in [
+        ('001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt', JVParser),
+        ('2024-01-25_18.05.03_IPCE_Hafez-H7-PTAA_T_23C.txt', EQEParser),
+        ('000_2023_10_19_18.33.10_1A_3C_C1_1_Tracking.txt', MPPTParser),
+        ('000_2023_10_19_18.33.10_1A_3C_C1_1_Parameters.txt', ParametersParser),
+        ('example.out', None),
+    ]:
+        path = os.path.join('tests', 'data', file_name)
+        with open(path, 'rb') as f:
+            buffer = f.read(1024)
+        decoded_buffer = buffer.decode('windows-1252')
+        for parser in parsers:
+            assert parser.is_mainfile(
+                path, 'text/plain', buffer, decoded_buffer
+            ) == isinstance(parser, matching or ())
+
+
+def test_unitov_is_mainfile_aggregated(monkeypatch):
+    monkeypatch.setattr(unitov.configuration, 'aggregate_jv_scans', True)
+    path = os.path.join('tests', 'data', '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt')
+    with open(path, 'rb') as f:
+        buffer = f.read(1024)
+    assert not JVParser().is_mainfile(
+        path, 'text/plain', buffer, buffer.decode('windows-1252')
+    )
+    assert unitov.has_parameters_file(path)
+    assert unitov.get_run_archive_name(
+        '000_2023_10_19_18.33.10_1A_3C_C1_1_Parameters.txt'
+    ) == '000_2023_10_19_18.33.10_1A_3C_C1_1_JVRun.archive.json'
+
+
+def test_unitov_is_mainfile_aggregated_without_parameters(tmp_path, monkeypatch):
+    monkeypatch.setattr(unitov.configuration, 'aggregate_jv_scans', True)
+    monkeypatch.setattr(unitov, 'PARAMETERS_GROUPS', {})
+    file_name = '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt'
+    shutil.copy(os.path.join('tests', 'data', file_name), tmp_path)
+    path = str(tmp_path / file_name)
+    with open(path, 'rb') as f:
+        buffer = f.read(1024)
+
+    # a run without parameters file has no run entry, its JV files stay entries
+    assert JVParser().is_mainfile(
+        path, 'text/plain', buffer, buffer.decode('windows-1252')
+    )
+
+    parameters_file = '000_2023_10_19_18.33.10_1A_3C_C1_1_Parameters.txt'
+    shutil.copy(os.path.join('tests', 'data', parameters_file), tmp_path)
+    assert unitov.has_parameters_file(path)
+
+
+def test_unitov_entry_point_options(monkeypatch):
+    monkeypatch.setattr(sections.eqe_configuration, 'parse_cache_directory', 'eqe')
+    monkeypatch.setattr(sections.mppt_configuration, 'prefetch_depth', 2)
+
+    # every parser reads the options of its own entry point
+    assert sections.get_parse_cache_options(sections.eqe_configuration) == {
+        'directory': 'eqe',
+        'max_size': sections.eqe_configuration.parse_cache_max_size,
+    }
+    for entry_point in [
+        sections.configuration,
+        sections.mppt_configuration,
+        sections.parameters_configuration,
+    ]:
+        assert sections.get_parse_cache_options(entry_point)['directory'] is None
+    assert sections.get_prefetch_options(sections.mppt_configuration) == {
+        'depth': 2,
+        'max_bytes': sections.mppt_configuration.prefetch_max_bytes,
+    }
+    for entry_point in [
+        sections.configuration,
+        sections.eqe_configuration,
+        sections.parameters_configuration,
+    ]:
+        assert sections.get_prefetch_options(entry_point)['depth'] == 0
+    for parser_class in [
+        unitov.EQEParser,
+        unitov.MPPTParser,
+        unitov.JVParser,
+        unitov.ParametersParser,
+    ]:
+        entry_point = unitov.config.get_plugin_entry_point(parser_class.entry_point)
+        assert isinstance(entry_point.load(), parser_class)
@@ -0,0 +1,61 @@
+import numpy as np
+
+from nomad_test_parser.parsers.plotting import (
+    WEBGL_THRESHOLD,
+    downsample_m4,
+    get_scatter_figure,
+)
+
+
+def test_get_scatter_figure():
+    time = np.linspace(0, 10, 5)
+    figure = get_scatter_figure(
+        'Averages',
+        [('pixel 1', time, time * 2), ('pixel 2', time, time * 3)],
+        ('Time [hr]', 'Efficiency [%]', 'P'),
+    )
+
+    assert figure['layout']['title']['text'] == 'Averages'
+    assert [trace['name'] for trace in figure['data']] == ['pixel 1', 'pixel 2']
+    first, second = figure['data']
+    assert first['type'] == 'scatter'
+    assert first['x'] == time.tolist()
+    assert second['y'] == (time * 3).tolist()
+    assert first['marker']['color'] != second['marker']['color']
+    assert first['marker']['symbol'] != second['marker']['symbol']
+
+
+def test_get_scatter_figure_webgl():
+    time = np.arange(WEBGL_THRESHOLD + 1, dtype=float)
+    figure = get_scatter_figure('Best Pixels', [('pixel', time, time)], ('x', 'y', 'P'))
+
+    assert figure['data'][0]['type'] == 'scattergl'
+
+
+def test_downsample_m4():
+    x = np.linspace(0, 100, 100000)
+    y = np.sin(x)
+    peak = 10
+    y[54321] = peak
+    y[12345] = -peak
+    max_points = 5000
+
+    x_preview, y_preview = downsample_m4(x, y, max_points)
+
+    assert len(x_preview) <= max_points
+    assert np.all(np.diff(x_preview) > 0)
+    assert x_preview[0] == x[0] and x_preview[-1] == x[-1]
+    assert y_preview.max() == peak and y_preview.min() == -peak
+
+    x_short, y_short = downsample_m4(x[:100], y[:100], max_points)
+    assert np.array_equal(x_short, x[:100])
+
+
+def test_get_scatter_figure_max_points():
+    x = np.arange(20000, dtype=float)
+    max_points = 400
+    figure = get_scatter_figure(
+        'Averages', [('pixel', x, x)], ('x', 'y', 'P'), max_points=max_points
+    )
+
+    assert len(figure['data'][0]['x']) <= max_points
@@ -0,0 +1,159 @@
+import os
+import threading
+
+import pytest
+
+from nomad_test_parser.parsers import prefetch
+from nomad_test_parser.parsers.matching import get_kind_from_name
+from nomad_test_parser.parsers.prefetch import RawFilePrefetcher, list_mainfiles
+from nomad_test_parser.parsers.raw_file import open_raw_file
+
+DATA_DIR = os.path.join('tests', 'data')
+
+
+class Context:
+    def __init__(self):
+        self.directory = DATA_DIR
+        self.opened = []
+        self.lock = threading.Lock()
+
+    def raw_file(self, path, mode):
+        with self.lock:
+            self.opened.append(path)
+        return open(os.path.join(self.directory, path), mode)
+
+
+class Metadata:
+    upload_id = 'prefetch'
+
+
+class Archive:
+    def __init__(self, context):
+        self.m_context = context
+        self.metadata = Metadata()
+
+
+@pytest.fixture
+def archive():
+    yield Archive(Context())
+    prefetch.close_prefetchers()
+
+
+def test_list_mainfiles(archive):
+    mainfiles = list_mainfiles(archive, '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt')
+
+    assert mainfiles == [
+        name for name in sorted(os.listdir(DATA_DIR)) if name.endswith('.txt')
+    ]
+
+
+def test_open_raw_file_prefetch(archive):
+    options = dict(depth=2, max_bytes=1024**2)
+    mainfiles = list_mainfiles(archive, '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt')
+
+    first_files = {}
+    for path in mainfiles:
+        first_file = first_files.setdefault(get_kind_from_name(path), path)
+        with open_raw_file(archive, path, prefetch=options) as buffer:
+            with open(os.path.join(DATA_DIR, path), 'rb') as f:
+                assert bytes(buffer) == f.read()
+            # the first file of a kind is opened by open_raw_file, the others
+            # were read ahead while the previous one of the kind was used
+            assert isinstance(buffer, bytes) == (path != first_file)
+
+    assert sorted(archive.m_context.opened) == mainfiles
+
+
+def test_open_raw_file_prefetch_kinds(archive):
+    jv_files = list_mainfiles(
+        archive, '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt', kind='JV'
+    )
+    tracking_files = list_mainfiles(archive, jv_files[0], kind='Tracking')
+
+    # each kind is read ahead with its own options, among its own files
+    with open_raw_file(archive, jv_files[0], prefetch=dict(depth=1, max_bytes=1)):
+        pass
+    jv_prefetcher = prefetch.PREFETCHERS['JV']['prefetcher']
+    with open_raw_file(
+        archive, tracking_files[0], prefetch=dict(depth=2, max_bytes=1024**2)
+    ):
+        pass
+    tracking_prefetcher = prefetch.PREFETCHERS['Tracking']['prefetcher']
+    assert prefetch.PREFETCHERS['JV']['prefetcher'] is jv_prefetcher
+    assert jv_prefetcher.paths == jv_files
+    assert list(jv_prefetcher.pending) == jv_files[1:2]
+    assert tracking_prefetcher.paths == tracking_files
+    assert tracking_prefetcher.depth > jv_prefetcher.depth
+
+
+def test_prefetcher_bounds():
+    reads = []
+
+    def open_file(path):
+        reads.append(path)
+        return open(os.path.join(DATA_DIR, path), 'rb')
+
+    paths = sorted(os.listdir(DATA_DIR))
+    prefetcher = RawFilePrefetcher(open_file, paths, depth=2, max_bytes=1024**3)
+    assert prefetcher.take(paths[0]) is None
+    assert len(prefetcher.pending) == prefetcher.depth
+    assert prefetcher.take(paths[1]) is not None
+    assert len(prefetcher.pending) == prefetcher.depth
+    prefetcher.close()
+
+    # no further reads once the files read ahead exceed max_bytes
+    prefetcher.executor.shutdown(wait=True)
+    reads.clear()
+    prefetcher = RawFilePrefetcher(open_file, paths, depth=4, max_bytes=1)
+    prefetcher.take(paths[0])
+    for future in list(prefetcher.pending.values()):
+        future.result()
+    assert list(prefetcher.pending) == paths[1:5]
+    assert prefetcher.take(paths[1]) is not None
+    assert list(prefetcher.pending) == paths[2:5]
+    prefetcher.close()
+    assert sorted(reads) == paths[1:5]
+
+
+def test_prefetcher_skipped_paths():
+    paths = sorted(os.listdir(DATA_DIR))
+    prefetcher = RawFilePrefetcher(
+        lambda path: open(os.path.join(DATA_DIR, path), 'rb'),
+        paths,
+        depth=2,
+        max_bytes=1024**3,
+    )
+
+    # every other file is processed, the ones in between are dropped
+    assert prefetcher.take(paths[0]) is None
+    for index in range(2, len(paths), 2):
+        assert prefetcher.take(paths[index]) is not None
+        assert all(paths.index(pending) > index for pending in prefetcher.pending)
+
+    # only the files still read ahead hold bytes
+    prefetcher.executor.shutdown(wait=True)
+    assert prefetcher.size == sum(
+        len(future.result()) for future in prefetcher.pending.values()
+    )
+    prefetcher.close()
+
+
+def test_prefetcher_out_of_order():
+    paths = sorted(os.listdir(DATA_DIR))
+    prefetcher = RawFilePrefetcher(
+        lambda path: open(os.path.join(DATA_DIR, path), 'rb'),
+        paths,
+        depth=2,
+        max_bytes=1024**3,
+    )
+
+    assert prefetcher.take(paths[3]) is None
+    assert list(prefetcher.pending) == paths[4:6]
+    # an earlier file keeps the files read ahead of the later one
+    assert prefetcher.take(paths[1]) is None
+    assert list(prefetcher.pending) == paths[4:6]
+    assert prefetcher.take(paths[4]) is not None
+    assert list(prefetcher.pending) == paths[5:7]
+    assert prefetcher.take(paths[2]) is None
+    assert prefetcher.take(paths[5]) is not None
+    prefetcher.close()
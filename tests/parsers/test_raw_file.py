@@ -0,0 +1,80 @@
+import io
+import mmap
+import os
+from contextlib import contextmanager
+
+import numpy as np
+import pytest
+
+from nomad_test_parser.parsers.file_reading import read_file_jv_data, read_jv_buffer
+from nomad_test_parser.parsers.raw_file import open_raw_file, sniff_encoding
+
+DATA_DIR = os.path.join('tests', 'data')
+
+
+class Context:
+    def __init__(self, seekable=True):
+        self.seekable = seekable
+
+    @contextmanager
+    def raw_file(self, path, mode):
+        with open(os.path.join(DATA_DIR, path), 'rb') as f:
+            yield f if self.seekable else io.BytesIO(f.read())
+
+
+class Archive:
+    def __init__(self, seekable=True):
+        self.m_context = Context(seekable)
+
+
+@pytest.mark.parametrize(
+    'file_name, encoding',
+    [
+        ('001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt', 'utf-8'),
+        ('002_2023_10_19_18.33.51_1A_3C_C1_1_JV.txt', 'windows-1252'),
+        ('2024-01-25_18.05.03_IPCE_Hafez-H7-PTAA_T_23C.txt', 'utf-8'),
+        ('000_2023_10_19_18.33.10_1A_3C_C1_1_Tracking.txt', 'utf-8'),
+    ],
+)
+def test_sniff_encoding(file_name, encoding):
+    with open_raw_file(Archive(), file_name) as buffer:
+        assert sniff_encoding(buffer) == encoding
+
+
+def test_sniff_encoding_cut_character():
+    # a UTF-8 character across the end of the prefix
+    content = b'a' * 4094 + b'\n' + 'é'.encode() + b'\n'
+    assert sniff_encoding(content, size=4096) == 'utf-8'
+    content = content.replace('é'.encode(), b'\xe9')
+    assert sniff_encoding(content, size=8192) == 'windows-1252'
+
+
+def test_sniff_encoding_no_newline():
+    # a prefix without a line break is checked as a whole
+    content = 'mA/cm²\t'.encode('windows-1252') * 1000
+    assert sniff_encoding(content, size=4096) == 'windows-1252'
+    content = 'mA/cm²\t'.encode() * 1000
+    assert sniff_encoding(content, size=4096) == 'utf-8'
+    # also when a character is cut at the end of the prefix
+    assert sniff_encoding(content, size=4094) == 'utf-8'
+    assert sniff_encoding(b'\xe9' + content, size=4095) == 'windows-1252'
+
+
+@pytest.mark.parametrize('seekable', [True, False])
+def test_read_jv_buffer(seekable):
+    file_name = '003_2023_10_19_18.34.18_1A_3C_C1_1_JV.txt'
+    with open_raw_file(Archive(seekable), file_name) as buffer:
+        assert isinstance(buffer, mmap.mmap) == seekable
+        jv_dict, _ = read_jv_buffer(buffer)
+
+    with open(os.path.join(DATA_DIR, file_name), encoding='windows-1252') as f:
+        reference, _ = read_file_jv_data(f)
+
+    for key in ['active_area', 'J_sc', 'V_oc', 'Fill_factor', 'Efficiency']:
+        assert jv_dict[key] == reference[key]
+    for curve, reference_curve in zip(jv_dict['jv_curve'], reference['jv_curve']):
+        assert curve['name'] == reference_curve['name']
+        assert np.array_equal(curve['voltage'], reference_curve['voltage'])
+        assert np.array_equal(
+            curve['current_density'], reference_curve['current_density'], equal_nan=True
+        )
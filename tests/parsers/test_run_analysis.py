@@ -0,0 +1,161 @@
+import os
+
+import numpy as np
+import pytest
+
+from nomad_test_parser.parsers import run_analysis
+from nomad_test_parser.parsers.file_reading import (
+    read_jv_buffer,
+    read_parameters_buffer,
+)
+from nomad_test_parser.parsers.run_analysis import (
+    DIRECTIONS,
+    EFFICIENCY,
+    METRICS,
+    get_run_summary,
+    stack_jv_scans,
+    stack_parameters,
+    update_run_summary,
+    update_stored_run_summary,
+)
+
+DATA_DIR = os.path.join('tests', 'data')
+PARAMETERS_FILE = '000_2023_10_19_18.33.10_1A_3C_C1_1_Parameters.txt'
+JV_FILES = [
+    '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt',
+    '002_2023_10_19_18.33.51_1A_3C_C1_1_JV.txt',
+    '003_2023_10_19_18.34.18_1A_3C_C1_1_JV.txt',
+]
+SUMMARY_KEYS = [
+    'time',
+    'hysteresis_index',
+    'normalized_efficiency',
+    'initial_efficiency',
+    't80',
+    'trend',
+]
+
+
+def read_parameters():
+    with open(os.path.join(DATA_DIR, PARAMETERS_FILE), 'rb') as f:
+        parameters_dict, _ = read_parameters_buffer(f.read())
+    return stack_parameters(parameters_dict)
+
+
+def synthetic_run(n_scans=200):
+    rng = np.random.default_rng(0)
+    time = np.linspace(0, 100, n_scans)
+    values = rng.uniform(0.5, 1.5, size=(n_scans, len(DIRECTIONS), len(METRICS)))
+    # linear decay to 60 % of the initial efficiency
+    values[:, :, EFFICIENCY] = (20 - 0.08 * time)[:, None] * [0.95, 1.0]
+    return time, values
+
+
+def assert_same_summary(summary, reference):
+    for key in SUMMARY_KEYS:
+        assert np.allclose(summary[key], reference[key], equal_nan=True), key
+
+
+def test_get_run_summary():
+    time, values = synthetic_run()
+    summary = get_run_summary(time, values)
+
+    efficiency = values[:, :, EFFICIENCY]
+    fw, rv = efficiency[:, 0], efficiency[:, 1]
+    assert np.allclose(summary['hysteresis_index'], (rv - fw) / rv)
+    assert np.allclose(summary['normalized_efficiency'], efficiency / efficiency[0])
+    # 80 % of 20 is reached after 50 hours
+    assert summary['t80'] == pytest.approx([50, 50], abs=100 / 199)
+    for direction in range(len(DIRECTIONS)):
+        for metric in range(len(METRICS)):
+            slope = np.polyfit(time, values[:, direction, metric], 1)[0]
+            assert summary['trend'][direction, metric] == pytest.approx(slope)
+
+
+def test_update_run_summary():
+    time, values = synthetic_run()
+    reference = get_run_summary(time, values)
+
+    summary = get_run_summary(time[:120], values[:120])
+    summary = update_run_summary(summary, time[120:], values[120:])
+    assert_same_summary(summary, reference)
+
+    # scans added out of order are sorted in
+    summary = get_run_summary(time[50:], values[50:])
+    summary = update_run_summary(summary, time[:50], values[:50])
+    assert_same_summary(summary, reference)
+
+
+def test_update_stored_run_summary(tmp_path, monkeypatch):
+    time, values = read_parameters()
+    reference = get_run_summary(time, values)
+    folded = []
+
+    def fold_scans(summary, time, values):
+        folded.append(len(time))
+        return fold_scans.__wrapped__(summary, time, values)
+
+    fold_scans.__wrapped__ = run_analysis.fold_scans
+    monkeypatch.setattr(run_analysis, 'fold_scans', fold_scans)
+
+    cut = len(time) - 1
+    update_stored_run_summary(str(tmp_path), 'upload/run', time[:cut], values[:cut])
+    summary = update_stored_run_summary(str(tmp_path), 'upload/run', time, values)
+    assert folded == [cut, 1]
+    assert_same_summary(summary, reference)
+
+    # a replaced file is summarized from the start
+    summary = update_stored_run_summary(
+        str(tmp_path), 'upload/run', time[1:], values[1:]
+    )
+    assert folded[-1] == len(time) - 1
+    assert np.array_equal(summary['time'], time[1:])
+
+
+def test_stack_jv_scans():
+    scans = []
+    for index, file_name in enumerate(JV_FILES):
+        with open(os.path.join(DATA_DIR, file_name), 'rb') as f:
+            jv_dict, _ = read_jv_buffer(f.read())
+        assert jv_dict['scan_direction'] == ['FW', 'RV']
+        scans.append((index * 0.2, jv_dict))
+
+    time, values = stack_jv_scans(scans)
+
+    assert values.shape == (3, len(DIRECTIONS), len(METRICS))
+    _, jv_dict = scans[0]
+    assert values[0, :, EFFICIENCY] == pytest.approx(jv_dict['Efficiency'])
+    summary = get_run_summary(time, values)
+    # 7.02 % FW and 7.62 % RV in the first file
+    assert summary['hysteresis_index'][0] == pytest.approx((7.62 - 7.02) / 7.62)
+
+
+def test_stack_jv_scans_directions():
+    with open(os.path.join(DATA_DIR, JV_FILES[0]), 'rb') as f:
+        jv_dict, _ = read_jv_buffer(f.read())
+    fw, rv = DIRECTIONS.index('FW'), DIRECTIONS.index('RV')
+    efficiency = jv_dict['Efficiency']
+
+    def stack(**changes):
+        _, values = stack_jv_scans([(0.0, {**jv_dict, **changes})])
+        return values[0, :, EFFICIENCY]
+
+    # the rows are assigned by their direction
+    assert stack(scan_direction=['RV', 'FW'])[[rv, fw]] == pytest.approx(efficiency)
+    # without directions, one row per direction is taken in order
+    assert stack(scan_direction=None) == pytest.approx(efficiency)
+    # unknown and missing directions are skipped
+    assert np.isnan(stack(scan_direction=['FW', 'up'])[rv])
+    assert np.isnan(stack(scan_direction=['RV'])[fw])
+    # more rows than directions
+    three = {
+        key: [*jv_dict[key], jv_dict[key][0]]
+        for key in run_analysis.JV_DICT_METRICS.values()
+    }
+    assert np.isnan(stack(**three, scan_direction=None)).all()
+    assert stack(**three, scan_direction=['FW', 'RV', 'hold']) == pytest.approx(
+        efficiency
+    )
+    # more directions than rows
+    assert np.isnan(stack(scan_direction=['FW', 'RV', 'FW'], Efficiency=[7.0])[rv])
+    assert np.isnan(stack(V_oc=None)).all()
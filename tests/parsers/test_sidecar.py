@@ -0,0 +1,101 @@
+import json
+
+import numpy as np
+import pytest
+
+from nomad_test_parser.parsers.sidecar import SidecarArray, read_archive, write_archive
+
+pytest.importorskip('h5py')
+
+
+def get_archive_dict():
+    return {
+        'data': {
+            'm_def': 'nomad_test_parser.parsers.parser.UNITOV_EQEmeasurement',
+            'data_file': 'eqe.txt',
+            'eqe_data': [
+                {
+                    'photon_energy_array': np.linspace(1.2, 3.5, 1000).tolist(),
+                    'eqe_array': np.linspace(0, 1, 1000).tolist(),
+                    'raw_eqe_array': [0.1, 0.2, None],
+                    'bandgap_eqe': 1.6,
+                }
+            ],
+            'counts': list(range(300)),
+            'curves/units': np.ones((300, 2)).tolist(),
+        }
+    }
+
+
+def test_write_archive(tmp_path):
+    archive_dict = get_archive_dict()
+    path = str(tmp_path / 'eqe.txt.archive.json')
+    write_archive(archive_dict, path)
+
+    with open(path) as f:
+        content = json.load(f)
+    eqe = content['data']['eqe_data'][0]
+    assert eqe['photon_energy_array'] == {
+        'm_sidecar': 'eqe.txt.archive.h5#/data/eqe_data/0/photon_energy_array'
+    }
+    assert eqe['raw_eqe_array'] == [0.1, 0.2, None]
+    assert (tmp_path / 'eqe.txt.archive.h5').exists()
+
+    archive = read_archive(path)
+    eqe = archive['data']['eqe_data'][0]
+    assert isinstance(eqe['eqe_array'], SidecarArray)
+    assert eqe['eqe_array']._value is None
+    assert np.array_equal(
+        eqe['eqe_array'], archive_dict['data']['eqe_data'][0]['eqe_array']
+    )
+
+    archive = read_archive(path, lazy=False)
+    for key in ['counts', 'curves/units']:
+        assert archive['data'][key].tolist() == archive_dict['data'][key]
+    assert archive['data']['counts'].dtype.kind == 'i'
+
+
+def test_write_archive_small(tmp_path):
+    path = str(tmp_path / 'eqe.txt.archive.json')
+    write_archive(get_archive_dict(), path)
+    write_archive(get_archive_dict(), path, min_size=10**6)
+
+    assert not (tmp_path / 'eqe.txt.archive.h5').exists()
+    assert read_archive(path) == get_archive_dict()
+
+
+def test_write_archive_encode(tmp_path):
+    import h5py
+
+    archive_dict = get_archive_dict()
+    voltage = np.round(np.linspace(-0.2, 1.2, 300) + 1e-3 * np.sin(np.arange(300)), 6)
+    archive_dict['data']['jv_curve'] = [
+        {'voltage': voltage.tolist(), 'current_density': (voltage * k).tolist()}
+        for k in range(3)
+    ]
+    path = str(tmp_path / 'eqe.txt.archive.json')
+    decimals = {'eqe_array': 3}
+    write_archive(archive_dict, path, encode=True, decimals=decimals)
+
+    with h5py.File(tmp_path / 'eqe.txt.archive.h5', 'r') as f:
+        curves = f['data/jv_curve']
+        assert curves['0/voltage'].attrs['encoding'] == 'scaled'
+        assert curves['0/voltage'].dtype == np.int32
+        assert curves['1/voltage'] == curves['0/voltage']
+        assert curves['1/voltage'] == curves['1/current_density']
+        photon_energy = f['data/eqe_data/0/photon_energy_array']
+        assert photon_energy.attrs['encoding'] == 'float64'
+        eqe_array = f['data/eqe_data/0/eqe_array']
+        assert eqe_array.attrs['decimals'] == decimals['eqe_array']
+        assert f['data/counts'].attrs.get('encoding') is None
+
+    archive = read_archive(path, lazy=False)
+    curves = zip(archive['data']['jv_curve'], archive_dict['data']['jv_curve'])
+    for curve, expected in curves:
+        assert np.array_equal(curve['voltage'], expected['voltage'])
+        assert np.array_equal(curve['current_density'], expected['current_density'])
+    eqe = archive['data']['eqe_data'][0]
+    expected = archive_dict['data']['eqe_data'][0]
+    assert np.array_equal(eqe['photon_energy_array'], expected['photon_energy_array'])
+    assert np.allclose(eqe['eqe_array'], expected['eqe_array'], rtol=0, atol=5e-4)
+    assert archive['data']['counts'].tolist() == archive_dict['data']['counts']
@@ -0,0 +1,73 @@
+import os
+
+from nomad_test_parser.parsers import timing
+from nomad_test_parser.parsers.file_reading import read_jv_buffer
+from nomad_test_parser.parsers.timing import NULL_TIMER, log_timings, timed
+
+DATA_FILE = os.path.join('tests', 'data', '001_2023_10_19_18.33.25_1A_3C_C1_1_JV.txt')
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.events = []
+
+    def info(self, event, **fields):
+        self.events.append((event, fields))
+
+
+def test_timing_disabled(monkeypatch):
+    monkeypatch.setitem(timing.TIMING, 'enabled', False)
+    monkeypatch.setattr(timing, 'TIMING_STATS', {})
+    logger = RecordingLogger()
+
+    assert timed('data') is NULL_TIMER
+    with open(DATA_FILE, 'rb') as f:
+        read_jv_buffer(f.read())
+    log_timings(logger, 'timing')
+
+    assert timing.TIMING_STATS == {}
+    assert logger.events == []
+
+
+def test_timing_enabled(monkeypatch):
+    monkeypatch.setitem(timing.TIMING, 'enabled', True)
+    monkeypatch.setattr(timing, 'TIMING_STATS', {})
+    monkeypatch.setattr(timing, 'ENTRY_TIMINGS', {})
+    logger = RecordingLogger()
+
+    with open(DATA_FILE, 'rb') as f:
+        read_jv_buffer(f.read())
+    log_timings(logger, 'timing', data_file=DATA_FILE)
+
+    [(event, fields)] = logger.events
+    assert event == 'timing'
+    assert fields['data_file'] == DATA_FILE
+    stages = {'encoding', 'header', 'data'}
+    assert {f'{stage}_seconds' for stage in stages} <= set(fields)
+    assert fields['total_seconds'] >= fields['data_seconds'] > 0
+
+    metrics = fields['process_timings']
+    assert metrics == timing.get_metrics()
+    assert set(metrics) == stages
+    assert metrics['data']['count'] == 1
+    assert metrics['data']['mean_seconds'] == metrics['data']['seconds']
+
+    # the next entry starts from zero
+    log_timings(logger, 'timing')
+    assert len(logger.events) == 1
+
+
+def test_start_timing(monkeypatch):
+    monkeypatch.setitem(timing.TIMING, 'enabled', True)
+    monkeypatch.setattr(timing, 'ENTRY_TIMINGS', {'data': 1.0})
+    logger = RecordingLogger()
+
+    # an entry of a parser with timing disabled drops the stages timed so far
+    timing.start_timing(False)
+    assert timed('data') is NULL_TIMER
+    log_timings(logger, 'timing')
+    assert timing.ENTRY_TIMINGS == {}
+    assert logger.events == []
+
+    timing.start_timing(True)
+    assert timed('data') is not NULL_TIMER